@@ -238,7 +238,6 @@ Chapter X: The del and null Weeds
 from collections.abc import Mapping, Sequence
 from datetime import datetime
 from enum import Enum
-from functools import reduce
 from json import JSONEncoder, dumps as json_dumps, loads as json_loads
 from logging import getLogger
 from pathlib import Path
@@ -279,6 +278,8 @@ __all__ = [
 ]
 
 KEY_OVERRIDES_MAP = "__key_overrides__"
+# instance.__dict__ key of raw field values that are boxed on first access
+DEFERRED_MAP = "__deferred__"
 
 
 NOTES = """
@@ -424,7 +425,10 @@ class Field:
             log.error("The name attribute has not been set for this field.")
             raise AttributeError("The name attribute has not been set for this field.")
         except KeyError:
-            if self.default is NULL:
+            deferred = instance.__dict__.get(DEFERRED_MAP) if instance is not None else None
+            if deferred and self.name in deferred:
+                val = self._undefer(instance, deferred)
+            elif self.default is NULL:
                 raise AttributeError(f"A value for {self.name} has not been set")
             else:
                 val = maybecall(self.default)  # default *can* be a callable
@@ -433,8 +437,15 @@ class Field:
             raise AttributeError(f"The {self.name} field has been deleted.")
         return self.unbox(instance, instance_type, val)
 
+    def _undefer(self, instance, deferred):
+        # box, validate and store a raw value set by Entity.load_deferred()
+        val = self.validate(instance, self.box(instance, instance.__class__, deferred[self.name]))
+        instance.__dict__[self.name] = val
+        deferred.pop(self.name, None)
+        return val
+
     def __set__(self, instance, val):
-        if self.immutable and instance._initd:
+        if self._immutable and instance._initd:
             raise AttributeError(f"The {self.name} field is immutable.")
         # validate will raise an exception if invalid
         # validate will return False if the value should be removed
@@ -448,7 +459,8 @@ class Field:
             raise AttributeError(f"The {self.name} field is immutable.")
         elif self.required:
             raise AttributeError(f"The {self.name} field is required and cannot be deleted.")
-        elif not self.nullable:
+        instance.__dict__.get(DEFERRED_MAP, {}).pop(self.name, None)
+        if not self.nullable:
             # tricky edge case
             # given a field Field(default='some value', required=False, nullable=False)
             # works together with Entity.dump() logic for selecting fields to include in dump
@@ -751,12 +763,37 @@ class EntityType(type):
             fields.update(sorted(clz_fields, key=_field_sort_key))
 
         cls.__fields__ = frozendict(fields)
+        cls.__compile_plans()
         if hasattr(cls, '__register__'):
             cls.__register__()
 
+    def __compile_plans(cls):
+        # Work out once per class what __init__, validate() and dump() do for each field,
+        # so that constructing and dumping an instance doesn't have to.
+        overrides = getattr(cls, KEY_OVERRIDES_MAP)
+        cls.__init_plan__ = tuple(
+            (
+                key,
+                field._aliases,
+                overrides.get(key, NULL),
+                field.required and field.default is NULL,
+                field.required,
+            )
+            for key, field in cls.__fields__.items()
+        )
+        cls.__required_fields__ = tuple(
+            key for key, field in cls.__fields__.items() if field.required
+        )
+        cls.__dump_plan__ = tuple(
+            (field.name, field.dump, field.default, field.default_in_dump)
+            for field in cls.__fields__.values()
+            if field.in_dump
+        )
+        cls.__initd_attr__ = f"_{cls.__name__}__initd"
+
     def __call__(cls, *args, **kwargs):
         instance = super().__call__(*args, **kwargs)
-        setattr(instance, f"_{cls.__name__}__initd", True)
+        setattr(instance, cls.__initd_attr__, True)
         return instance
 
     @property
@@ -769,24 +806,28 @@ class Entity(metaclass=EntityType):
     _lazy_validate = False
 
     def __init__(self, **kwargs):
-        for key, field in self.__fields__.items():
-            try:
-                setattr(self, key, kwargs[key])
-            except KeyError:
-                alias = next((ls for ls in field._aliases if ls in kwargs), None)
+        for key, aliases, override, missing_is_error, required in self.__init_plan__:
+            if key in kwargs:
+                val = kwargs[key]
+            else:
+                alias = next((ls for ls in aliases if ls in kwargs), None) if aliases else None
                 if alias is not None:
-                    setattr(self, key, kwargs[alias])
-                elif key in getattr(self, KEY_OVERRIDES_MAP):
+                    val = kwargs[alias]
+                elif override is not NULL:
                     # handle case of fields inherited from subclass but overrode on class object
-                    setattr(self, key, getattr(self, KEY_OVERRIDES_MAP)[key])
-                elif field.required and field.default is NULL:
+                    val = override
+                elif missing_is_error:
                     raise ValidationError(
                         key,
                         msg="{} requires a {} field. Instantiated with "
                         "{}".format(self.__class__.__name__, key, kwargs),
                     )
+                else:
+                    continue
+            try:
+                setattr(self, key, val)
             except ValidationError:
-                if kwargs[key] is not None or field.required:
+                if val is not None or required:
                     raise
         if not self._lazy_validate:
             self.validate()
@@ -811,9 +852,9 @@ class Entity(metaclass=EntityType):
         init_vars = {}
         search_maps = tuple(AttrDict(o) if isinstance(o, dict) else o
                             for o in ((override_fields,) + objects))
-        for key, field in cls.__fields__.items():
+        for key, aliases, *_ in cls.__init_plan__:
             try:
-                init_vars[key] = find_or_raise(key, search_maps, field._aliases)
+                init_vars[key] = find_or_raise(key, search_maps, aliases)
             except AttributeError:
                 pass
 
@@ -827,16 +868,52 @@ class Entity(metaclass=EntityType):
     def load(cls, data_dict):
         return cls(**data_dict)
 
+    @classmethod
+    def load_deferred(cls, data_dict, deferred_fields=frozenset()):
+        """Construct an object like :meth:`load`, deferring some of the work.
+
+        The raw values of ``deferred_fields`` are kept as they are, and are only boxed and
+        validated when the field is first accessed, so their errors surface then.  Only
+        :meth:`validate` runs; ``__init__`` is not called.
+
+        Args:
+            data_dict(dict): Field values, by field name or alias.
+            deferred_fields(set(str)): Names of the fields to box on first access.
+        """
+        self = cls.__new__(cls)
+        deferred = {}
+        for key, aliases, override, _, required in cls.__init_plan__:
+            val = data_dict.get(key, NULL)
+            if val is NULL:
+                alias = next((ls for ls in aliases if ls in data_dict), None) if aliases else None
+                if alias is not None:
+                    val = data_dict[alias]
+                elif override is not NULL:
+                    val = override
+                else:
+                    continue
+            if key in deferred_fields:
+                if val is not None or required or cls.__fields__[key].nullable:
+                    deferred[key] = val
+                # else, as in __init__, None leaves an optional field unset
+                continue
+            try:
+                setattr(self, key, val)
+            except ValidationError:
+                if val is not None or required:
+                    raise
+        if deferred:
+            self.__dict__[DEFERRED_MAP] = deferred
+        if not cls._lazy_validate:
+            self.validate()
+        setattr(self, cls.__initd_attr__, True)
+        return self
+
     def validate(self):
         # TODO: here, validate should only have to determine if the required keys are set
         try:
-            reduce(
-                lambda _, name: getattr(self, name),
-                (name for name, field in self.__fields__.items() if field.required),
-            )
-        except TypeError as e:
-            if str(e) == "reduce() of empty sequence with no initial value":
-                pass
+            for name in self.__required_fields__:
+                getattr(self, name)
         except AttributeError as e:
             raise ValidationError(None, msg=e)
 
@@ -861,8 +938,9 @@ class Entity(metaclass=EntityType):
             field = self.__fields__.get(key)
             return field._order_helper if field is not None else -1
 
+        keys = {**self.__dict__, **self.__dict__.get(DEFERRED_MAP, {})}
         kwarg_str = ", ".join(
-            f"{key}={_val(key)}" for key in sorted(self.__dict__, key=_sort_helper) if _valid(key)
+            f"{key}={_val(key)}" for key in sorted(keys, key=_sort_helper) if _valid(key)
         )
         return f"{self.__class__.__name__}({kwarg_str})"
 
@@ -877,19 +955,13 @@ class Entity(metaclass=EntityType):
         return self.json(indent=indent, separators=separators, **kwargs)
 
     def dump(self):
-        return odict((field.name, field.dump(self, self.__class__, value))
-                     for field, value in ((field, getattr(self, field.name, NULL))
-                                          for field in self.__dump_fields())
-                     if value is not NULL and not (value is field.default
-                                                   and not field.default_in_dump))
-
-    @classmethod
-    def __dump_fields(cls):
-        if "__dump_fields_cache" not in cls.__dict__:
-            cls.__dump_fields_cache = tuple(
-                field for field in cls.__fields__.values() if field.in_dump
-            )
-        return cls.__dump_fields_cache
+        cls = self.__class__
+        dumped = odict()
+        for name, dump, default, default_in_dump in cls.__dump_plan__:
+            value = getattr(self, name, NULL)
+            if value is not NULL and not (value is default and not default_in_dump):
+                dumped[name] = dump(self, cls, value)
+        return dumped
 
     def __eq__(self, other):
         if self.__class__ != other.__class__:
@@ -903,7 +975,7 @@ class Entity(metaclass=EntityType):
 
     @property
     def _initd(self):
-        return getattr(self, f"_{self.__class__.__name__}__initd", None)
+        return getattr(self, self.__class__.__initd_attr__, None)
 
 
 class ImmutableEntity(Entity):
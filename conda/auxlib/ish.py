@@ -42,24 +42,26 @@ def find_or_none(key, search_maps, aliases=(), _map_index=0):
         6
 
     """
-    try:
-        attr = _get_attr(search_maps[_map_index], key, aliases)
-        return attr if attr is not None else find_or_none(key, search_maps[1:], aliases)
-    except AttributeError:
-        # not found in current map object, so go to next
-        return find_or_none(key, search_maps, aliases, _map_index+1)
-    except IndexError:
-        # ran out of map objects to search
-        return None
+    for search_map in search_maps[_map_index:]:
+        try:
+            attr = _get_attr(search_map, key, aliases)
+        except AttributeError:
+            # not found in current map object, so go to next
+            continue
+        if attr is not None:
+            return attr
+    # ran out of map objects to search
+    return None
 
 
 def find_or_raise(key, search_maps, aliases=(), _map_index=0):
-    try:
-        attr = _get_attr(search_maps[_map_index], key, aliases)
-        return attr if attr is not None else find_or_raise(key, search_maps[1:], aliases)
-    except AttributeError:
-        # not found in current map object, so go to next
-        return find_or_raise(key, search_maps, aliases, _map_index+1)
-    except IndexError:
-        # ran out of map objects to search
-        raise AttributeError()
+    for search_map in search_maps[_map_index:]:
+        try:
+            attr = _get_attr(search_map, key, aliases)
+        except AttributeError:
+            # not found in current map object, so go to next
+            continue
+        if attr is not None:
+            return attr
+    # ran out of map objects to search
+    raise AttributeError()
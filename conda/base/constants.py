@@ -259,6 +259,7 @@ class SatSolverChoice(ValueEnum):
     PYCOSAT = "pycosat"
     PYCRYPTOSAT = "pycryptosat"
     PYSAT = "pysat"
+    PORTFOLIO = "portfolio"
 
 
 #: The name of the default solver, currently "libmamba"
@@ -280,6 +281,12 @@ class NoticeLevel(ValueEnum):
 
 # Magic files for permissions determination
 PACKAGE_CACHE_MAGIC_FILE = "urls.txt"
+# Persistent index of a package cache's records, see "package_cache_index" experimental
+PACKAGE_CACHE_INDEX_FILE = join("cache", "package_cache_index.json")
+# Content-addressed files shared by a package cache's packages, see "dedup_store"
+PACKAGE_CACHE_STORE_DIR = join(".store", "sha256")
+# When each package cache entry was last linked into an environment
+PACKAGE_CACHE_LAST_USED_DIR = ".last_used"
 PREFIX_MAGIC_FILE = join("conda-meta", "history")
 
 PREFIX_STATE_FILE = join("conda-meta", "state")
@@ -253,10 +253,14 @@ class Context(Configuration):
     _repodata_threads = ParameterLoader(
         PrimitiveParameter(0, element_type=int), aliases=("repodata_threads",)
     )
+    # process repodata
+    repodata_processes = ParameterLoader(PrimitiveParameter(0, element_type=int))
     # download packages
     _fetch_threads = ParameterLoader(
         PrimitiveParameter(0, element_type=int), aliases=("fetch_threads",)
     )
+    # concurrent byte ranges per large package download, 0 or 1 disables
+    download_segments = ParameterLoader(PrimitiveParameter(0, element_type=int))
     _verify_threads = ParameterLoader(
         PrimitiveParameter(0, element_type=int), aliases=("verify_threads",)
     )
@@ -314,6 +318,9 @@ class Context(Configuration):
         aliases=("pkgs_dirs",),
         expandvars=True,
     )
+    # least recently used package cache entries are evicted past these, 0 disables
+    pkgs_max_size = ParameterLoader(PrimitiveParameter(0, element_type=int))
+    pkgs_max_age = ParameterLoader(PrimitiveParameter(0, element_type=int))
     _subdir = ParameterLoader(PrimitiveParameter(""), aliases=("subdir",))
     _subdirs = ParameterLoader(
         SequenceParameter(PrimitiveParameter("", str)), aliases=("subdirs",)
@@ -1201,7 +1208,9 @@ class Context(Configuration):
                 "repodata_fns",
                 "use_only_tar_bz2",
                 "repodata_threads",
+                "repodata_processes",
                 "fetch_threads",
+                "download_segments",
                 "experimental",
                 "no_lock",
                 "repodata_use_zst",
@@ -1209,6 +1218,8 @@ class Context(Configuration):
             "Basic Conda Configuration": (  # TODO: Is there a better category name here?
                 "envs_dirs",
                 "pkgs_dirs",
+                "pkgs_max_size",
+                "pkgs_max_age",
                 "default_threads",
             ),
             "Network Configuration": (
@@ -1538,6 +1549,14 @@ class Context(Configuration):
                 prior to unlinking and linking packages into the prefix
                 """
             ),
+            download_segments=dals(
+                """
+                Download packages larger than 64 MiB as this many concurrent byte ranges,
+                when the server supports range requests. Can help on high-latency links,
+                where a single connection cannot use all of the available bandwidth. 0 or 1
+                downloads each package over a single connection.
+                """
+            ),
             envs_dirs=dals(
                 """
                 The list of directories to search for named environments. When creating a new
@@ -1673,6 +1692,22 @@ class Context(Configuration):
                 into the first writable directory.
                 """
             ),
+            pkgs_max_age=dals(
+                """
+                Evict package cache entries that have not been linked into an environment
+                for more than this many days, after each transaction or with
+                `conda clean --lru`. Entries hard linked into environments are kept. 0
+                disables the limit.
+                """
+            ),
+            pkgs_max_size=dals(
+                """
+                Evict the least recently linked package cache entries while a writable
+                package cache holds more than this many bytes, after each transaction or
+                with `conda clean --lru`. Entries hard linked into environments are kept.
+                0 disables the limit.
+                """
+            ),
             proxy_servers=dals(
                 """
                 A mapping to enable proxy settings. Keys can be either (1) a scheme://hostname
@@ -1711,6 +1746,14 @@ class Context(Configuration):
                 a response.
                 """
             ),
+            repodata_processes=dals(
+                """
+                Worker processes to use when processing several downloaded repodata.json
+                files at once, for parsing them on more than one core. Starting the
+                workers takes some time, so the default of 0 processes repodata in the
+                main process.
+                """
+            ),
             repodata_threads=dals(
                 """
                 Threads to use when downloading and reading repodata.  When not set,
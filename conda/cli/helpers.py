@@ -263,9 +263,34 @@ def add_parser_channels(p: ArgumentParser) -> _ArgumentGroup:
     channel_customization_options.add_argument(
         "--experimental",
         action="append",
-        choices=["jlap", "lock"],
-        help="jlap: Download incremental package index data from repodata.jlap; implies 'lock'. "
-        "lock: use locking when reading, updating index (repodata.json) cache. Now enabled.",
+        choices=[
+            "dedup_store",
+            "incremental_sat",
+            "jlap",
+            "lock",
+            "package_cache_index",
+            "reduced_index",
+            "sharded",
+            "solution_cache",
+            "sparse",
+            "stream_extract",
+        ],
+        help="dedup_store: hard link identical files of extracted packages to a "
+        "content-addressed store in each package cache. "
+        "incremental_sat: keep one SAT solver instance across the classic solver's "
+        "optimization passes, with the pycryptosat and pysat backends. "
+        "jlap: Download incremental package index data from repodata.jlap; implies 'lock'. "
+        "lock: use locking when reading, updating index (repodata.json) cache. Now enabled. "
+        "package_cache_index: keep an index of each package cache, so unchanged "
+        "caches load without reading every package's metadata. "
+        "reduced_index: cache the packages that the classic solver considers for a set "
+        "of specs, until the index changes. "
+        "sharded: only download the index shards of the queried packages and their "
+        "dependencies, from channels that provide them; implies 'sparse'. "
+        "solution_cache: reuse the classic solver's solution for an identical request, "
+        "until the environment or index changes. "
+        "sparse: only parse the index entries of the package names that are queried. "
+        "stream_extract: extract .conda packages while they download.",
     )
     channel_customization_options.add_argument(
         "--no-lock",
@@ -30,7 +30,7 @@ from ..core.index import (
 )
 from ..core.link import PrefixSetup, UnlinkLinkTransaction
 from ..core.prefix_data import PrefixData
-from ..core.solve import diff_for_unlink_link_precs
+from ..core.solve import SolutionCache, diff_for_unlink_link_precs
 from ..exceptions import (
     CondaEnvException,
     CondaExitZero,
@@ -525,6 +525,12 @@ def revert_actions(prefix, revision=-1, index=None):
     return UnlinkLinkTransaction(setup)
 
 
+def _json_solution_cache():
+    if "solution_cache" in context.experimental:
+        return {"solution_cache": SolutionCache.stats()}
+    return {}
+
+
 def handle_txn(unlink_link_transaction, prefix, args, newenv, remove_op=False):
     if unlink_link_transaction.nothing_to_do:
         if remove_op:
@@ -533,7 +539,8 @@ def handle_txn(unlink_link_transaction, prefix, args, newenv, remove_op=False):
         elif not newenv:
             if context.json:
                 common.stdout_json_success(
-                    message="All requested packages already installed."
+                    message="All requested packages already installed.",
+                    **_json_solution_cache(),
                 )
             else:
                 print("\n# All requested packages already installed.\n")
@@ -545,7 +552,9 @@ def handle_txn(unlink_link_transaction, prefix, args, newenv, remove_op=False):
 
     elif context.dry_run:
         actions = unlink_link_transaction._make_legacy_action_groups()[0]
-        common.stdout_json_success(prefix=prefix, actions=actions, dry_run=True)
+        common.stdout_json_success(
+            prefix=prefix, actions=actions, dry_run=True, **_json_solution_cache()
+        )
         raise DryRunExit()
 
     try:
@@ -571,4 +580,6 @@ def handle_txn(unlink_link_transaction, prefix, args, newenv, remove_op=False):
 
     if context.json:
         actions = unlink_link_transaction._make_legacy_action_groups()[0]
-        common.stdout_json_success(prefix=prefix, actions=actions)
+        common.stdout_json_success(
+            prefix=prefix, actions=actions, **_json_solution_cache()
+        )
@@ -64,6 +64,14 @@ def configure_parser(sub_parsers: _SubParsersAction, **kwargs) -> ArgumentParser
         "WARNING: This does not check for packages installed using "
         "symlinks back to the package cache.",
     )
+    removal_target_options.add_argument(
+        "--lru",
+        action="store_true",
+        help="Remove the least recently used packages and tarballs from writable "
+        "package caches, as limited by the pkgs_max_size and pkgs_max_age settings. "
+        "WARNING: This does not check for packages installed using "
+        "symlinks back to the package cache.",
+    )
     removal_target_options.add_argument(
         "-t",
         "--tarballs",
@@ -103,7 +111,11 @@ def configure_parser(sub_parsers: _SubParsersAction, **kwargs) -> ArgumentParser
     return p
 
 
-def _get_size(*parts: str, warnings: list[str] | None) -> int:
+def _get_size(
+    *parts: str,
+    warnings: list[str] | None,
+    links: dict[tuple[int, int], int] | None = None,
+) -> int:
     path = join(*parts)
     try:
         stat = os.lstat(path)
@@ -117,7 +129,8 @@ def _get_size(*parts: str, warnings: list[str] | None) -> int:
     else:
         # TODO: This doesn't handle packages that have hard links to files within
         # themselves, like bin/python3.3 and bin/python3.3m in the Python package
-        if stat.st_nlink > 1:
+        # unless `links` counts the links within the package cache
+        if stat.st_nlink > (links or {}).get((stat.st_dev, stat.st_ino), 1):
             raise NotImplementedError
 
         return stat.st_size
@@ -178,20 +191,31 @@ def find_tarballs() -> dict[str, Any]:
 
 
 def find_pkgs() -> dict[str, Any]:
+    from ..base.constants import PACKAGE_CACHE_STORE_DIR
+    from ..gateways.disk.read import count_hard_links
+
     warnings: list[str] = []
     pkg_sizes: dict[str, dict[str, int]] = {}
     for pkgs_dir in find_pkgs_dirs():
         # pkgs are directories in pkgs_dir
         _, pkgs, _ = next(os.walk(pkgs_dir))
-        for pkg in pkgs:
-            # pkgs also have an info directory
-            if not isdir(join(pkgs_dir, pkg, "info")):
-                continue
+        # pkgs also have an info directory
+        pkgs = [pkg for pkg in pkgs if isdir(join(pkgs_dir, pkg, "info"))]
+
+        # files shared through the content store are only in use if they are
+        # linked from outside of the package cache
+        store = join(pkgs_dir, PACKAGE_CACHE_STORE_DIR)
+        links = (
+            count_hard_links(store, *(join(pkgs_dir, pkg) for pkg in pkgs))
+            if isdir(store)
+            else None
+        )
 
+        for pkg in pkgs:
             # get size
             try:
                 size = sum(
-                    _get_size(root, file, warnings=warnings)
+                    _get_size(root, file, warnings=warnings, links=links)
                     for root, _, files in os.walk(join(pkgs_dir, pkg))
                     for file in files
                 )
@@ -208,6 +232,26 @@ def find_pkgs() -> dict[str, Any]:
     }
 
 
+def find_lru() -> dict[str, Any]:
+    from ..base.context import context
+    from ..core.package_cache_data import PackageCacheData
+
+    pkg_sizes: dict[str, dict[str, int]] = {}
+    for package_cache in PackageCacheData.writable_caches():
+        evictions = package_cache.find_lru_evictions(
+            context.pkgs_max_size, context.pkgs_max_age
+        )
+        for _, sizes in evictions:
+            pkg_sizes.setdefault(package_cache.pkgs_dir, {}).update(sizes)
+
+    return {
+        "warnings": [],
+        "pkg_sizes": pkg_sizes,
+        "pkgs_dirs": _get_pkgs_dirs(pkg_sizes),
+        "total_size": _get_total_size(pkg_sizes),
+    }
+
+
 def rm_pkgs(
     pkgs_dirs: dict[str, tuple[str]],
     warnings: list[str],
@@ -268,6 +312,31 @@ def find_index_cache() -> list[str]:
     return files
 
 
+def find_content_stores() -> list[str]:
+    from ..base.constants import PACKAGE_CACHE_STORE_DIR
+
+    return [
+        path
+        for pkgs_dir in find_pkgs_dirs()
+        if isdir(path := join(pkgs_dir, PACKAGE_CACHE_STORE_DIR))
+    ]
+
+
+def find_content_store_garbage(stores: Iterable[str]) -> list[str]:
+    # store files that no package or environment links to anymore
+    garbage = []
+    for store in stores:
+        for root, _, files in os.walk(store):
+            for file in files:
+                path = join(root, file)
+                try:
+                    if os.lstat(path).st_nlink == 1:
+                        garbage.append(path)
+                except OSError:
+                    continue
+    return garbage
+
+
 def find_pkgs_dirs() -> list[str]:
     from ..core.package_cache_data import PackageCacheData
 
@@ -276,6 +345,14 @@ def find_pkgs_dirs() -> list[str]:
     ]
 
 
+def rebuild_package_cache_indexes(pkgs_dirs: Iterable[str]) -> None:
+    """Rebuild the persistent package cache index of each package cache."""
+    from ..core.package_cache_data import PackageCacheData
+
+    for pkgs_dir in pkgs_dirs:
+        PackageCacheData(pkgs_dir).rebuild_index()
+
+
 def find_tempfiles(paths: Iterable[str]) -> list[str]:
     from ..base.constants import CONDA_TEMP_EXTENSIONS
 
@@ -371,6 +448,7 @@ def _execute(args, parser):
         or args.tarballs
         or args.index_cache
         or args.packages
+        or args.lru
         or args.tempfiles
         or args.logfiles
     ):
@@ -384,6 +462,10 @@ def _execute(args, parser):
         json_result["tarballs"] = tars = find_tarballs()
         rm_pkgs(**tars, **kwargs, name="tarball(s)")
 
+    if args.lru:
+        json_result["lru"] = lru = find_lru()
+        rm_pkgs(**lru, **kwargs, name="least recently used package(s)")
+
     if args.index_cache or args.all:
         cache = find_index_cache()
         json_result["index_cache"] = {"files": cache}
@@ -393,6 +475,11 @@ def _execute(args, parser):
         json_result["packages"] = pkgs = find_pkgs()
         rm_pkgs(**pkgs, **kwargs, name="package(s)")
 
+    if (args.packages or args.all or args.lru) and (stores := find_content_stores()):
+        garbage = find_content_store_garbage(stores)
+        json_result["content_store"] = {"files": garbage}
+        rm_items(garbage, **kwargs, name="unused deduplicated file(s)")
+
     if args.tempfiles or args.all:
         json_result["tempfiles"] = tmps = find_tempfiles(args.tempfiles)
         rm_items(tmps, **kwargs, name="tempfile(s)")
@@ -401,6 +488,15 @@ def _execute(args, parser):
         json_result["logfiles"] = logs = find_logfiles()
         rm_items(logs, **kwargs, name="logfile(s)")
 
+    if (
+        (args.index_cache or args.all)
+        and "package_cache_index" in context.experimental
+        and not context.dry_run
+    ):
+        # the index cache includes the package cache indexes, rebuild them from
+        # what is left in the package caches
+        rebuild_package_cache_indexes(find_pkgs_dirs())
+
     return json_result
 
 
@@ -2,10 +2,17 @@
 # SPDX-License-Identifier: BSD-3-Clause
 import sys
 from array import array
+from importlib.util import find_spec
 from itertools import combinations
 from logging import DEBUG, getLogger
+from multiprocessing import get_all_start_methods, get_context
+from multiprocessing.connection import wait
+from queue import SimpleQueue
+from threading import Thread
+from weakref import finalize
 
 from .constants import TRACE
+from .io import time_recorder
 
 log = getLogger(__name__)
 
@@ -234,21 +241,357 @@ class _PySatSolver(_SatSolver):
         return solution
 
 
+class _IncrementalSatSolver(_SatSolver):
+    """
+    Keep one live solver instance across runs, for backends that can solve
+    under assumptions.
+
+    Clauses are only ever added to the live solver. Clauses that a later
+    `restore_state` may remove are guarded by an activation literal, which
+    every run assumes to be true; they are retracted by fixing their
+    activation literal to false. Learned clauses thus carry over between runs,
+    e.g. between the bisection steps of `Clauses.minimize`.
+    """
+
+    def __init__(self, **run_kwargs):
+        super().__init__(**run_kwargs)
+        # states returned by save_state that weren't restored below
+        self._saved = set()
+        self._reset()
+
+    def _reset(self):
+        self._solver = None
+        # number of clauses passed to the live solver
+        self._sent = 0
+        # (index of first clause, activation variable) of guarded clauses
+        self._groups = []
+        # highest variable of the live solver
+        self._max_var = 0
+        # variables of the live solver that clause variables can't map to
+        self._reserved = set()
+        self._min_reserved = TRUE
+        # clause variable -> live solver variable, for reserved variables
+        self._var_map = {}
+
+    def save_state(self):
+        saved_state = super().save_state()
+        self._saved.add(saved_state)
+        return saved_state
+
+    def restore_state(self, saved_state):
+        super().restore_state(saved_state)
+        self._saved = {state for state in self._saved if state <= saved_state}
+        if saved_state >= self._sent:
+            return
+        if not self._groups or saved_state < self._groups[0][0]:
+            # clauses that were sent unguarded can't be removed; start over
+            log.debug("Discarding incremental SAT solver state")
+            self._reset()
+            return
+
+        # retract the groups with clauses from saved_state on, and send again
+        # those of their clauses that are kept
+        ends = [first for first, _ in self._groups[1:]] + [self._sent]
+        for index, end in enumerate(ends):
+            if end > saved_state:
+                break
+        retracted = self._groups[index:]
+        del self._groups[index:]
+        self._add_clauses(self._solver, [(-activation,) for _, activation in retracted])
+        self._sent = min(saved_state, retracted[0][0])
+
+    def _new_var(self):
+        self._max_var += 1
+        self._reserved.add(self._max_var)
+        self._min_reserved = min(self._min_reserved, self._max_var)
+        return self._max_var
+
+    def _map_var(self, var):
+        mapped = self._var_map.get(var)
+        if mapped is None:
+            if var not in self._reserved:
+                return var
+            mapped = self._var_map[var] = self._new_var()
+        return mapped
+
+    def _map_clause(self, clause, activation=None):
+        if max(map(abs, clause), default=0) >= self._min_reserved:
+            map_var = self._map_var
+            clause = [map_var(lit) if lit > 0 else -map_var(-lit) for lit in clause]
+        if activation is None:
+            return clause
+        return (*clause, -activation)
+
+    def run(self, m, **kwargs):
+        if self._solver is None:
+            run_kwargs = self._run_kwargs.copy()
+            run_kwargs.update(kwargs)
+            self._solver = self._new_solver(**run_kwargs)
+        self._max_var = max(self._max_var, m)
+
+        clauses = self._clauses.as_list()
+        permanent = min(self._saved, default=len(clauses))
+        if self._sent < permanent:
+            self._add_clauses(
+                self._solver,
+                [self._map_clause(c) for c in clauses[self._sent : permanent]],
+            )
+            self._sent = permanent
+        if self._sent < len(clauses):
+            activation = self._new_var()
+            self._add_clauses(
+                self._solver,
+                [self._map_clause(c, activation) for c in clauses[self._sent :]],
+            )
+            self._groups.append((self._sent, activation))
+            self._sent = len(clauses)
+
+        values = self._solve(
+            self._solver, [activation for _, activation in self._groups]
+        )
+        if values is None:
+            return None
+        # translate the model back to clause variables 1..m
+        reserved = self._reserved
+        var_map = self._var_map
+        nvalues = len(values)
+        solution = []
+        for var in range(1, m + 1):
+            mapped = var_map.get(var, 0 if var in reserved else var)
+            solution.append(var if 0 < mapped < nvalues and values[mapped] else -var)
+        return solution
+
+    def _new_solver(self, **kwargs):
+        """Create the live solver instance."""
+        raise NotImplementedError()
+
+    def _add_clauses(self, solver, clauses):
+        """Add clauses to the live solver."""
+        raise NotImplementedError()
+
+    def _solve(self, solver, assumptions):
+        """
+        Solve under the assumed literals. Return a sequence of the truth value
+        of each variable by index, or None if there is no solution.
+        """
+        raise NotImplementedError()
+
+
+class _PyCryptoSatIncrementalSolver(_IncrementalSatSolver):
+    def _new_solver(self, threads=1, **kwargs):
+        from pycryptosat import Solver
+
+        return Solver(threads=threads)
+
+    def _add_clauses(self, solver, clauses):
+        solver.add_clauses(clauses)
+
+    def _solve(self, solver, assumptions):
+        sat, solution = solver.solve(assumptions)
+        return solution if sat else None
+
+
+class _PySatIncrementalSolver(_IncrementalSatSolver):
+    def _new_solver(self, **kwargs):
+        from pysat.solvers import Glucose4
+
+        return Glucose4()
+
+    def _add_clauses(self, solver, clauses):
+        solver.append_formula(clauses)
+
+    def _solve(self, solver, assumptions):
+        if not solver.solve(assumptions=assumptions):
+            return None
+        # the model holds the literals of variables 1..n in order
+        return [None, *(lit > 0 for lit in solver.get_model())]
+
+
+def _portfolio_worker(sat_solver_str, connection):
+    """
+    Serve the runs of one backend of a `_PortfolioSatSolver`, keeping a copy of
+    its clauses that each request brings up to date.
+    """
+    sat_solver = _sat_solver_str_to_cls[sat_solver_str]()
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        while True:
+            if request is None:
+                return
+            run_id, synced, clauses, m, run_kwargs = request
+            sat_solver.restore_state(synced)
+            sat_solver.add_clauses(clauses)
+            # skip the runs that were superseded while this backend was busy
+            if not connection.poll():
+                break
+            request = connection.recv()
+        try:
+            result = sat_solver.run(m, **run_kwargs)
+        except Exception as e:
+            result = e
+        try:
+            connection.send((run_id, result))
+        except OSError:
+            return
+
+
+def _send_requests(connection, requests):
+    # a worker busy with a run doesn't read its pipe; don't block the solver on it
+    while True:
+        request = requests.get()
+        try:
+            connection.send(request)
+        except OSError:
+            return
+        if request is None:
+            return
+
+
+def _stop_portfolio_workers(workers):
+    for _, _, _, requests in workers:
+        # workers stop after their current run; nothing is terminated midway
+        requests.put(None)
+
+
+class _PortfolioSatSolver(_SatSolver):
+    """
+    Race the installed backends on the same clauses and take the first answer.
+
+    Each backend runs in a worker process that lives as long as this solver and
+    keeps its own copy of the clauses, so a run only sends the clauses that
+    changed since the previous one. Workers are started without forking this
+    process, which may be running other threads. A backend that loses a race
+    finishes or skips that run in the background and its late answer is ignored.
+    """
+
+    #: backends to race, if they are installed
+    backends = ("pycosat", "pycryptosat", "pysat")
+
+    def __init__(self, **run_kwargs):
+        super().__init__(**run_kwargs)
+        # [(backend, process, connection, requests)], started on the first run
+        self._workers = None
+        # number of clauses the workers have
+        self._synced = 0
+        self._run_id = 0
+
+    def available_backends(self):
+        return [name for name in self.backends if find_spec(name)]
+
+    def restore_state(self, saved_state):
+        super().restore_state(saved_state)
+        self._synced = min(self._synced, saved_state)
+
+    def run(self, m, **kwargs):
+        run_kwargs = self._run_kwargs.copy()
+        run_kwargs.update(kwargs)
+        backends = self.available_backends()
+        if not backends:
+            raise RuntimeError(f"None of the SAT solvers {self.backends} is installed")
+        if len(backends) == 1:
+            sat_solver = _sat_solver_str_to_cls[backends[0]]()
+            sat_solver.add_clauses(self._clauses.as_list())
+            return sat_solver.run(m, **run_kwargs)
+
+        with time_recorder(f"{__name__}.{type(self).__name__}.run") as recorder:
+            if self._workers is None:
+                self._start_workers(backends)
+            clauses = self._clauses.as_list()
+            self._run_id += 1
+            request = (
+                self._run_id,
+                self._synced,
+                clauses[self._synced :],
+                m,
+                run_kwargs,
+            )
+            self._synced = len(clauses)
+            for _, _, _, requests in self._workers:
+                requests.put(request)
+            winner, solution = self._first_result(self._run_id)
+            log.debug("SAT solver portfolio won by %s", winner)
+            recorder.entry_name = f"{recorder.entry_name}:{winner}"
+        return solution
+
+    def _start_workers(self, backends):
+        mp_context = get_context(
+            "forkserver" if "forkserver" in get_all_start_methods() else "spawn"
+        )
+        self._workers = []
+        for name in backends:
+            connection, worker_connection = mp_context.Pipe()
+            process = mp_context.Process(
+                target=_portfolio_worker,
+                args=(name, worker_connection),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+            requests = SimpleQueue()
+            Thread(
+                target=_send_requests, args=(connection, requests), daemon=True
+            ).start()
+            self._workers.append((name, process, connection, requests))
+        finalize(self, _stop_portfolio_workers, self._workers)
+
+    def _first_result(self, run_id):
+        pending = {connection: name for name, _, connection, _ in self._workers}
+        error = None
+        while pending:
+            for connection in wait(pending):
+                name = pending[connection]
+                try:
+                    result_id, solution = connection.recv()
+                except (EOFError, OSError):
+                    # the worker crashed; leave it out of later runs
+                    del pending[connection]
+                    self._workers = [
+                        worker
+                        for worker in self._workers
+                        if worker[2] is not connection
+                    ]
+                    continue
+                if result_id != run_id:
+                    # a late answer to an earlier run
+                    continue
+                if not isinstance(solution, Exception):
+                    return name, solution
+                log.debug("SAT solver %s failed in portfolio: %s", name, solution)
+                error = solution
+                del pending[connection]
+        raise error or RuntimeError("All SAT solvers in the portfolio failed")
+
+
 _sat_solver_str_to_cls = {
     "pycosat": _PycoSatSolver,
     "pycryptosat": _PyCryptoSatSolver,
     "pysat": _PySatSolver,
+    "portfolio": _PortfolioSatSolver,
 }
 
 _sat_solver_cls_to_str = {cls: string for string, cls in _sat_solver_str_to_cls.items()}
 
+# backends that keep a live solver instance across runs
+_incremental_sat_solver_str_to_cls = {
+    "pycryptosat": _PyCryptoSatIncrementalSolver,
+    "pysat": _PySatIncrementalSolver,
+}
+
 
 # Code that uses special cases (generates no clauses) is in ADTs/FEnv.h in
 # minisatp. Code that generates clauses is in Hardware_clausify.cc (and are
 # also described in the paper, "Translating Pseudo-Boolean Constraints into
 # SAT," Eén and Sörensson).
 class Clauses:
-    def __init__(self, m=0, sat_solver_str=_sat_solver_cls_to_str[_PycoSatSolver]):
+    def __init__(
+        self,
+        m=0,
+        sat_solver_str=_sat_solver_cls_to_str[_PycoSatSolver],
+        incremental=False,
+    ):
         self.unsat = False
         self.m = m
 
@@ -256,6 +599,11 @@ class Clauses:
             sat_solver_cls = _sat_solver_str_to_cls[sat_solver_str]
         except KeyError:
             raise NotImplementedError(f"Unknown SAT solver: {sat_solver_str}")
+        if incremental:
+            # fall back to solving from scratch for backends without assumptions
+            sat_solver_cls = _incremental_sat_solver_str_to_cls.get(
+                sat_solver_str, sat_solver_cls
+            )
         self._sat_solver = sat_solver_cls()
 
         # Bind some methods of _sat_solver to reduce lookups and call overhead.
@@ -0,0 +1,107 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+"""Bounded, instrumented caches of objects made from strings."""
+
+from __future__ import annotations
+
+from threading import Lock
+
+
+class InterningCache:
+    """
+    Thread-safe cache of the objects made from strings, e.g. by
+    `~conda.models.version.SingleStrArgCachingType` classes.
+
+    With a ``maxsize``, the cache keeps two generations of at most
+    ``maxsize // 2`` entries each: hits in the old generation are copied to the
+    new one, and the old generation is dropped when the new one is full. That
+    approximates LRU eviction without bookkeeping on every hit. Without a
+    ``maxsize``, the cache is unbounded.
+
+    The new generation is the plain dict ``entries``, which hot paths look up
+    directly, counting their hits in ``hits``; the counter is not locked, so
+    concurrent hits may be undercounted.
+    """
+
+    __slots__ = (
+        "entries",
+        "hits",
+        "misses",
+        "maxsize",
+        "_old",
+        "_generation_size",
+        "_lock",
+    )
+
+    def __init__(self, maxsize: int | None = None):
+        self._lock = Lock()
+        self.entries = {}
+        self._old = {}
+        self.hits = 0
+        self.misses = 0
+        self.resize(maxsize)
+
+    def resize(self, maxsize: int | None) -> None:
+        """Change ``maxsize``, evicting entries beyond it."""
+        if maxsize is not None and maxsize < 2:
+            raise ValueError(f"maxsize must be at least 2 or None, not {maxsize}")
+        with self._lock:
+            self.maxsize = maxsize
+            self._generation_size = None if maxsize is None else maxsize // 2
+            entries = {**self._old, **self.entries}
+            if self._generation_size and len(entries) > self._generation_size:
+                # keep the most recently added entries
+                entries = dict(list(entries.items())[-self._generation_size :])
+            self._old = {}
+            self.entries = entries
+            self._rotate()
+
+    def _rotate(self) -> None:
+        if self._generation_size and len(self.entries) >= self._generation_size:
+            self._old = self.entries
+            self.entries = {}
+
+    def promote(self, key: str):
+        """
+        Return the entry for ``key`` from the old generation, moving it to the
+        new one, or raise `KeyError`.
+        """
+        value = self._old[key]
+        with self._lock:
+            self.hits += 1
+            self.entries[key] = value
+            self._rotate()
+        return value
+
+    def __getitem__(self, key: str):
+        try:
+            return self.entries[key]
+        except KeyError:
+            return self.promote(key)
+
+    def __setitem__(self, key: str, value) -> None:
+        with self._lock:
+            self.misses += 1
+            self.entries[key] = value
+            self._rotate()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.entries or key in self._old
+
+    def __len__(self) -> int:
+        return len(self.entries.keys() | self._old.keys())
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries = {}
+            self._old = {}
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int | None]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self),
+            "maxsize": self.maxsize,
+        }
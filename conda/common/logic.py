@@ -43,13 +43,16 @@ FALSE = FALSE
 PycoSatSolver = "pycosat"
 PyCryptoSatSolver = "pycryptosat"
 PySatSolver = "pysat"
+PortfolioSatSolver = "portfolio"
 
 
 class Clauses:
-    def __init__(self, m=0, sat_solver=PycoSatSolver):
+    def __init__(self, m=0, sat_solver=PycoSatSolver, incremental=False):
         self.names = {}
         self.indices = {}
-        self._clauses = _Clauses(m=m, sat_solver_str=sat_solver)
+        self._clauses = _Clauses(
+            m=m, sat_solver_str=sat_solver, incremental=incremental
+        )
 
     @property
     def m(self):
@@ -6,11 +6,17 @@ import functools
 import json
 from io import StringIO
 from logging import getLogger
+from math import isfinite
 
 import ruamel.yaml as yaml
 
 from ..auxlib.entity import EntityEncoder
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 log = getLogger(__name__)
 
 
@@ -62,11 +68,124 @@ def yaml_safe_dump(object, stream=None):
         return ostream.getvalue()
 
 
-def json_load(string):
+def _stdlib_json_load(string):
     return json.loads(string)
 
 
-def json_dump(object):
+def _stdlib_json_dump(object):
     return json.dumps(
         object, indent=2, sort_keys=True, separators=(",", ": "), cls=EntityEncoder
     )
+
+
+class _NotPlainJSON(Exception):
+    """Raised for values orjson would not encode exactly like `_stdlib_json_dump`."""
+
+
+_entity_default = EntityEncoder().default
+_PLAIN_LEAVES = frozenset((str, int, bool, type(None)))
+_DIGITS_TO_ZEROS = bytes.maketrans(b"123456789", b"000000000")
+_LONG_DIGITS = b"0" * 20
+
+
+def _has_long_integer(document):
+    """
+    Whether the ``bytes`` ``document`` may contain an integer of 20 or more
+    digits.
+
+    Runs of digits inside strings, like those in sha256 hashes, are skipped
+    by looking at the character before them.
+    """
+    digits = document.translate(_DIGITS_TO_ZEROS)
+    start = digits.find(_LONG_DIGITS)
+    while start != -1:
+        if document[start - 1 : start] in b":,[- \t\r\n":
+            return True
+        start = digits.find(_LONG_DIGITS, start + 1)
+    return False
+
+
+def _plain_json(obj):
+    """
+    Reduce ``obj`` to the dicts, lists, strings, numbers, booleans and Nones
+    that `_stdlib_json_dump` would write for it, calling `EntityEncoder.default`
+    where the stdlib encoder would.
+    """
+    cls = type(obj)
+    if cls is str or cls is int or cls is bool or obj is None:
+        return obj
+    elif cls is dict:
+        plain = {}
+        for key, value in obj.items():
+            if type(key) is not str:
+                raise _NotPlainJSON(key)
+            # inline the common leaves, this runs for every value dumped
+            plain[key] = value if type(value) in _PLAIN_LEAVES else _plain_json(value)
+        return plain
+    elif cls is list or cls is tuple:
+        return [
+            item if type(item) in _PLAIN_LEAVES else _plain_json(item) for item in obj
+        ]
+    elif isinstance(obj, str):
+        return str.__str__(obj)
+    elif isinstance(obj, float):
+        # stdlib writes 1e+16 and NaN where orjson writes 1e16 and null
+        if not isfinite(obj) or "e" in float.__repr__(obj):
+            raise _NotPlainJSON(obj)
+        return float(obj)
+    elif isinstance(obj, int):
+        return int.__int__(obj)
+    elif isinstance(obj, (list, tuple)):
+        return _plain_json(list(obj))
+    elif isinstance(obj, dict):
+        return _plain_json(dict(obj.items()))
+    return _plain_json(_entity_default(obj))
+
+
+def _orjson_load(string):
+    document = string.encode() if isinstance(string, str) else string
+    # orjson reads integers beyond 64 bits as floats
+    if not _has_long_integer(document):
+        try:
+            return orjson.loads(document)
+        except orjson.JSONDecodeError:
+            pass
+    # NaN and Infinity are only accepted by stdlib, which also raises the
+    # canonical errors for invalid documents
+    return json.loads(string)
+
+
+def _orjson_dump(object):
+    try:
+        dumped = orjson.dumps(
+            _plain_json(object), option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+        )
+    except (_NotPlainJSON, RecursionError, TypeError):
+        dumped = None
+    # stdlib escapes DEL and everything beyond ASCII
+    if dumped is None or not dumped.isascii() or b"\x7f" in dumped:
+        return _stdlib_json_dump(object)
+    return dumped.decode()
+
+
+#: name -> (load, dump) of the JSON backends available for `json_load`/`json_dump`
+JSON_BACKENDS = {"json": (_stdlib_json_load, _stdlib_json_dump)}
+if orjson is not None:
+    JSON_BACKENDS["orjson"] = (_orjson_load, _orjson_dump)
+
+#: the fastest available backend; its output is identical to the stdlib backend
+JSON_BACKEND = "orjson" if "orjson" in JSON_BACKENDS else "json"
+
+
+def json_load(string):
+    """Parse a JSON ``str`` or UTF-8 encoded ``bytes`` document."""
+    return JSON_BACKENDS[JSON_BACKEND][0](string)
+
+
+def json_dump(object):
+    """
+    Serialize ``object`` as sorted, 2-space indented, ASCII-only JSON.
+
+    Entities and other objects are serialized with `EntityEncoder`.
+    """
+    return JSON_BACKENDS[JSON_BACKEND][1](object)
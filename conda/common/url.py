@@ -20,7 +20,7 @@ from urllib.parse import urlparse as _urlparse
 from urllib.parse import urlunparse as _urlunparse  # noqa: F401
 
 from .compat import on_win
-from .path import split_filename, strip_pkg_extension
+from .path import is_package_file, split_filename, strip_pkg_extension
 
 
 def hex_octal_to_int(ho):
@@ -228,7 +228,11 @@ class Url(namedtuple("Url", url_attrs)):
         return cls(**values)
 
 
-@lru_cache(maxsize=None)
+#: Number of URLs whose parts `urlparse` keeps
+URLPARSE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=URLPARSE_CACHE_SIZE)
 def urlparse(url: str) -> Url:
     if on_win and url.startswith("file:"):
         url.replace("\\", "/")
@@ -413,6 +417,22 @@ def split_scheme_auth_token(url):
     return str(remainder_url), url_parts.scheme, url_parts.auth, token
 
 
+def split_package_url(url):
+    """
+    Split the package filename off a package URL.
+
+    Examples:
+        >>> split_package_url("https://conda.io/pkgs/main/noarch/six-1.16.0-0.conda")
+        ('https://conda.io/pkgs/main/noarch', 'six-1.16.0-0.conda')
+        >>> split_package_url("https://conda.io/pkgs/main/noarch")
+        ('https://conda.io/pkgs/main/noarch', None)
+    """
+    if "/" in url and is_package_file(url):
+        base_url, package_filename = url.rsplit("/", 1)
+        return base_url, package_filename
+    return url, None
+
+
 def split_conda_url_easy_parts(known_subdirs, url):
     # scheme, auth, token, platform, package_filename, host, port, path, query
     cleaned_url, token = split_anaconda_token(url)
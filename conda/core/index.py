@@ -4,9 +4,13 @@
 
 from __future__ import annotations
 
+import json
+import os
 from collections import UserDict
+from hashlib import sha256
 from itertools import chain
 from logging import getLogger
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from boltons.setutils import IndexedSet
@@ -22,6 +26,7 @@ from ..exceptions import (
     OperationNotAllowed,
     PackagesNotFoundError,
 )
+from ..gateways.repodata import create_cache_dir
 from ..models.channel import Channel, all_channel_urls
 from ..models.match_spec import MatchSpec
 from ..models.records import EMPTY_LINK, PackageCacheRecord, PackageRecord, PrefixRecord
@@ -30,8 +35,6 @@ from .prefix_data import PrefixData
 from .subdir_data import SubdirData
 
 if TYPE_CHECKING:
-    import os
-    from pathlib import Path
     from typing import Any, Iterable, Self
 
 
@@ -73,6 +76,178 @@ def check_allowlist(channel_urls: list[str]) -> None:
 
 LAST_CHANNEL_URLS = []
 
+REDUCED_INDEX_CACHE_DIR = "reduced_index"
+#: least recently used entries are evicted beyond this total size, in bytes
+REDUCED_INDEX_CACHE_MAX_SIZE = 32 * 1024 * 1024
+# the cache state of a subdir's repodata that the records depend on
+_FINGERPRINT_FIELDS = ("_url", "_etag", "_mod", "_size")
+# repodata of a subdir that the channel doesn't have is saved as {}
+_EMPTY_REPODATA_SIZE = 2
+
+
+def _repodata_fingerprint(subdir_data: SubdirData) -> list | None:
+    """
+    Return the cache state of a loaded subdir's repodata, or None if it has
+    none to tell whether the repodata changed.
+    """
+    state = subdir_data._internal_state
+    if not (
+        state.get("_etag")
+        or state.get("_mod")
+        or state.get("_size") == _EMPTY_REPODATA_SIZE
+    ):
+        return None
+    return [
+        subdir_data.url_w_repodata_fn,
+        *(state.get(field) for field in _FINGERPRINT_FIELDS),
+    ]
+
+
+class _LRUCacheDir:
+    """
+    JSON entries in a directory of the index cache, by key. The least recently
+    used entries are evicted when they take up more than ``max_size`` bytes.
+    """
+
+    #: directory in the index cache
+    dir_name: str
+    max_size: int
+
+    def __init__(
+        self,
+        cache_dir: str | os.PathLike[str] | Path | None = None,
+        max_size: int | None = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir or Path(create_cache_dir(), self.dir_name))
+        if max_size is not None:
+            self.max_size = max_size
+
+    @staticmethod
+    def _hash(key: dict[str, Any]) -> str:
+        return sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _load(self, key: str) -> Any:
+        try:
+            return json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _touch(self, key: str) -> None:
+        """Mark an entry as recently used."""
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _save(self, key: str, data: Any) -> None:
+        path = self._path(key)
+        temp_path = path.with_name(f"{path.name}.{os.urandom(2).hex()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(json.dumps(data))
+            os.replace(temp_path, path)
+        except OSError as e:
+            log.debug("Could not save %s (%s)", path, e)
+            temp_path.unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries beyond ``max_size``."""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            log.debug("Evicting %s", path)
+            path.unlink(missing_ok=True)
+            size -= entry_size
+
+
+class ReducedIndexCache(_LRUCacheDir):
+    """
+    On-disk cache of the channel records of a :class:`ReducedIndex`.
+
+    The records of a reduced index only depend on the package names and track
+    features that its dependency search starts from, and on the repodata of
+    each subdir. Entries are keyed by those and by the cache state of every
+    subdir's repodata, so they are only used while all of it is unchanged.
+    Records are stored by URL and looked up in the subdirs again, rather than
+    copied.
+
+    Least recently used entries are evicted when the entries take up more than
+    ``max_size`` bytes.
+    """
+
+    dir_name = REDUCED_INDEX_CACHE_DIR
+    max_size = REDUCED_INDEX_CACHE_MAX_SIZE
+
+    @classmethod
+    def key(
+        cls,
+        subdir_datas: Iterable[SubdirData],
+        names: Iterable[str],
+        track_features: Iterable[str],
+    ) -> str | None:
+        """
+        Return the key of an entry for loaded ``subdir_datas``, or None if the
+        repodata of a subdir has no cache state to tell whether it changed.
+        """
+        fingerprints = [
+            _repodata_fingerprint(subdir_data) for subdir_data in subdir_datas
+        ]
+        if None in fingerprints:
+            return None
+        return cls._hash(
+            {
+                "subdirs": fingerprints,
+                "names": sorted(names),
+                "track_features": sorted(track_features),
+                "add_pip_as_python_dependency": context.add_pip_as_python_dependency,
+                "use_only_tar_bz2": context.use_only_tar_bz2,
+            }
+        )
+
+    def get(
+        self, key: str, subdir_datas: Iterable[SubdirData]
+    ) -> list[PackageRecord] | None:
+        """Return the records cached for ``key``, or None."""
+        entries = self._load(key)
+        if entries is None:
+            return None
+
+        subdir_datas = tuple(subdir_datas)
+        by_name = {}
+        records = []
+        for name, url in entries:
+            if name not in by_name:
+                by_name[name] = {
+                    prec.url: prec
+                    for subdir_data in subdir_datas
+                    for prec in subdir_data._iter_records_by_name(name)
+                }
+            try:
+                records.append(by_name[name][url])
+            except KeyError:
+                log.debug("Discarding reduced index cache %s without %s", key, url)
+                return None
+
+        self._touch(key)
+        return records
+
+    def put(self, key: str, records: Iterable[PackageRecord]) -> None:
+        """Save ``records`` for ``key``, and evict entries beyond ``max_size``."""
+        self._save(key, [[prec.name, prec.url] for prec in records])
+
 
 class Index(UserDict):
     """The ``Index`` provides information about available packages from all relevant sources.
@@ -369,6 +544,7 @@ class Index(UserDict):
                 self._data[pcrec] = pcrec
 
     def _realize(self) -> None:
+        SubdirData.load_all(chain.from_iterable(self.channels.values()))
         self._data = {}
         for subdir_datas in self.channels.values():
             for subdir_data in subdir_datas:
@@ -580,6 +756,24 @@ class ReducedIndex(Index):
             push_records(*self.prefix_data.iter_records())
         push_specs(*self.specs)
 
+        # download every subdir at once; later queries add names to sparse loads
+        subdir_datas = list(chain.from_iterable(reversed(self.channels.values())))
+        SubdirData.load_all(subdir_datas, names=pending_names)
+
+        cache = cache_key = None
+        if "reduced_index" in context.experimental:
+            cache = ReducedIndexCache()
+            cache_key = cache.key(subdir_datas, pending_names, pending_track_features)
+        if cache_key:
+            cached = cache.get(cache_key, subdir_datas)
+            if cached is not None:
+                log.debug("Using cached reduced index %s", cache_key)
+                records.update(cached)
+                pending_names.clear()
+                pending_track_features.clear()
+            else:
+                log.debug("Reduced index %s is not cached", cache_key)
+
         while pending_names or pending_track_features:
             while pending_names:
                 name = pending_names.pop()
@@ -603,6 +797,9 @@ class ReducedIndex(Index):
                 push_records(*new_records)
                 records.update(new_records)
 
+        if cache_key and cached is None:
+            cache.put(cache_key, records)
+
         self._data = {rec: rec for rec in records}
 
         self._supplement_index_dict_with_prefix()
@@ -348,6 +348,26 @@ class UnlinkLinkTransaction:
         finally:
             rm_rf(self.transaction_context["temp_dir"])
 
+        self._update_package_caches()
+
+    def _update_package_caches(self):
+        """Record which package cache entries were linked, and evict unused ones."""
+        if not (context.pkgs_max_size or context.pkgs_max_age):
+            # eviction is disabled; don't write last-used markers nobody reads
+            return
+        for stp in self.prefix_setups.values():
+            for prec in stp.link_precs:
+                try:
+                    pcrec = PackageCacheData.get_entry_to_link(prec)
+                except CondaError as e:
+                    log.debug("cannot record use of %s: %r", prec, e)
+                    continue
+                PackageCacheData(dirname(pcrec.extracted_package_dir)).mark_used(pcrec)
+        try:
+            PackageCacheData.evict_least_recently_used()
+        except (OSError, CondaError) as e:
+            log.warning("Failed to evict packages from the package cache: %r", e)
+
     def _get_pfe(self):
         from .package_cache_data import ProgressiveFetchExtract
 
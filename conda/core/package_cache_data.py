@@ -5,18 +5,28 @@
 from __future__ import annotations
 
 import codecs
+import json
 import os
 from collections import defaultdict
-from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+from concurrent.futures import (
+    CancelledError,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from contextlib import contextmanager
 from errno import EACCES, ENOENT, EPERM, EROFS
 from functools import partial
-from itertools import chain
+from heapq import heappop, heappush
+from itertools import chain, count
 from json import JSONDecodeError
 from logging import getLogger
 from os import scandir
 from os.path import basename, dirname, getsize, join
 from sys import platform
 from tarfile import ReadError
+from threading import Lock
+from time import time, time_ns
 from typing import TYPE_CHECKING
 
 from .. import CondaError, CondaMultiError, conda_signal_handler
@@ -27,24 +37,30 @@ from ..base.constants import (
     CONDA_PACKAGE_EXTENSION_V1,
     CONDA_PACKAGE_EXTENSION_V2,
     CONDA_PACKAGE_EXTENSIONS,
+    PACKAGE_CACHE_INDEX_FILE,
+    PACKAGE_CACHE_LAST_USED_DIR,
     PACKAGE_CACHE_MAGIC_FILE,
+    PACKAGE_CACHE_STORE_DIR,
 )
 from ..base.context import context
 from ..common.constants import NULL, TRACE
 from ..common.io import IS_INTERACTIVE, time_recorder
 from ..common.iterators import groupby_to_dict as groupby
 from ..common.path import expand, strip_pkg_extension, url_to_path
+from ..common.serialize import json_load
 from ..common.signals import signal_handler
 from ..common.url import path_to_url
 from ..exceptions import NotWritableError, NoWritablePkgsDirError
 from ..gateways.disk.create import (
     create_package_cache_directory,
     extract_tarball,
+    mkdir_p,
     write_as_json_to_file,
 )
 from ..gateways.disk.delete import rm_rf
 from ..gateways.disk.read import (
     compute_sum,
+    count_hard_links,
     isdir,
     isfile,
     islink,
@@ -60,7 +76,6 @@ from ..utils import human_bytes
 from .path_actions import CacheUrlAction, ExtractPackageAction
 
 if TYPE_CHECKING:
-    from concurrent.futures import Future
     from pathlib import Path
 
     from ..plugins.types import ProgressBarBase
@@ -77,6 +92,53 @@ except ImportError:
 EXTRACT_THREADS = min(os.cpu_count() or 1, 3) if THREADSAFE_EXTRACT else 1
 
 
+def _extract_threads():
+    # EXTRACT_THREADS, less the CPUs other processes already keep busy
+    try:
+        load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        # not available on Windows
+        return EXTRACT_THREADS
+    return max(1, min(EXTRACT_THREADS, (os.cpu_count() or 1) - int(load)))
+
+
+def _expected_size(prec: PackageRecord | MatchSpec) -> int:
+    # the test suite passes MatchSpec in here, is that an intentional feature?
+    try:
+        return int(prec.size)  # type: ignore
+    except (LookupError, ValueError, AttributeError, TypeError):
+        return 0
+
+
+PACKAGE_CACHE_INDEX_VERSION = 1
+# A directory modified this close to the scan that indexed it may change again
+# without its mtime changing, so such an index is only trusted after a rescan.
+PACKAGE_CACHE_INDEX_RACY_NS = 2_000_000_000
+
+
+def _directory_size(path):
+    size = 0
+    for root, _, files in os.walk(path):
+        for file in files:
+            try:
+                size += os.lstat(join(root, file)).st_size
+            except OSError:
+                pass
+    return size
+
+
+def _stat_or_none(path):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _stat_signature(path):
+    stat = _stat_or_none(path)
+    return None if stat is None else [stat.st_size, stat.st_mtime_ns]
+
+
 class PackageCacheType(type):
     """This metaclass does basic caching of PackageCache instance objects."""
 
@@ -93,11 +155,17 @@ class PackageCacheType(type):
 
 class PackageCacheData(metaclass=PackageCacheType):
     _cache_: dict[str, PackageCacheData] = {}
+    # caches with index changes to write once deferred_index_writes() exits
+    _deferred_index_writes: set[PackageCacheData] | None = None
 
     def __init__(self, pkgs_dir):
         self.pkgs_dir = pkgs_dir
         self.__package_cache_records = None
         self.__is_writable = NULL
+        # base name -> {"stat": ..., "record": ...}, when the index is in use
+        self._index_entries = None
+        self._index_mtime_ns = None
+        self._index_scanned_ns = None
 
         self._urls_data = UrlsData(pkgs_dir)
 
@@ -109,13 +177,52 @@ class PackageCacheData(metaclass=PackageCacheType):
 
         self._package_cache_records[package_cache_record] = package_cache_record
 
+        if self._index_entries is not None:
+            base_name = self._index_base_name(package_cache_record)
+            if base_name:
+                self._index_entries[base_name] = self._index_entry(
+                    base_name, package_cache_record
+                )
+                self._index_changed()
+
     def load(self):
         self.__package_cache_records = _package_cache_records = {}
+        self._index_entries = None
         self._check_writable()  # called here to create the cache if it doesn't exist
         if not isdir(self.pkgs_dir):
             # no directory exists, and we didn't have permissions to create it
             return
 
+        use_index = "package_cache_index" in context.experimental
+        known_entries = {}
+        if use_index:
+            if self.is_writable:
+                # the index lives in a subdirectory so that writing it does not
+                # change the mtime of pkgs_dir
+                mkdir_p(dirname(self._index_path))
+            mtime_ns = os.stat(self.pkgs_dir).st_mtime_ns
+            scanned_ns = time_ns()
+            index = self._read_index()
+            if index:
+                if (
+                    index["mtime_ns"] == mtime_ns
+                    and mtime_ns < index["scanned_ns"] - PACKAGE_CACHE_INDEX_RACY_NS
+                ):
+                    # nothing was added to or removed from pkgs_dir since the scan
+                    for base_name, entry in index["entries"].items():
+                        package_cache_record = self._index_record(
+                            base_name, entry["record"]
+                        )
+                        _package_cache_records[package_cache_record] = (
+                            package_cache_record
+                        )
+                    self._index_entries = index["entries"]
+                    self._index_mtime_ns = mtime_ns
+                    self._index_scanned_ns = index["scanned_ns"]
+                    return
+                known_entries = index["entries"]
+            index_entries = {}
+
         _CONDA_TARBALL_EXTENSIONS = CONDA_PACKAGE_EXTENSIONS
         pkgs_dir_contents = tuple(entry.name for entry in scandir(self.pkgs_dir))
         for base_name in self._dedupe_pkgs_dir_contents(pkgs_dir_contents):
@@ -128,18 +235,39 @@ class PackageCacheData(metaclass=PackageCacheType):
                 or isfile(full_path)
                 and full_path.endswith(_CONDA_TARBALL_EXTENSIONS)
             ):
-                try:
-                    package_cache_record = self._make_single_record(base_name)
-                except ValidationError as err:
-                    # ValidationError: package fields are invalid
-                    log.warning(
-                        f"Failed to create package cache record for '{base_name}'. {err}"
+                known_entry = known_entries.get(base_name)
+                if known_entry and known_entry["stat"] == self._index_stat(base_name):
+                    package_cache_record = self._index_record(
+                        base_name, known_entry["record"]
                     )
-                    package_cache_record = None
+                else:
+                    try:
+                        package_cache_record = self._make_single_record(base_name)
+                    except ValidationError as err:
+                        # ValidationError: package fields are invalid
+                        log.warning(
+                            f"Failed to create package cache record for '{base_name}'. {err}"
+                        )
+                        package_cache_record = None
 
                 # if package_cache_record is None, it means we couldn't create a record, ignore
                 if package_cache_record:
                     _package_cache_records[package_cache_record] = package_cache_record
+                    if use_index:
+                        index_entries[base_name] = self._index_entry(
+                            base_name, package_cache_record
+                        )
+
+        if use_index:
+            self._index_entries = index_entries
+            self._index_mtime_ns = mtime_ns
+            self._index_scanned_ns = scanned_ns
+            self._write_index()
+
+    def rebuild_index(self):
+        """Discard the persistent index of this cache and build it from a full scan."""
+        rm_rf(self._index_path)
+        return self.reload()
 
     def reload(self):
         self.load()
@@ -157,9 +285,17 @@ class PackageCacheData(metaclass=PackageCacheType):
 
     def remove(self, package_ref, default=NULL):
         if default is NULL:
-            return self._package_cache_records.pop(package_ref)
+            package_cache_record = self._package_cache_records.pop(package_ref)
         else:
-            return self._package_cache_records.pop(package_ref, default)
+            package_cache_record = self._package_cache_records.pop(package_ref, default)
+
+        if self._index_entries is not None and isinstance(
+            package_cache_record, PackageCacheRecord
+        ):
+            base_name = self._index_base_name(package_cache_record)
+            if self._index_entries.pop(base_name, None) is not None:
+                self._index_changed()
+        return package_cache_record
 
     def query(self, package_ref_or_match_spec):
         # returns a generator
@@ -167,11 +303,7 @@ class PackageCacheData(metaclass=PackageCacheType):
         if isinstance(param, str):
             param = MatchSpec(param)
         if isinstance(param, MatchSpec):
-            return (
-                pcrec
-                for pcrec in self._package_cache_records.values()
-                if param.match(pcrec)
-            )
+            return param.filter(self._package_cache_records.values())
         else:
             assert isinstance(param, PackageRecord)
             return (
@@ -300,6 +432,42 @@ class PackageCacheData(metaclass=PackageCacheType):
     def clear(cls):
         cls._cache_.clear()
 
+    @classmethod
+    def evict_least_recently_used(cls, pkgs_dirs=None):
+        """
+        Evict entries from the writable package caches as configured by
+        ``pkgs_max_size`` and ``pkgs_max_age``.
+        """
+        if not (context.pkgs_max_size or context.pkgs_max_age):
+            return
+        for package_cache in cls.writable_caches(pkgs_dirs):
+            evictions = package_cache.find_lru_evictions(
+                context.pkgs_max_size, context.pkgs_max_age
+            )
+            if evictions:
+                log.info(
+                    "evicting %d least recently used packages from %s",
+                    len(evictions),
+                    package_cache.pkgs_dir,
+                )
+                package_cache.evict(evictions)
+
+    @classmethod
+    @contextmanager
+    def deferred_index_writes(cls):
+        """Write each changed package cache index once, when the block exits."""
+        if cls._deferred_index_writes is not None:
+            # already deferred by an enclosing block
+            yield
+            return
+        cls._deferred_index_writes = deferred = set()
+        try:
+            yield
+        finally:
+            cls._deferred_index_writes = None
+            for package_cache in deferred:
+                package_cache._write_index()
+
     def tarball_file_in_this_cache(self, tarball_path, md5sum=None):
         tarball_full_path, md5sum = self._clean_tarball_path_and_get_md5sum(
             tarball_path, md5sum
@@ -348,6 +516,259 @@ class PackageCacheData(metaclass=PackageCacheType):
 
         return tarball_full_path, md5sum
 
+    def mark_used(self, package_cache_record):
+        """Record that ``package_cache_record`` was just linked into an environment."""
+        if not self.is_writable:
+            return
+        marker = self._last_used_path(package_cache_record)
+        try:
+            if isfile(marker):
+                os.utime(marker)
+            else:
+                self._write_last_used(package_cache_record, time())
+        except OSError as e:
+            log.debug("cannot record use of %s: %r", marker, e)
+
+    def find_lru_evictions(self, max_size=0, max_age=0):
+        """
+        Find the least recently used entries to evict, so that this cache holds at
+        most ``max_size`` bytes and no entry unused for more than ``max_age`` days.
+        0 disables either limit. Entries hard linked into environments are kept.
+
+        Returns a list of ``(package_cache_record, {name: size})`` tuples, naming
+        the extracted directory and tarballs of each entry within ``pkgs_dir``.
+        """
+        if not (max_size or max_age) or not self.is_writable:
+            return []
+
+        entries = []
+        total_size = 0
+        for package_cache_record in self.values():
+            last_used, sizes = self._last_used(package_cache_record)
+            entries.append((last_used, package_cache_record, sizes))
+            total_size += sum(sizes.values())
+        self._prune_last_used(entries)
+        entries.sort(key=lambda entry: entry[0])
+
+        now = time()
+        evictions = []
+        links = None
+        for last_used, package_cache_record, sizes in entries:
+            too_old = max_age and now - last_used > max_age * 86400
+            too_big = max_size and total_size > max_size
+            if not (too_old or too_big):
+                # everything else is newer, and the cache is small enough
+                break
+            if links is None:
+                links = self._links_within_cache()
+            if self._is_linked_elsewhere(package_cache_record, links):
+                continue
+            evictions.append((package_cache_record, sizes))
+            total_size -= sum(sizes.values())
+        return evictions
+
+    def evict(self, evictions):
+        """Remove entries found by `find_lru_evictions` from this cache."""
+        for package_cache_record, sizes in evictions:
+            for name in sizes:
+                rm_rf(join(self.pkgs_dir, name))
+            rm_rf(self._last_used_path(package_cache_record))
+            self.remove(package_cache_record, None)
+
+        # content store files no remaining package links to
+        for root, _, files in os.walk(join(self.pkgs_dir, PACKAGE_CACHE_STORE_DIR)):
+            for file in files:
+                path = join(root, file)
+                if (stat := _stat_or_none(path)) and stat.st_nlink == 1:
+                    rm_rf(path)
+
+    def _last_used_path(self, package_cache_record):
+        return join(
+            self.pkgs_dir,
+            PACKAGE_CACHE_LAST_USED_DIR,
+            basename(package_cache_record.extracted_package_dir),
+        )
+
+    def _entry_sizes(self, package_cache_record, extracted_size):
+        # the extracted directory and any tarballs of the entry in pkgs_dir
+        extracted_package_dir = package_cache_record.extracted_package_dir
+        sizes = {}
+        if isdir(extracted_package_dir):
+            sizes[basename(extracted_package_dir)] = extracted_size
+        for ext in CONDA_PACKAGE_EXTENSIONS:
+            try:
+                sizes[basename(extracted_package_dir) + ext] = getsize(
+                    extracted_package_dir + ext
+                )
+            except OSError:
+                pass
+        return sizes
+
+    def _write_last_used(self, package_cache_record, last_used):
+        # the marker's mtime is the time of last use, and it stores the size of the
+        # extracted directory so that it is only walked once
+        marker = self._last_used_path(package_cache_record)
+        extracted_size = _directory_size(package_cache_record.extracted_package_dir)
+        mkdir_p(dirname(marker))
+        with open(marker, "w") as fh:
+            fh.write(str(extracted_size))
+        os.utime(marker, (last_used, last_used))
+        return extracted_size
+
+    def _last_used(self, package_cache_record):
+        extracted_package_dir = package_cache_record.extracted_package_dir
+        # extracting or downloading an entry again counts as a use
+        changed = max(
+            (
+                stat.st_mtime
+                for path in (
+                    extracted_package_dir,
+                    *(extracted_package_dir + ext for ext in CONDA_PACKAGE_EXTENSIONS),
+                )
+                if (stat := _stat_or_none(path))
+            ),
+            default=0,
+        )
+        marker = self._last_used_path(package_cache_record)
+        try:
+            last_used = max(os.stat(marker).st_mtime, changed)
+            with open(marker) as fh:
+                extracted_size = int(fh.read())
+        except (OSError, ValueError):
+            last_used = changed
+            try:
+                extracted_size = self._write_last_used(package_cache_record, changed)
+            except OSError as e:
+                log.debug("cannot record use of %s: %r", marker, e)
+                extracted_size = _directory_size(extracted_package_dir)
+        return last_used, self._entry_sizes(package_cache_record, extracted_size)
+
+    def _prune_last_used(self, entries):
+        # forget the markers of entries that were removed some other way
+        names = {
+            basename(package_cache_record.extracted_package_dir)
+            for _, package_cache_record, _ in entries
+        }
+        try:
+            markers = tuple(
+                entry.name
+                for entry in scandir(join(self.pkgs_dir, PACKAGE_CACHE_LAST_USED_DIR))
+            )
+        except OSError:
+            return
+        for name in markers:
+            if name not in names:
+                rm_rf(join(self.pkgs_dir, PACKAGE_CACHE_LAST_USED_DIR, name))
+
+    def _links_within_cache(self):
+        # only the content store links files within the package cache to each other
+        store = join(self.pkgs_dir, PACKAGE_CACHE_STORE_DIR)
+        if not isdir(store):
+            return {}
+        return count_hard_links(
+            store,
+            *(
+                package_cache_record.extracted_package_dir
+                for package_cache_record in self.values()
+            ),
+        )
+
+    @staticmethod
+    def _is_linked_elsewhere(package_cache_record, links):
+        for root, _, files in os.walk(package_cache_record.extracted_package_dir):
+            for file in files:
+                try:
+                    stat = os.lstat(join(root, file))
+                except OSError:
+                    continue
+                if stat.st_nlink > links.get((stat.st_dev, stat.st_ino), 1):
+                    return True
+        return False
+
+    @property
+    def _index_path(self):
+        return join(self.pkgs_dir, PACKAGE_CACHE_INDEX_FILE)
+
+    def _index_stat(self, base_name):
+        # changes whenever the package is replaced or re-extracted
+        full_path = join(self.pkgs_dir, base_name)
+        info_dir = join(strip_pkg_extension(full_path)[0], "info")
+        return [
+            _stat_signature(full_path),
+            _stat_signature(join(info_dir, "repodata_record.json")),
+            _stat_signature(join(info_dir, "index.json")),
+        ]
+
+    def _index_entry(self, base_name, package_cache_record):
+        return {
+            "stat": self._index_stat(base_name),
+            "record": PackageRecord.from_objects(package_cache_record).dump(),
+        }
+
+    def _index_record(self, base_name, record):
+        package_tarball_full_path = join(self.pkgs_dir, base_name)
+        return PackageCacheRecord.from_objects(
+            record,
+            package_tarball_full_path=package_tarball_full_path,
+            extracted_package_dir=strip_pkg_extension(package_tarball_full_path)[0],
+        )
+
+    def _index_base_name(self, package_cache_record):
+        # the name load() would find this record under, if it is in this cache
+        for path in (
+            package_cache_record.package_tarball_full_path,
+            package_cache_record.extracted_package_dir,
+        ):
+            if path and dirname(path) == self.pkgs_dir and os.path.lexists(path):
+                return basename(path)
+        return None
+
+    def _index_changed(self):
+        # entries are current, but pkgs_dir has not been rescanned since they
+        # changed: clear the stamp so the next load() rescans it cheaply
+        self._index_mtime_ns = None
+        if PackageCacheData._deferred_index_writes is not None:
+            PackageCacheData._deferred_index_writes.add(self)
+        else:
+            self._write_index()
+
+    def _read_index(self):
+        try:
+            with open(self._index_path, "rb") as fh:
+                index = json_load(fh.read())
+        except (OSError, ValueError) as e:
+            log.log(
+                TRACE, "cannot read package cache index %s: %r", self._index_path, e
+            )
+            return None
+        if (
+            not isinstance(index, dict)
+            or index.get("version") != PACKAGE_CACHE_INDEX_VERSION
+        ):
+            return None
+        return index
+
+    def _write_index(self):
+        if self._index_entries is None or not self.is_writable:
+            return
+        index = {
+            "version": PACKAGE_CACHE_INDEX_VERSION,
+            "mtime_ns": self._index_mtime_ns,
+            "scanned_ns": self._index_scanned_ns,
+            "entries": dict(self._index_entries),
+        }
+        # write to a temporary file and rename it into place, so concurrent
+        # readers see either the old or the new index
+        temp_path = f"{self._index_path}.{os.getpid()}.{os.urandom(4).hex()}"
+        try:
+            mkdir_p(dirname(temp_path))
+            with open(temp_path, "w") as fh:
+                json.dump(index, fh, separators=(",", ":"))
+            os.replace(temp_path, self._index_path)
+        except (OSError, TypeError) as e:
+            log.debug("cannot write package cache index %s: %r", self._index_path, e)
+            rm_rf(temp_path)
+
     def _scan_for_dist_no_channel(self, dist_str):
         return next(
             (
@@ -750,15 +1171,7 @@ class ProgressiveFetchExtract:
             return
 
         # Download largest first
-        def by_size(prec: PackageRecord | MatchSpec):
-            # the test suite passes MatchSpec in here, is that an intentional
-            # feature?
-            try:
-                return int(prec.size)  # type: ignore
-            except (LookupError, ValueError, AttributeError):
-                return 0
-
-        largest_first = sorted(self.link_precs, key=by_size, reverse=True)
+        largest_first = sorted(self.link_precs, key=_expected_size, reverse=True)
 
         self.paired_actions.update(
             (prec, self.make_actions_for_record(prec)) for prec in largest_first
@@ -820,12 +1233,50 @@ class ProgressiveFetchExtract:
                 nonlocal cancelled_flag
                 return cancelled_flag
 
+            # Packages are extracted largest first among those downloaded so far:
+            # each extract task takes the largest waiting package when it starts.
+            pending_extracts: list[tuple[int, int, PackageRecord | MatchSpec]] = []
+            pending_extracts_lock = Lock()
+            submitted = count()
+
+            def extract_largest():
+                with pending_extracts_lock:
+                    _, _, prec_or_spec = heappop(pending_extracts)
+                cache_action, extract_action = self.paired_actions[prec_or_spec]
+                progress_bar = progress_bars[prec_or_spec]
+                future = Future()
+                try:
+                    future.set_result(
+                        do_extract_action(prec_or_spec, extract_action, progress_bar)
+                    )
+                except BaseException as e:
+                    future.set_exception(e)
+                done_callback(
+                    future,
+                    actions=(cache_action, extract_action),
+                    exceptions=exceptions,
+                    progress_bar=progress_bar,
+                    finish=True,
+                )
+
+            def submit_extract(prec_or_spec):
+                with pending_extracts_lock:
+                    heappush(
+                        pending_extracts,
+                        (
+                            -_expected_size(prec_or_spec),
+                            next(submitted),
+                            prec_or_spec,
+                        ),
+                    )
+                extract_executor.submit(extract_largest)
+
             with signal_handler(conda_signal_handler), time_recorder(
                 "fetch_extract_execute"
-            ), ThreadPoolExecutor(
+            ), PackageCacheData.deferred_index_writes(), ThreadPoolExecutor(
                 context.fetch_threads
             ) as fetch_executor, ThreadPoolExecutor(
-                EXTRACT_THREADS
+                _extract_threads()
             ) as extract_executor:
                 for prec_or_spec, (
                     cache_action,
@@ -841,12 +1292,18 @@ class ProgressiveFetchExtract:
 
                     progress_bars[prec_or_spec] = progress_bar
 
+                    if cache_action is None:
+                        # already downloaded, don't wait for a download thread
+                        submit_extract(prec_or_spec)
+                        continue
+
                     future = fetch_executor.submit(
                         do_cache_action,
                         prec_or_spec,
                         cache_action,
                         progress_bar,
                         cancelled=cancelled,
+                        extract_action=extract_action,
                     )
 
                     future.add_done_callback(
@@ -863,24 +1320,7 @@ class ProgressiveFetchExtract:
                 try:
                     for completed_future in as_completed(futures):
                         futures.remove(completed_future)
-                        prec_or_spec = completed_future.result()
-
-                        cache_action, extract_action = self.paired_actions[prec_or_spec]
-                        extract_future = extract_executor.submit(
-                            do_extract_action,
-                            prec_or_spec,
-                            extract_action,
-                            progress_bars[prec_or_spec],
-                        )
-                        extract_future.add_done_callback(
-                            partial(
-                                done_callback,
-                                actions=(cache_action, extract_action),
-                                exceptions=exceptions,
-                                progress_bar=progress_bars[prec_or_spec],
-                                finish=True,
-                            )
-                        )
+                        submit_extract(completed_future.result())
                 except BaseException as e:
                     # We are interested in KeyboardInterrupt delivered to
                     # as_completed() while waiting, or any exception raised from
@@ -948,13 +1388,36 @@ class ProgressiveFetchExtract:
         return hash(self) == hash(other)
 
 
-def do_cache_action(prec, cache_action, progress_bar, download_total=1.0, *, cancelled):
-    """This function gets called from `ProgressiveFetchExtract.execute`."""
+def do_cache_action(
+    prec,
+    cache_action,
+    progress_bar,
+    download_total=1.0,
+    *,
+    cancelled,
+    extract_action=None,
+):
+    """
+    This function gets called from `ProgressiveFetchExtract.execute`.
+
+    With ``--experimental=stream_extract``, ``.conda`` packages are extracted
+    by ``extract_action`` while they download; `do_extract_action` then only
+    publishes the extracted package.
+    """
     # pass None if already cached (simplifies code)
     if not cache_action:
         return prec
     cache_action.verify()
 
+    extract = None
+    if (
+        "stream_extract" in context.experimental
+        and extract_action
+        and extract_action.source_full_path == cache_action.target_full_path
+        and cache_action.target_full_path.endswith(CONDA_PACKAGE_EXTENSION_V2)
+    ):
+        extract = extract_action.stream_extract
+
     if not cache_action.url.startswith("file:/"):
 
         def progress_update_cache_action(pct_completed):
@@ -969,7 +1432,12 @@ def do_cache_action(prec, cache_action, progress_bar, download_total=1.0, *, can
         download_total = 0
         progress_update_cache_action = None
 
-    cache_action.execute(progress_update_cache_action)
+    try:
+        cache_action.execute(progress_update_cache_action, extract=extract)
+    except BaseException:
+        if extract:
+            extract_action.discard_stream()
+        raise
     return prec
 
 
@@ -13,7 +13,7 @@ from uuid import uuid4
 
 from .. import CondaError
 from ..auxlib.ish import dals
-from ..base.constants import CONDA_TEMP_EXTENSION
+from ..base.constants import CONDA_TEMP_EXTENSION, PACKAGE_CACHE_STORE_DIR
 from ..base.context import context
 from ..common.compat import on_win
 from ..common.constants import TRACE
@@ -42,7 +42,9 @@ from ..gateways.disk.create import (
     create_hard_link_or_copy,
     create_link,
     create_python_entry_point,
+    extract_conda_stream,
     extract_tarball,
+    link_to_content_store,
     make_menu,
     mkdir_p,
     write_as_json_to_file,
@@ -1202,7 +1204,11 @@ class CacheUrlAction(PathAction):
         assert "::" not in self.url
         self._verified = True
 
-    def execute(self, progress_update_callback=None):
+    def execute(self, progress_update_callback=None, extract=None):
+        """
+        ``extract`` is passed on to `download`, to process remote packages
+        while they are downloaded.
+        """
         # I hate inline imports, but I guess it's ok since we're importing from the conda.core
         # The alternative is passing the PackageCache class to CacheUrlAction __init__
         from .package_cache_data import PackageCacheData
@@ -1229,7 +1235,9 @@ class CacheUrlAction(PathAction):
                 source_path, target_package_cache, progress_update_callback
             )
         else:
-            self._execute_channel(target_package_cache, progress_update_callback)
+            self._execute_channel(
+                target_package_cache, progress_update_callback, extract=extract
+            )
 
     def _execute_local(
         self, source_path, target_package_cache, progress_update_callback=None
@@ -1287,7 +1295,9 @@ class CacheUrlAction(PathAction):
             else:
                 target_package_cache._urls_data.add_url(self.url)
 
-    def _execute_channel(self, target_package_cache, progress_update_callback=None):
+    def _execute_channel(
+        self, target_package_cache, progress_update_callback=None, extract=None
+    ):
         kwargs = {}
         if self.size is not None:
             kwargs["size"] = self.size
@@ -1299,6 +1309,7 @@ class CacheUrlAction(PathAction):
             self.url,
             self.target_full_path,
             progress_update_callback=progress_update_callback,
+            extract=extract,
             **kwargs,
         )
         target_package_cache._urls_data.add_url(self.url)
@@ -1338,10 +1349,35 @@ class ExtractPackageAction(PathAction):
         self.sha256 = sha256
         self.size = size
         self.md5 = md5
+        self._stream_extracted = False
 
     def verify(self):
         self._verified = True
 
+    @property
+    def stream_extract_path(self):
+        # in a subdirectory, so the package cache does not mistake it for a package
+        return join(self.target_pkgs_dir, ".partial", self.target_extracted_dirname)
+
+    def stream_extract(self, fileobj):
+        """
+        Extract the ``.conda`` package from ``fileobj`` while it is being
+        downloaded, into `stream_extract_path`. `execute` publishes it under
+        `target_full_path`, so it must only run after the download's checksum
+        has been verified.
+        """
+        self.discard_stream()
+        try:
+            extract_conda_stream(fileobj, self.stream_extract_path)
+        except BaseException:
+            rm_rf(self.stream_extract_path)
+            raise
+        self._stream_extracted = True
+
+    def discard_stream(self):
+        self._stream_extracted = False
+        rm_rf(self.stream_extract_path)
+
     def execute(self, progress_update_callback=None):
         # I hate inline imports, but I guess it's ok since we're importing from the conda.core
         # The alternative is passing the the classes to ExtractPackageAction __init__
@@ -1354,11 +1390,16 @@ class ExtractPackageAction(PathAction):
         if lexists(self.target_full_path):
             rm_rf(self.target_full_path)
 
-        extract_tarball(
-            self.source_full_path,
-            self.target_full_path,
-            progress_update_callback=progress_update_callback,
-        )
+        if self._stream_extracted:
+            log.log(TRACE, "already extracted to %s", self.stream_extract_path)
+            backoff_rename(self.stream_extract_path, self.target_full_path)
+            self._stream_extracted = False
+        else:
+            extract_tarball(
+                self.source_full_path,
+                self.target_full_path,
+                progress_update_callback=progress_update_callback,
+            )
 
         try:
             raw_index_json = read_index_json(self.target_full_path)
@@ -1372,6 +1413,13 @@ class ExtractPackageAction(PathAction):
             )
             sys.exit(1)
 
+        if "dedup_store" in context.experimental:
+            saved = link_to_content_store(
+                self.target_full_path,
+                join(self.target_pkgs_dir, PACKAGE_CACHE_STORE_DIR),
+            )
+            log.debug("%s: %d bytes shared with other packages", self, saved)
+
         if isinstance(self.record_or_spec, MatchSpec):
             url = self.record_or_spec.get_raw_value("url")
             assert url
@@ -1414,6 +1462,7 @@ class ExtractPackageAction(PathAction):
         target_package_cache.insert(package_cache_record)
 
     def reverse(self):
+        self.discard_stream()
         rm_rf(self.target_full_path)
         if lexists(self.hold_path):
             log.log(TRACE, "moving %s => %s", self.hold_path, self.target_full_path)
@@ -1421,6 +1470,7 @@ class ExtractPackageAction(PathAction):
             backoff_rename(self.hold_path, self.target_full_path)
 
     def cleanup(self):
+        self.discard_stream()
         rm_rf(self.hold_path)
 
     @property
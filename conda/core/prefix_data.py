@@ -205,11 +205,11 @@ class PrefixData(metaclass=PrefixDataType):
         if isinstance(param, str):
             param = MatchSpec(param)
         if isinstance(param, MatchSpec):
-            return (
-                prefix_rec
-                for prefix_rec in self.iter_records()
-                if param.match(prefix_rec)
-            )
+            package_name = param.get_exact_value("name")
+            if package_name:
+                prefix_rec = self._prefix_records.get(package_name)
+                return param.filter((prefix_rec,) if prefix_rec else ())
+            return param.filter(self.iter_records())
         else:
             assert isinstance(param, PackageRecord)
             return (
@@ -222,7 +222,7 @@ class PrefixData(metaclass=PrefixDataType):
 
     def _load_single_record(self, prefix_record_json_path):
         log.debug("loading prefix record %s", prefix_record_json_path)
-        with open(prefix_record_json_path) as fh:
+        with open(prefix_record_json_path, "rb") as fh:
             try:
                 json_data = json_load(fh.read())
             except (UnicodeDecodeError, json.JSONDecodeError):
@@ -37,7 +37,13 @@ from ..models.prefix_graph import PrefixGraph
 from ..models.version import VersionOrder
 from ..reporters import get_spinner
 from ..resolve import Resolve
-from .index import _supplement_index_with_system, get_reduced_index
+from .index import (
+    ReducedIndex,
+    _LRUCacheDir,
+    _repodata_fingerprint,
+    _supplement_index_with_system,
+    get_reduced_index,
+)
 from .link import PrefixSetup, UnlinkLinkTransaction
 from .prefix_data import PrefixData
 from .subdir_data import SubdirData
@@ -54,6 +60,10 @@ if TYPE_CHECKING:
 
 log = getLogger(__name__)
 
+SOLUTION_CACHE_DIR = "solutions"
+#: least recently used entries are evicted beyond this total size, in bytes
+SOLUTION_CACHE_MAX_SIZE = 32 * 1024 * 1024
+
 
 class Solver:
     """
@@ -358,6 +368,17 @@ class Solver:
             with get_spinner(f"Collecting package metadata ({self._repodata_fn})"):
                 ssc = self._collect_all_metadata(ssc)
 
+        solution_cache = cache_key = None
+        if "solution_cache" in context.experimental:
+            solution_cache = SolutionCache()
+            cache_key = solution_cache.key(self, ssc, retrying)
+            cached = solution_cache.get(cache_key, ssc)
+            if cached is not None:
+                log.debug("Using cached solution %s", cache_key)
+                solution, self.neutered_specs = cached
+                ssc.solution_precs = IndexedSet(solution)
+                return ssc.solution_precs
+
         if should_retry_solve and update_modifier == UpdateModifier.FREEZE_INSTALLED:
             fail_message = (
                 "unsuccessful initial attempt using frozen solve. Retrying"
@@ -422,6 +443,8 @@ class Solver:
             "\n    ".join(prec.dist_str() for prec in ssc.solution_precs),
         )
 
+        if cache_key:
+            solution_cache.put(cache_key, ssc.solution_precs, self.neutered_specs)
         return ssc.solution_precs
 
     def determine_constricting_specs(self, spec, solution_precs):
@@ -1305,6 +1328,123 @@ class Solver:
         return self._index, self._r
 
 
+class SolutionCache(_LRUCacheDir):
+    """
+    On-disk cache of the final states that the classic solver found.
+
+    Entries are keyed by everything a solve depends on: the request, the
+    installed records, history and pins, the relevant configuration and the
+    cache state of the repodata of every subdir in the index. A cached solution
+    is only used if all of its records are still in the index.
+
+    ``hits`` and ``misses`` count the lookups of this process.
+    """
+
+    dir_name = SOLUTION_CACHE_DIR
+    max_size = SOLUTION_CACHE_MAX_SIZE
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        return {"hits": cls.hits, "misses": cls.misses}
+
+    @classmethod
+    def key(
+        cls, solver: Solver, ssc: SolverStateContainer, retrying: bool
+    ) -> str | None:
+        """
+        Return the key of the solution for ``solver`` and ``ssc`` with collected
+        metadata, or None if it can't be cached.
+        """
+        index = ssc.index
+        if not isinstance(index, ReducedIndex) or index.use_cache:
+            return None
+        fingerprints = [
+            _repodata_fingerprint(subdir_data)
+            for subdir_data in chain.from_iterable(index.channels.values())
+        ]
+        if None in fingerprints:
+            return None
+        return cls._hash(
+            {
+                "conda_version": CONDA_VERSION,
+                "prefix": solver.prefix,
+                "installed": sorted(
+                    [
+                        prec.dist_str(),
+                        list(prec.depends),
+                        list(prec.constrains),
+                        list(prec.track_features),
+                    ]
+                    for prec in ssc.prefix_data.iter_records()
+                ),
+                "specs_to_add": sorted(map(str, solver.specs_to_add)),
+                "specs_to_remove": sorted(map(str, solver.specs_to_remove)),
+                "history": sorted(map(str, ssc.specs_from_history_map.values())),
+                "pinned": sorted(map(str, ssc.pinned_specs)),
+                "channels": [channel.canonical_name for channel in solver.channels],
+                "subdirs": fingerprints,
+                "virtual_packages": sorted(
+                    prec.dist_str() for prec in index.system_packages
+                ),
+                "repodata_fn": solver._repodata_fn,
+                "update_modifier": str(ssc.update_modifier),
+                "deps_modifier": str(ssc.deps_modifier),
+                "prune": bool(ssc.prune),
+                "ignore_pinned": bool(ssc.ignore_pinned),
+                "should_retry_solve": ssc.should_retry_solve,
+                "retrying": retrying,
+                "channel_priority": str(context.channel_priority),
+                "aggressive_update_packages": sorted(
+                    map(str, context.aggressive_update_packages)
+                ),
+                "auto_update_conda": context.auto_update_conda,
+                "track_features": sorted(context.track_features),
+                "add_pip_as_python_dependency": context.add_pip_as_python_dependency,
+                "solver_ignore_timestamps": context.solver_ignore_timestamps,
+                "sat_solver": str(context.sat_solver),
+            }
+        )
+
+    def get(
+        self, key: str | None, ssc: SolverStateContainer
+    ) -> tuple[list[PackageRecord], tuple[MatchSpec, ...]] | None:
+        """
+        Return the solution and neutered specs cached for ``key``, or None;
+        and count the lookup.
+        """
+        entry = self._load(key) if key else None
+        if entry is not None:
+            records = {prec.dist_str(): prec for prec in ssc.prefix_data.iter_records()}
+            records.update((prec.dist_str(), prec) for prec in ssc.index.values())
+            try:
+                solution = [records[dist_str] for dist_str in entry["solution"]]
+            except KeyError as e:
+                log.debug("Discarding cached solution %s without %s", key, e)
+            else:
+                self._touch(key)
+                type(self).hits += 1
+                return solution, tuple(map(MatchSpec, entry["neutered_specs"]))
+        type(self).misses += 1
+        return None
+
+    def put(
+        self,
+        key: str,
+        solution: Iterable[PackageRecord],
+        neutered_specs: Iterable[MatchSpec],
+    ) -> None:
+        """Save a solution for ``key``, and evict entries beyond ``max_size``."""
+        self._save(
+            key,
+            {
+                "solution": [prec.dist_str() for prec in solution],
+                "neutered_specs": list(map(str, neutered_specs)),
+            },
+        )
+
+
 class SolverStateContainer:
     # A mutable container with defined attributes to help keep method signatures clean
     # and also keep track of important state variables.
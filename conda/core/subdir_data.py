@@ -7,22 +7,24 @@ from __future__ import annotations
 import json
 import pickle
 from collections import UserList, defaultdict
-from functools import partial
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
 from itertools import chain
 from logging import getLogger
+from multiprocessing import get_context
 from os.path import exists, getmtime, isfile, join, splitext
 from pathlib import Path
-from time import time
+from time import perf_counter, time
 from typing import TYPE_CHECKING
 
 from boltons.setutils import IndexedSet
 
 from ..auxlib.ish import dals
 from ..base.constants import CONDA_PACKAGE_EXTENSION_V1, REPODATA_FN
-from ..base.context import context
-from ..common.io import DummyExecutor, ThreadLimitedThreadPoolExecutor, dashlist
+from ..base.context import context, reset_context
+from ..common.io import ThreadLimitedThreadPoolExecutor, dashlist, time_recorder
 from ..common.iterators import groupby_to_dict as groupby
-from ..common.path import url_to_path
+from ..common.path import strip_pkg_extension, url_to_path
 from ..common.url import join_url
 from ..deprecations import deprecated
 from ..exceptions import ChannelError, CondaUpgradeError, UnavailableInvalidChannel
@@ -31,16 +33,23 @@ from ..gateways.repodata import (
     CACHE_STATE_SUFFIX,
     CondaRepoInterface,
     RepodataFetch,
+    RepodataPatched,
     RepodataState,
     cache_fn_url,
     create_cache_dir,
     get_repo_interface,
 )
+from ..gateways.repodata.columnar import ColumnarRepodata, write_columnar_cache
+from ..gateways.repodata.entries import RepodataEntries
+from ..gateways.repodata.shards import RepodataShards, ShardsUnavailable
 from ..models.channel import Channel, all_channel_urls
 from ..models.match_spec import MatchSpec
 from ..models.records import PackageRecord
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from contextlib import AbstractContextManager
+
     from ..gateways.repodata import RepodataCache, RepoInterface
 
 log = getLogger(__name__)
@@ -49,6 +58,15 @@ REPODATA_PICKLE_VERSION = 30
 MAX_REPODATA_VERSION = 2
 REPODATA_HEADER_RE = b'"(_etag|_mod|_cache_control)":[ ]?"(.*?[^\\\\])"[,}\\s]'  # NOQA
 
+# not stored in the columnar cache header, or derived from it when loading
+_COLUMNAR_EXCLUDED_STATE = frozenset(
+    ("channel", "_package_records", "_names_index", "_track_features_index")
+)
+# per-record keys that are shared by the whole subdir, or derived from "fn"
+_COLUMNAR_EXCLUDED_INFO = frozenset(
+    ("arch", "channel", "platform", "schannel", "subdir", "url")
+)
+
 
 class SubdirDataType(type):
     def __call__(cls, channel, repodata_fn=REPODATA_FN):
@@ -85,11 +103,32 @@ class PackageRecordList(UserList):
         else:
             record = self.data[i]
             if not isinstance(record, PackageRecord):
-                record = PackageRecord(**record)
+                record = PackageRecord.from_repodata(record)
                 self.data[i] = record
             return record
 
 
+class ColumnarPackageRecordList(PackageRecordList):
+    """Lazily decode and convert records from a memory-mapped columnar cache."""
+
+    def __init__(self, columnar: ColumnarRepodata, meta_in_common: dict, base_url: str):
+        super().__init__([None] * len(columnar))
+        self._columnar = columnar
+        self._meta_in_common = meta_in_common
+        self._base_url = base_url
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return PackageRecordList([self[j] for j in range(len(self.data))[i]])
+        record = self.data[i]
+        if record is None:
+            info = self._columnar.record(range(len(self.data))[i])
+            info.update(self._meta_in_common)
+            info["url"] = join_url(self._base_url, info["fn"])
+            record = self.data[i] = PackageRecord.from_repodata(info)
+        return record
+
+
 class SubdirData(metaclass=SubdirDataType):
     _cache_ = {}
 
@@ -130,43 +169,138 @@ class SubdirData(metaclass=SubdirDataType):
 
         check_allowlist(channel_urls)
 
-        def subdir_query(url):
-            return tuple(
-                SubdirData(Channel(url), repodata_fn=repodata_fn).query(
-                    package_ref_or_match_spec
-                )
+        subdir_datas = [
+            SubdirData(Channel(url), repodata_fn=repodata_fn) for url in channel_urls
+        ]
+        SubdirData.load_all(subdir_datas)
+        return tuple(
+            chain.from_iterable(
+                subdir_data.query(package_ref_or_match_spec)
+                for subdir_data in subdir_datas
             )
+        )
 
-        # TODO test timing with ProcessPoolExecutor
-        Executor = (
-            DummyExecutor
-            if context.debug or context.repodata_threads == 1
-            else partial(
-                ThreadLimitedThreadPoolExecutor, max_workers=context.repodata_threads
-            )
+    @staticmethod
+    def load_all(
+        subdir_datas: Iterable[SubdirData], names: Iterable[str] | None = None
+    ) -> None:
+        """
+        Load several subdirs at once.
+
+        Every subdir is downloaded concurrently, and each one is processed as
+        soon as it has arrived, while the others are still downloading.
+        Processing is bound by the GIL; with ``repodata_processes`` set, a
+        changed repodata.json is processed in worker processes instead, which
+        save the columnar cache that is then memory-mapped here.
+
+        With ``names``, subdirs are only loaded for those package names, as by
+        `load_names`, when ``--experimental=sparse`` or ``sharded`` is enabled.
+
+        Afterwards, `timings` holds the duration of each subdir's ``fetch``,
+        ``process`` and ``save`` stages.
+        """
+        if (
+            "sparse" not in context.experimental
+            and "sharded" not in context.experimental
+        ):
+            names = None
+        elif names is not None:
+            names = tuple(names)
+        pending = [
+            subdir_data
+            for subdir_data in dict.fromkeys(subdir_datas)
+            if not subdir_data._loaded
+        ]
+        if not pending:
+            return
+
+        # ensure that this is not called by threaded code
+        create_cache_dir()
+        start = perf_counter()
+        if context.debug or context.repodata_threads == 1 or len(pending) == 1:
+            for subdir_data in pending:
+                subdir_data._set_internal_state(subdir_data._load(names))
+        else:
+            with ThreadLimitedThreadPoolExecutor(
+                max_workers=context.repodata_threads
+            ) as executor, _repodata_process_pool() as process_pool:
+                fetches = {
+                    executor.submit(subdir_data._fetch, names): subdir_data
+                    for subdir_data in pending
+                }
+                offloaded = {}
+                for future in as_completed(fetches):
+                    subdir_data = fetches[future]
+                    repodata, state = future.result()
+                    if process_pool and names is None and repodata is None:
+                        # unchanged, or saved to the cache by the fetch
+                        with subdir_data._timed("process"):
+                            _internal_state = subdir_data._read_columnar(state)
+                        if _internal_state:
+                            subdir_data._set_internal_state(_internal_state)
+                            continue
+                    if (
+                        process_pool
+                        and names is None
+                        and (repodata is None or isinstance(repodata, str))
+                    ):
+                        offloaded[
+                            process_pool.submit(
+                                _process_cached_repodata,
+                                subdir_data.url_w_credentials,
+                                subdir_data.repodata_fn,
+                                dict(state),
+                            )
+                        ] = subdir_data, repodata, state
+                    else:
+                        subdir_data._set_internal_state(
+                            subdir_data._process(repodata, state, names)
+                        )
+                for future, (subdir_data, repodata, state) in offloaded.items():
+                    try:
+                        subdir_data.timings.update(future.result())
+                    except Exception:
+                        log.debug("Failed to process repodata.", exc_info=True)
+                        _internal_state = subdir_data._process(repodata, state)
+                    else:
+                        # the columnar cache saved by the worker, if it is valid
+                        _internal_state = subdir_data._read_local_repodata(state)
+                    subdir_data._set_internal_state(_internal_state)
+
+        log.debug(
+            "Loaded %d subdirs in %.3fs:%s",
+            len(pending),
+            perf_counter() - start,
+            dashlist(
+                f"{subdir_data.url_w_repodata_fn} "
+                + " ".join(
+                    f"{stage}={seconds:.3f}s"
+                    for stage, seconds in subdir_data.timings.items()
+                )
+                for subdir_data in pending
+            ),
         )
-        with Executor() as executor:
-            result = tuple(
-                chain.from_iterable(executor.map(subdir_query, channel_urls))
-            )
-        return result
 
     def query(self, package_ref_or_match_spec):
-        if not self._loaded:
-            self.load()
         param = package_ref_or_match_spec
         if isinstance(param, str):
             param = MatchSpec(param)  # type: ignore
         if isinstance(param, MatchSpec):
-            if param.get_exact_value("name"):
-                package_name = param.get_exact_value("name")
-                for prec in self._iter_records_by_name(package_name):
-                    if param.match(prec):
-                        yield prec
+            package_name = param.get_exact_value("name")
+        else:
+            package_name = param.name
+        if not self._loaded:
+            if package_name and (
+                "sparse" in context.experimental or "sharded" in context.experimental
+            ):
+                self.load_names((package_name,))
+            else:
+                self.load()
+        if isinstance(param, MatchSpec):
+            if package_name:
+                yield from param.filter(self._iter_records_by_name(package_name))
             else:
-                for prec in self.iter_records():
-                    if param.match(prec):
-                        yield prec
+                yield from param.filter(self._iter_records_by_name_match(param))
         else:
             assert isinstance(param, PackageRecord)
             for prec in self._iter_records_by_name(param.name):
@@ -194,6 +328,8 @@ class SubdirData(metaclass=SubdirDataType):
         self.RepoInterface = RepoInterface
         self._loaded = False
         self._key_mgr = None
+        #: seconds spent in each stage of the last load; see `load_all`
+        self.timings: dict[str, float] = {}
 
     @property
     def _repo(self) -> RepoInterface:
@@ -255,8 +391,39 @@ class SubdirData(metaclass=SubdirDataType):
     def cache_path_pickle(self):
         return self.cache_path_base + ("1" if context.use_only_tar_bz2 else "") + ".q"
 
+    @property
+    def cache_path_columnar(self):
+        """Memory-mapped, columnar cache of the processed repodata."""
+        return (
+            self.cache_path_base
+            + ("1" if context.use_only_tar_bz2 else "")
+            + ".columnar"
+        )
+
     def load(self):
-        _internal_state = self._load()
+        return self._set_internal_state(self._load())
+
+    def load_names(self, names: Iterable[str]):
+        """
+        Load the records of the named packages only.
+
+        If repodata.json has to be parsed, the entries of other packages are
+        skipped without building dicts for them. They are parsed on demand
+        when queried by name later; `iter_records` and queries without an exact
+        name complete the load.
+        """
+        if not self._loaded:
+            return self._set_internal_state(self._load(names=names))
+        if self._loaded_names is not None:
+            self._extend_names(names)
+        return self
+
+    @property
+    def _loaded_names(self) -> set[str] | None:
+        """Package names loaded by `load_names`; None if all records are loaded."""
+        return self._internal_state.get("_loaded_names") if self._loaded else None
+
+    def _set_internal_state(self, _internal_state):
         if _internal_state.get("repodata_version", 0) > MAX_REPODATA_VERSION:
             raise CondaUpgradeError(
                 dals(
@@ -286,31 +453,127 @@ class SubdirData(metaclass=SubdirDataType):
     def iter_records(self):
         if not self._loaded:
             self.load()
+        elif self._loaded_names is not None:
+            self._complete_load()
         return iter(self._package_records)
         # could replace self._package_records with fully-converted UserList.data
         # after going through entire list
 
     def _iter_records_by_name(self, name):
+        if self._loaded_names is not None and name not in self._loaded_names:
+            self._extend_names((name,))
         for i in self._names_index[name]:
             yield self._package_records[i]
 
-    def _load(self):
+    def _iter_records_by_name_match(self, match_spec: MatchSpec):
+        """
+        Records whose name could match ``match_spec``, in index order, without
+        converting the records of names that don't match.
+        """
+        records = self.iter_records()  # also completes a partial load
+        name_matcher = match_spec._match_components.get("name")
+        if name_matcher is None or getattr(name_matcher, "matches_all", False):
+            return records
+        indices = sorted(
+            chain.from_iterable(
+                self._names_index[name]
+                for name in self._names_index
+                if name_matcher.match(name)
+            )
+        )
+        return map(self._package_records.__getitem__, indices)
+
+    def _extend_names(self, names: Iterable[str]):
+        try:
+            self._add_names(self._internal_state, names)
+        except ValueError:
+            log.debug("Unexpected entry in %s", self.url_w_repodata_fn, exc_info=True)
+            self._complete_load()
+
+    def _complete_load(self):
+        """Replace a `load_names` load with all records, without fetching again."""
+        _internal_state = self._internal_state
+        log.debug("Loading all records of %s", self.url_w_repodata_fn)
+        if "_repodata_state" not in _internal_state:
+            # loaded from shards; fetch the whole repodata.json instead
+            self._set_internal_state(self._load())
+            return
+        self._set_internal_state(
+            self._process_raw_repodata_str(
+                _internal_state["_repodata_entries"].raw,
+                _internal_state["_repodata_state"],
+            )
+        )
+        self._write_columnar()
+
+    def _load(self, names: Iterable[str] | None = None):
+        """
+        Fetch and process repodata.
+
+        With ``names``, parsed repodata.json is limited to those package names,
+        and only their shards are fetched from channels with sharded repodata.
+        """
+        return self._process(*self._fetch(names), names=names)
+
+    def _fetch(self, names: Iterable[str] | None = None):
         """
-        Try to load repodata. If e.g. we are downloading
+        Fetch repodata, or its shard index with ``names``; return it for
+        `_process` with its cache state. If e.g. we are downloading
         `current_repodata.json`, fall back to `repodata.json` when the former is
         unavailable.
         """
-        try:
-            fetcher = self.repo_fetch
-            repodata, state = fetcher.fetch_latest_parsed()
-            return self._process_raw_repodata(repodata, state)
-        except UnavailableInvalidChannel:
-            if self.repodata_fn != REPODATA_FN:
-                self.repodata_fn = REPODATA_FN
-                return self._load()
+        with self._timed("fetch"):
+            while True:
+                try:
+                    if names is not None and hasattr(self._repo, "repodata_shards"):
+                        try:
+                            return self._repo.repodata_shards(), None  # type: ignore
+                        except ShardsUnavailable:
+                            log.debug(
+                                "Loading %s without shards", self.url_w_repodata_fn
+                            )
+                    return self.repo_fetch.fetch_latest(read_cached=False)
+                except UnavailableInvalidChannel:
+                    if self.repodata_fn == REPODATA_FN:
+                        raise
+                    self.repodata_fn = REPODATA_FN
+
+    def _process(
+        self,
+        repodata: dict | str | RepodataPatched | RepodataShards | None,
+        state: RepodataState | None,
+        names: Iterable[str] | None = None,
+    ):
+        """Build the internal state from what `_fetch` returned."""
+        with self._timed("process"):
+            if isinstance(repodata, RepodataShards):
+                return self._process_repodata_shards(repodata, names)
+            elif repodata is None:
+                # unchanged since it was cached; avoid parsing repodata.json
+                return self._read_local_repodata(state, names=names)
+            elif isinstance(repodata, RepodataPatched):
+                self._patch_columnar(repodata, state)
+                return self._read_local_repodata(state, names=names)
+            elif isinstance(repodata, str):
+                if names is not None:
+                    return self._process_raw_repodata_names(repodata, names, state)
+                _internal_state = self._process_raw_repodata_str(repodata, state)
             else:
-                raise
+                _internal_state = self._process_raw_repodata(repodata, state)
+            self._write_columnar()
+            return _internal_state
+
+    @contextmanager
+    def _timed(self, stage: str):
+        """Record the duration of a loading stage in `timings`."""
+        start = perf_counter()
+        try:
+            with time_recorder(f"SubdirData.{stage}"):
+                yield
+        finally:
+            self.timings[stage] = perf_counter() - start
 
+    @deprecated("25.3", "25.9", addendum="Use `SubdirData._write_columnar` instead.")
     def _pickle_me(self):
         try:
             log.debug(
@@ -323,17 +586,134 @@ class SubdirData(metaclass=SubdirDataType):
         except Exception:
             log.debug("Failed to dump pickled repodata.", exc_info=True)
 
-    def _read_local_repodata(self, state: RepodataState):
-        # first try reading pickled data
-        _pickled_state = self._read_pickled(state)
-        if _pickled_state:
-            return _pickled_state
+    def _write_columnar(self):
+        """Save the processed repodata for `_read_columnar`."""
+        _internal_state = self._internal_state
+        records = _internal_state["_package_records"].data
+        if _internal_state.get("_loaded_names") is not None:
+            # incomplete; see load_names()
+            return
+        if not isfile(self.cache_path_json) or not all(
+            isinstance(info, dict) for info in records
+        ):
+            return
+        self._save_columnar(_internal_state, records)
+
+    def _save_columnar(self, _internal_state, records: Iterable[dict | tuple]):
+        header = {
+            key: value
+            for key, value in _internal_state.items()
+            if key not in _COLUMNAR_EXCLUDED_STATE
+        }
+        try:
+            log.debug(
+                "Saving columnar state for %s at %s",
+                self.url_w_repodata_fn,
+                self.cache_path_columnar,
+            )
+            with self._timed("save"):
+                write_columnar_cache(
+                    self.cache_path_columnar,
+                    header,
+                    (
+                        {
+                            key: value
+                            for key, value in info.items()
+                            if key not in _COLUMNAR_EXCLUDED_INFO
+                        }
+                        if isinstance(info, dict)
+                        else info
+                        for info in records
+                    ),
+                )
+        except Exception:
+            log.debug("Failed to save columnar repodata.", exc_info=True)
+
+    def _patch_columnar(self, patched: RepodataPatched, state: RepodataState):
+        """
+        Update the columnar cache of the repodata.json that was patched in
+        place, instead of parsing the patched repodata.json.
+
+        Records of the packages whose entries changed are rebuilt; all others
+        are copied without decoding them.
+        """
+        previous = RepodataState(
+            self.cache_path_json,
+            self.cache_path_state,
+            self.repodata_fn,
+            dict=patched.previous,
+        )
+        try:
+            columnar = ColumnarRepodata(self.cache_path_columnar)
+        except Exception:
+            log.debug("Failed to load columnar repodata.", exc_info=True)
+            return
+        checks = tuple(self._columnar_valid_checks(columnar.header, previous))
+        if not all(left == right for _, left, right in checks):
+            log.debug("Columnar cache does not match patched repodata. %r", checks)
+            return
+
+        _internal_state = {
+            **columnar.header,
+            **self._cache_state_fields(state),
+            "_package_records": PackageRecordList(),
+            "_names_index": defaultdict(list),
+        }
+        changed = {
+            section: {
+                fn: info
+                for (changed_section, fn), info in patched.changes.items()
+                if changed_section == section and info is not None
+            }
+            for section in ("packages", "packages.conda")
+        }
+        self._add_package_records(
+            _internal_state, changed["packages"], changed["packages.conda"]
+        )
+
+        stems = {strip_pkg_extension(fn)[0] for _, fn in patched.changes}
+        names = {fn.rsplit("-", 2)[0] for _, fn in patched.changes}
+        names.update(
+            info["name"] for infos in changed.values() for info in infos.values()
+        )
+        replaced = {
+            index
+            for name in names
+            for index in columnar.indices_for_name(name)
+            if strip_pkg_extension(columnar.record(index)["fn"])[0] in stems
+        }
+        log.debug(
+            "Patching %d records of columnar cache %s",
+            len(replaced),
+            self.cache_path_columnar,
+        )
+        self._save_columnar(
+            _internal_state,
+            chain(
+                (
+                    (columnar.record_name(index), columnar.raw_record(index))
+                    for index in range(len(columnar))
+                    if index not in replaced
+                ),
+                _internal_state["_package_records"].data,
+            ),
+        )
+
+    def _read_local_repodata(
+        self, state: RepodataState, names: Iterable[str] | None = None
+    ):
+        # first try reading the columnar cache
+        _columnar_state = self._read_columnar(state)
+        if _columnar_state:
+            return _columnar_state
 
         raw_repodata_str, state = self.repo_fetch.read_cache()
+        if names is not None:
+            return self._process_raw_repodata_names(raw_repodata_str, names, state)
         _internal_state = self._process_raw_repodata_str(raw_repodata_str, state)
         # taken care of by _process_raw_repodata():
         assert self._internal_state is _internal_state
-        self._pickle_me()
+        self._write_columnar()
         return _internal_state
 
     def _pickle_valid_checks(self, pickled_state, mod, etag):
@@ -354,6 +734,61 @@ class SubdirData(metaclass=SubdirDataType):
         )
         yield "fn", pickled_state.get("fn"), self.repodata_fn
 
+    def _columnar_valid_checks(self, header, state: RepodataState):
+        """Throw away the columnar cache if these don't all match."""
+        yield from self._pickle_valid_checks(header, state.mod, state.etag)
+        # the cache must describe the repodata.json that is on disk right now
+        yield "_mtime_ns", header.get("_mtime_ns"), state.get("mtime_ns")
+        yield "_size", header.get("_size"), state.get("size")
+
+    def _read_columnar(self, state: RepodataState):
+        if not isinstance(state, RepodataState):
+            state = RepodataState(
+                self.cache_path_json,
+                self.cache_path_state,
+                self.repodata_fn,
+                dict=state,
+            )
+
+        if not isfile(self.cache_path_columnar) or not isfile(self.cache_path_json):
+            # Don't trust columnar data if there is no accompanying json data
+            return None
+
+        try:
+            columnar = ColumnarRepodata(self.cache_path_columnar)
+        except Exception:
+            log.debug("Failed to load columnar repodata.", exc_info=True)
+            rm_rf(self.cache_path_columnar)
+            return None
+
+        checks = tuple(self._columnar_valid_checks(columnar.header, state))
+        if not all(left == right for _, left, right in checks):
+            log.debug(
+                "Columnar load validation failed for %s at %s. %r",
+                self.url_w_repodata_fn,
+                self.cache_path_columnar,
+                checks,
+            )
+            return None
+
+        log.debug("Loaded columnar repodata from %s", self.cache_path_columnar)
+        _internal_state = dict(columnar.header)
+        _internal_state.update(
+            {
+                "channel": self.channel,
+                "_package_records": ColumnarPackageRecordList(
+                    columnar,
+                    self._meta_in_common(_internal_state),
+                    _internal_state["base_url_w_credentials"],
+                ),
+                "_names_index": columnar.names_index,
+                "_track_features_index": defaultdict(list),
+            }
+        )
+        self._internal_state = _internal_state
+        return _internal_state
+
+    @deprecated("25.3", "25.9", addendum="Use `SubdirData._read_columnar` instead.")
     def _read_pickled(self, state: RepodataState):
         if not isinstance(state, RepodataState):
             state = RepodataState(
@@ -404,6 +839,58 @@ class SubdirData(metaclass=SubdirDataType):
         json_obj = json.loads(raw_repodata_str or "{}")
         return self._process_raw_repodata(json_obj, state=state)
 
+    def _process_raw_repodata_names(
+        self,
+        raw_repodata_str,
+        names: Iterable[str],
+        state: RepodataState | None = None,
+    ):
+        """
+        Like `_process_raw_repodata_str`, but only build the records of
+        ``names``. `_add_names` adds further names later.
+        """
+        entries = RepodataEntries(raw_repodata_str or "{}")
+        _internal_state = self._process_raw_repodata({"info": entries.info}, state)
+        _internal_state["_repodata_entries"] = entries
+        _internal_state["_repodata_state"] = state
+        _internal_state["_loaded_names"] = set()
+        try:
+            self._add_names(_internal_state, names)
+        except ValueError:
+            log.debug("Unexpected entry in %s", self.url_w_repodata_fn, exc_info=True)
+            return self._process_raw_repodata_str(raw_repodata_str, state)
+        return _internal_state
+
+    def _process_repodata_shards(self, shards: RepodataShards, names: Iterable[str]):
+        """
+        Like `_process_raw_repodata_names`, but for sharded repodata; only the
+        shards of ``names`` and their dependencies are fetched.
+        """
+        _internal_state = self._process_raw_repodata({"info": shards.info})
+        _internal_state["_repodata_entries"] = shards
+        _internal_state["_loaded_names"] = set()
+        self._add_names(_internal_state, names)
+        return _internal_state
+
+    def _add_names(self, _internal_state, names: Iterable[str]):
+        loaded_names = _internal_state["_loaded_names"]
+        names = set(names) - loaded_names
+        legacy_packages, conda_packages = _internal_state["_repodata_entries"].packages(
+            names
+        )
+        self._add_package_records(_internal_state, legacy_packages, conda_packages)
+        loaded_names.update(names)
+
+    def _meta_in_common(self, _internal_state):
+        """Record fields that are the same for the whole subdir."""
+        return {
+            "arch": _internal_state["_arch"],
+            "channel": self.channel,
+            "platform": _internal_state["_platform"],
+            "schannel": _internal_state["_schannel"],
+            "subdir": _internal_state["_subdir"],
+        }
+
     def _process_raw_repodata(self, repodata: dict, state: RepodataState | None = None):
         if not isinstance(state, RepodataState):
             state = RepodataState(
@@ -435,14 +922,13 @@ class SubdirData(metaclass=SubdirDataType):
             "_package_records": _package_records,
             "_names_index": _names_index,
             "_track_features_index": _track_features_index,
-            "_etag": state.get("_etag"),
-            "_mod": state.get("_mod"),
-            "_cache_control": state.get("_cache_control"),
-            "_url": state.get("_url"),
+            **self._cache_state_fields(state),
             "_add_pip": add_pip,
             "_pickle_version": REPODATA_PICKLE_VERSION,
             "_schannel": schannel,
-            "repodata_version": state.get("repodata_version", 0),
+            "_arch": repodata.get("info", {}).get("arch"),
+            "_platform": repodata.get("info", {}).get("platform"),
+            "_subdir": subdir,
         }
         if _internal_state["repodata_version"] > MAX_REPODATA_VERSION:
             raise CondaUpgradeError(
@@ -459,18 +945,40 @@ class SubdirData(metaclass=SubdirDataType):
                 % self.url_w_subdir
             )
 
-        meta_in_common = {  # just need to make this once, then apply with .update()
-            "arch": repodata.get("info", {}).get("arch"),
-            "channel": self.channel,
-            "platform": repodata.get("info", {}).get("platform"),
-            "schannel": schannel,
-            "subdir": subdir,
+        self._add_package_records(
+            _internal_state,
+            repodata.get("packages", {}),
+            repodata.get("packages.conda", {}),
+        )
+
+        self._internal_state = _internal_state
+        return _internal_state
+
+    def _cache_state_fields(self, state: RepodataState):
+        """Fields of the internal state that describe the cached repodata.json."""
+        return {
+            "_etag": state.get("_etag"),
+            "_mod": state.get("_mod"),
+            "_cache_control": state.get("_cache_control"),
+            "_url": state.get("_url"),
+            "repodata_version": state.get("repodata_version", 0),
+            "_mtime_ns": state.get("mtime_ns"),
+            "_size": state.get("size"),
         }
 
-        legacy_packages = repodata.get("packages", {})
-        conda_packages = (
-            {} if context.use_only_tar_bz2 else repodata.get("packages.conda", {})
-        )
+    def _add_package_records(
+        self, _internal_state, legacy_packages: dict, conda_packages: dict
+    ):
+        """Add repodata ``packages`` and ``packages.conda`` entries to the state."""
+        add_pip = _internal_state["_add_pip"]
+        base_url_w_credentials = _internal_state["base_url_w_credentials"]
+        _package_records = _internal_state["_package_records"]
+        _names_index = _internal_state["_names_index"]
+        # just need to make this once, then apply with .update()
+        meta_in_common = self._meta_in_common(_internal_state)
+
+        if context.use_only_tar_bz2:
+            conda_packages = {}
 
         _tar_bz2 = CONDA_PACKAGE_EXTENSION_V1
         use_these_legacy_keys = set(legacy_packages.keys()) - {
@@ -512,9 +1020,6 @@ class SubdirData(metaclass=SubdirDataType):
                 record_index = len(_package_records) - 1
                 _names_index[info["name"]].append(record_index)
 
-        self._internal_state = _internal_state
-        return _internal_state
-
     def _get_base_url(self, repodata: dict, with_credentials: bool = True) -> str:
         """
         In repodata_version=1, .tar.bz2 and .conda artifacts are assumed to
@@ -555,6 +1060,32 @@ class SubdirData(metaclass=SubdirDataType):
         return self.url_w_subdir
 
 
+def _repodata_process_pool() -> AbstractContextManager[ProcessPoolExecutor | None]:
+    """Worker processes for `SubdirData.load_all`, if ``repodata_processes`` is set."""
+    if not context.repodata_processes:
+        return nullcontext()
+    return ProcessPoolExecutor(
+        max_workers=context.repodata_processes,
+        # fork() is unsafe while the download threads are running
+        mp_context=get_context("spawn"),
+        initializer=reset_context,
+        initargs=(context._search_path, context._argparse_args),
+    )
+
+
+def _process_cached_repodata(
+    url: str, repodata_fn: str, state: dict
+) -> dict[str, float]:
+    """
+    Process a cached repodata.json and save its columnar cache, in a worker
+    process of `SubdirData.load_all`. Return the stage timings.
+    """
+    subdir_data = SubdirData(Channel(url), repodata_fn=repodata_fn)
+    with subdir_data._timed("process"):
+        subdir_data._read_local_repodata(state)
+    return subdir_data.timings
+
+
 @deprecated(
     "25.3",
     "25.9",
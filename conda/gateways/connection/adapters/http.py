@@ -33,9 +33,12 @@ OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
 WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+from collections import Counter
+from logging import getLogger
+from threading import Lock
 from typing import TYPE_CHECKING, Any, Optional
 
-from .. import DEFAULT_POOLBLOCK
+from .. import DEFAULT_POOLBLOCK, HTTPConnectionPool, HTTPSConnectionPool
 from .. import HTTPAdapter as BaseHTTPAdapter
 
 if TYPE_CHECKING:
@@ -43,6 +46,63 @@ if TYPE_CHECKING:
 
     from urllib3 import PoolManager
 
+log = getLogger(__name__)
+
+# Requests that opened a new connection and requests that reused an open one,
+# keyed by (scheme, host, port).
+_connections_opened: Counter = Counter()
+_connections_reused: Counter = Counter()
+_connection_stats_lock = Lock()
+
+
+def connection_stats() -> "dict[tuple[str, str, int | None], tuple[int, int]]":
+    """Return ``(opened, reused)`` connection counts for every host contacted so far."""
+    with _connection_stats_lock:
+        return {
+            key: (_connections_opened[key], _connections_reused[key])
+            for key in _connections_opened | _connections_reused
+        }
+
+
+def _count_request(pool: HTTPConnectionPool, conn: Any) -> None:
+    key = (pool.scheme, pool.host, pool.port)
+    # a pooled connection that the server dropped was closed by the pool and
+    # reconnects on this request, so it counts as a new connection too
+    reused = getattr(conn, "sock", None) is not None
+    with _connection_stats_lock:
+        if reused:
+            _connections_reused[key] += 1
+            return
+        _connections_opened[key] += 1
+        opened, reused_count = _connections_opened[key], _connections_reused[key]
+    log.debug(
+        "Opening connection #%d to %s://%s:%s (%d requests reused a connection)",
+        opened,
+        *key,
+        reused_count,
+    )
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _make_request(self, conn, *args, **kwargs):
+        _count_request(self, conn)
+        return super()._make_request(conn, *args, **kwargs)
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _make_request(self, conn, *args, **kwargs):
+        _count_request(self, conn)
+        return super()._make_request(conn, *args, **kwargs)
+
+
+def _count_connections(manager: "PoolManager") -> None:
+    # SOCKS proxy managers bring their own pool classes; leave those alone
+    if manager.pool_classes_by_scheme.get("https") is HTTPSConnectionPool:
+        manager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
 
 class _SSLContextAdapterMixin:
     """Mixin to add the ``ssl_context`` constructor argument to HTTP adapters.
@@ -79,4 +139,16 @@ class _SSLContextAdapterMixin:
 
 
 class HTTPAdapter(_SSLContextAdapterMixin, BaseHTTPAdapter):
-    pass
+    """HTTP adapter that counts the connections it opens and reuses per host.
+
+    See :func:`connection_stats`.
+    """
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        _count_connections(self.poolmanager)
+
+    def proxy_manager_for(self, proxy: str, **proxy_kwargs: Any) -> "PoolManager":
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        _count_connections(manager)
+        return manager
@@ -5,13 +5,17 @@
 from __future__ import annotations
 
 import hashlib
+import io
 import os
 import tempfile
 import warnings
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from contextlib import contextmanager
+from itertools import chain
 from logging import DEBUG, getLogger
 from os.path import basename, exists, join
 from pathlib import Path
+from threading import Event, Lock
 
 from ... import CondaError
 from ...auxlib.ish import dals
@@ -40,10 +44,18 @@ from . import (
 )
 from .session import get_session
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Windows, which has no os.pwrite either
+    fcntl = None
+
 log = getLogger(__name__)
 
 
 CHUNK_SIZE = 1 << 14
+# smallest download split into context.download_segments byte ranges
+SEGMENTED_DOWNLOAD_MIN_SIZE = 1 << 26
 
 
 def disable_ssl_verify_warning():
@@ -58,7 +70,17 @@ def download(
     sha256=None,
     size=None,
     progress_update_callback=None,
+    extract=None,
 ):
+    """
+    Download ``url`` to ``target_full_path``, verifying its checksum and size.
+
+    ``extract``, if given, is called with a readable, non-seekable file object
+    over the complete file while it is downloaded, e.g. to extract a package as
+    it arrives. Whatever ``extract`` does not read is downloaded after it
+    returns. Errors raised by ``extract`` itself are logged and ignored; it is
+    up to the caller to only use its results once `download` has returned.
+    """
     if exists(target_full_path):
         maybe_raise(BasicClobberError(target_full_path, url, context), context)
     if not context.ssl_verify:
@@ -66,11 +88,208 @@ def download(
 
     with download_http_errors(url):
         download_inner(
-            url, target_full_path, md5, sha256, size, progress_update_callback
+            url,
+            target_full_path,
+            md5,
+            sha256,
+            size,
+            progress_update_callback,
+            extract=extract,
         )
 
 
-def download_inner(url, target_full_path, md5, sha256, size, progress_update_callback):
+class _ChunkReader(io.RawIOBase):
+    """Non-seekable file object over an iterator of ``bytes`` chunks."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._chunk = memoryview(b"")
+        #: the exception raised by ``chunks``, e.g. a connection error
+        self.error = None
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._chunk:
+            try:
+                self._chunk = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+            except BaseException as e:
+                self.error = e
+                raise
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+
+def _file_chunks(fileobj, size):
+    fileobj.seek(0)
+    while size > 0 and (chunk := fileobj.read(min(CHUNK_SIZE, size))):
+        size -= len(chunk)
+        yield chunk
+
+
+def _hashed_chunks(chunks, hasher):
+    for chunk in chunks:
+        hasher.update(chunk)
+        yield chunk
+
+
+def _extract_chunks(url, extract, chunks):
+    """Pass ``chunks`` through ``extract`` and consume whatever it did not read."""
+    reader = _ChunkReader(chunks)
+    try:
+        extract(reader)
+    except Exception:
+        if reader.error is None:
+            log.debug("could not extract %s while downloading it", url, exc_info=True)
+    if reader.error is not None:
+        raise reader.error
+    for _ in chunks:
+        pass
+
+
+def _get_range(session, url, start, end, timeout):
+    """
+    Request bytes ``start`` to ``end`` (exclusive) of ``url``. Returns None if
+    the server does not answer with exactly that range.
+    """
+    resp = session.get(
+        url,
+        stream=True,
+        headers={"Range": f"bytes={start}-{end - 1}"},
+        proxies=session.proxies,
+        timeout=timeout,
+    )
+    if log.isEnabledFor(DEBUG):
+        log.debug(stringify(resp, content_max_len=256))
+    resp.raise_for_status()
+    if (
+        resp.status_code != 206
+        or not resp.headers.get("Content-Range", "").startswith(
+            f"bytes {start}-{end - 1}/"
+        )
+        or resp.headers.get("Content-Encoding", "identity") != "identity"
+    ):
+        resp.close()
+        return None
+    return resp
+
+
+def _download_segments(
+    session, url, target, size, hasher, progress_update_callback, timeout
+):
+    """
+    Download ``url`` into the empty ``target`` as `context.download_segments`
+    concurrent byte ranges, each written at its offset in the preallocated file.
+    Segments are passed to ``hasher`` in order as they complete.
+
+    Writes go through ``target``'s own file descriptor, since closing any other
+    descriptor of the file would release the lock held on it.
+
+    Returns False, having written nothing, if the server does not support range
+    requests. On errors, ``target`` keeps the bytes downloaded from its start, so
+    that the download can be resumed.
+    """
+    segment_size = -(-size // context.download_segments)
+    ranges = [
+        (start, min(start + segment_size, size))
+        for start in range(0, size, segment_size)
+    ]
+    first = _get_range(session, url, *ranges[0], timeout)
+    if first is None:
+        log.debug("%s does not support range requests, not segmenting it", url)
+        return False
+
+    done = [0] * len(ranges)
+    progress_lock = Lock()
+    stopped = Event()
+
+    def fetch(index, resp):
+        start, end = ranges[index]
+        if resp is None:
+            resp = _get_range(session, url, start, end, timeout)
+            if resp is None:
+                raise CondaError(
+                    "Server stopped honoring range requests for %(url)s", url=url
+                )
+        with resp:
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                if stopped.is_set():
+                    raise CancelledError()
+                offset = start + done[index]
+                data = memoryview(chunk)[: end - offset]
+                try:
+                    while data:
+                        written = os.pwrite(fd, data, offset)
+                        data = data[written:]
+                        offset += written
+                except OSError as e:
+                    message = "Failed to write to %(target_path)s\n  errno: %(errno)d"
+                    raise CondaError(message, target_path=target.name, errno=e.errno)
+                with progress_lock:
+                    done[index] += len(chunk)
+                    if progress_update_callback:
+                        progress_update_callback(sum(done) / size)
+        if done[index] != end - start:
+            raise CondaError(
+                "Downloaded %(downloaded_bytes)d bytes of range %(start)d-%(end)d "
+                "of %(url)s",
+                url=url,
+                start=start,
+                end=end - 1,
+                downloaded_bytes=done[index],
+            )
+
+    fd = target.fileno()
+    # positioned writes, which append mode would turn into appends
+    flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+    fcntl.fcntl(fd, fcntl.F_SETFL, flags & ~os.O_APPEND)
+    target.truncate(size)
+    try:
+        with ThreadPoolExecutor(len(ranges)) as executor:
+            futures = [
+                executor.submit(fetch, index, first if index == 0 else None)
+                for index in range(len(ranges))
+            ]
+            try:
+                for (start, end), future in zip(ranges, futures):
+                    future.result()
+                    while hasher and start < end:
+                        chunk = os.pread(fd, min(CHUNK_SIZE, end - start), start)
+                        if not chunk:
+                            break
+                        hasher.update(chunk)
+                        start += len(chunk)
+            except BaseException:
+                stopped.set()
+                raise
+    except BaseException:
+        # keep the completed prefix for a later, single stream, resume
+        resumable = 0
+        for (start, end), segment_done in zip(ranges, done):
+            resumable = start + min(segment_done, end - start)
+            if resumable < end:
+                break
+        target.truncate(resumable)
+        raise
+    finally:
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags)
+    return True
+
+
+def download_inner(
+    url,
+    target_full_path,
+    md5,
+    sha256,
+    size,
+    progress_update_callback,
+    extract=None,
+):
     timeout = context.remote_connect_timeout_secs, context.remote_read_timeout_secs
     session = get_session(url)
 
@@ -81,13 +300,54 @@ def download_inner(url, target_full_path, md5, sha256, size, progress_update_cal
     streamed_bytes = 0
     size_builder = 0
 
+    segmented = (
+        context.download_segments > 1
+        and size
+        and size >= SEGMENTED_DOWNLOAD_MIN_SIZE
+        and not extract
+        # positioned writes, not available on Windows
+        and fcntl is not None
+        and hasattr(os, "pwrite")
+        and url.startswith(("http://", "https://"))
+    )
+
+    # with extract or segments, everything written to the .partial file is also
+    # hashed on the way, instead of reading it back for the checksum
+    hasher = None
+    if (extract or segmented) and (md5 or sha256):
+        hasher = hashlib.new("sha256" if sha256 else "md5")
+
     # Use `.partial` even for full downloads. Avoid creating incomplete files
     # with the final filename.
     with download_partial_file(
-        target_full_path, url=url, md5=md5, sha256=sha256, size=size
+        target_full_path, url=url, md5=md5, sha256=sha256, size=size, hasher=hasher
     ) as target:
         stat_result = os.fstat(target.fileno())
         if size is not None and stat_result.st_size >= size:
+            if extract or hasher:
+                chunks = _file_chunks(target, stat_result.st_size)
+                if hasher:
+                    chunks = _hashed_chunks(chunks, hasher)
+                if extract:
+                    _extract_chunks(url, extract, chunks)
+                else:
+                    for _ in chunks:
+                        pass
+            return  # moves partial onto target_path, checksum will be checked
+
+        if (
+            segmented
+            and stat_result.st_size == 0
+            and _download_segments(
+                session,
+                url,
+                target,
+                size,
+                hasher,
+                progress_update_callback,
+                timeout,
+            )
+        ):
             return  # moves partial onto target_path, checksum will be checked
 
         headers = {}
@@ -121,22 +381,42 @@ def download_inner(url, target_full_path, md5, sha256, size, progress_update_cal
             except (LookupError, ValueError):
                 pass
 
-        for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
-            # chunk could be the decompressed form of the real data
-            # but we want the exact number of bytes read till now
-            streamed_bytes = resp.raw.tell()
-            try:
-                target.write(chunk)
-            except OSError as e:
-                message = "Failed to write to %(target_path)s\n  errno: %(errno)d"
-                raise CondaError(message, target_path=target.name, errno=e.errno)
-            size_builder += len(chunk)
-
-            if total_content_length and 0 <= streamed_bytes <= content_length:
-                if progress_update_callback:
-                    progress_update_callback(
-                        (stat_result.st_size + streamed_bytes) / total_content_length
-                    )
+        def write_chunks():
+            nonlocal streamed_bytes, size_builder
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                # chunk could be the decompressed form of the real data
+                # but we want the exact number of bytes read till now
+                streamed_bytes = resp.raw.tell()
+                try:
+                    target.write(chunk)
+                except OSError as e:
+                    message = "Failed to write to %(target_path)s\n  errno: %(errno)d"
+                    raise CondaError(message, target_path=target.name, errno=e.errno)
+                size_builder += len(chunk)
+
+                if total_content_length and 0 <= streamed_bytes <= content_length:
+                    if progress_update_callback:
+                        progress_update_callback(
+                            (stat_result.st_size + streamed_bytes)
+                            / total_content_length
+                        )
+                yield chunk
+
+        if extract or hasher:
+            # resumed downloads are extracted and hashed from the start of the
+            # .partial file
+            resumed = os.fstat(target.fileno()).st_size
+            chunks = chain(_file_chunks(target, resumed), write_chunks())
+            if hasher:
+                chunks = _hashed_chunks(chunks, hasher)
+            if extract:
+                _extract_chunks(url, extract, chunks)
+            else:
+                for _ in chunks:
+                    pass
+        else:
+            for _ in write_chunks():
+                pass
 
         if content_length and streamed_bytes != content_length:
             # TODO: needs to be a more-specific error type
@@ -161,11 +441,20 @@ def download_inner(url, target_full_path, md5, sha256, size, progress_update_cal
 
 @contextmanager
 def download_partial_file(
-    target_full_path: str | Path, *, url: str, sha256: str, md5: str, size: int
+    target_full_path: str | Path,
+    *,
+    url: str,
+    sha256: str,
+    md5: str,
+    size: int,
+    hasher=None,
 ):
     """
     Create or open locked partial download file, moving onto target_full_path
     when finished. Preserve partial file on exception.
+
+    ``hasher``, if given, has already been updated with the file's complete
+    contents and is used instead of reading the file back for the checksum.
     """
     target_full_path = Path(target_full_path)
     parent = target_full_path.parent
@@ -182,13 +471,16 @@ def download_partial_file(
                 checksum_bytes = bytes.fromhex(checksum)
             except (ValueError, TypeError) as exc:
                 raise CondaValueError(exc) from exc
-            hasher = hashlib.new(checksum_type)
-            target.seek(0)
-            while read := target.read(CHUNK_SIZE):
-                hasher.update(read)
-
-            if hasher.digest() != checksum_bytes:
-                actual_checksum = hasher.hexdigest()
+            if hasher is None:
+                file_hasher = hashlib.new(checksum_type)
+                target.seek(0)
+                while read := target.read(CHUNK_SIZE):
+                    file_hasher.update(read)
+            else:
+                file_hasher = hasher
+
+            if file_hasher.digest() != checksum_bytes:
+                actual_checksum = file_hasher.hexdigest()
                 log.debug(
                     "%s mismatch for download: %s (%s != %s)",
                     checksum_type,
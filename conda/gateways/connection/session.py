@@ -4,10 +4,11 @@
 
 from __future__ import annotations
 
+import os
 from fnmatch import fnmatch
 from functools import lru_cache
 from logging import getLogger
-from threading import local
+from threading import Lock, local
 
 from ... import CondaError
 from ...auxlib.ish import dals
@@ -23,6 +24,7 @@ from ...exceptions import ProxyError
 from ...models.channel import Channel
 from ..anaconda_client import read_binstar_tokens
 from . import (
+    DEFAULT_POOLSIZE,
     AuthBase,
     BaseAdapter,
     Retry,
@@ -123,6 +125,70 @@ def get_session(url: str):
     return CondaSession(auth=auth_handler_cls(channel_name))
 
 
+def get_pool_maxsize() -> int:
+    """
+    Number of connections to keep open per host, enough for every thread that may
+    be talking to the same mirror at once.
+    """
+    # subdir_data falls back to ThreadPoolExecutor's default worker count
+    repodata_threads = context.repodata_threads or min(32, (os.cpu_count() or 1) + 4)
+    # every package download may open one connection per segment
+    fetch_connections = (context.fetch_threads or 1) * max(1, context.download_segments)
+    return max(DEFAULT_POOLSIZE, repodata_threads, fetch_connections)
+
+
+_http_adapters: dict[tuple, HTTPAdapter] = {}
+_http_adapters_lock = Lock()
+
+
+def _new_http_adapter(truststore: bool, pool_maxsize: int) -> HTTPAdapter:
+    ssl_context = None
+    if truststore:
+        try:
+            import ssl
+
+            import truststore
+
+            ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        except ImportError:
+            raise CondaError(
+                "The `ssl_verify: truststore` setting is only supported on"
+                "Python 3.10 or later."
+            )
+
+    # Configure retries
+    retry = Retry(
+        total=context.remote_max_retries,
+        backoff_factor=context.remote_backoff_factor,
+        status_forcelist=[413, 429, 500, 503],
+        raise_on_status=False,
+        respect_retry_after_header=False,
+    )
+    return HTTPAdapter(
+        max_retries=retry, ssl_context=ssl_context, pool_maxsize=pool_maxsize
+    )
+
+
+def get_http_adapter() -> HTTPAdapter:
+    """
+    Return the HTTP adapter for the current configuration.
+
+    The adapter, and with it the connection pool, is shared by the sessions of all
+    threads, so connections to a host (and their TLS handshakes) are reused across
+    threads instead of being opened once per thread.
+    """
+    key = (
+        context.remote_max_retries,
+        context.remote_backoff_factor,
+        context.ssl_verify == "truststore",
+        get_pool_maxsize(),
+    )
+    with _http_adapters_lock:
+        if key not in _http_adapters:
+            _http_adapters[key] = _new_http_adapter(*key[2:])
+        return _http_adapters[key]
+
+
 def get_session_storage_key(auth) -> str:
     """
     Function that determines which storage key to use for our CondaSession object caching
@@ -175,19 +241,7 @@ class CondaSession(Session, metaclass=CondaSessionType):
 
         self.proxies.update(context.proxy_servers)
 
-        ssl_context = None
         if context.ssl_verify == "truststore":
-            try:
-                import ssl
-
-                import truststore
-
-                ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            except ImportError:
-                raise CondaError(
-                    "The `ssl_verify: truststore` setting is only supported on"
-                    "Python 3.10 or later."
-                )
             self.verify = True
         else:
             self.verify = context.ssl_verify
@@ -200,15 +254,7 @@ class CondaSession(Session, metaclass=CondaSessionType):
             self.mount("s3://", unused_adapter)
 
         else:
-            # Configure retries
-            retry = Retry(
-                total=context.remote_max_retries,
-                backoff_factor=context.remote_backoff_factor,
-                status_forcelist=[413, 429, 500, 503],
-                raise_on_status=False,
-                respect_retry_after_header=False,
-            )
-            http_adapter = HTTPAdapter(max_retries=retry, ssl_context=ssl_context)
+            http_adapter = get_http_adapter()
             self.mount("http://", http_adapter)
             self.mount("https://", http_adapter)
             self.mount("ftp://", FTPAdapter())
@@ -225,6 +271,8 @@ class CondaSession(Session, metaclass=CondaSessionType):
 
     @classmethod
     def cache_clear(cls):
+        with _http_adapters_lock:
+            _http_adapters.clear()
         try:
             cls._thread_local.sessions.clear()
         except AttributeError:
@@ -3,7 +3,9 @@
 """Disk utility functions for creating new files or directories."""
 
 import codecs
+import io
 import os
+import struct
 import sys
 import tempfile
 import warnings as _warnings
@@ -11,6 +13,8 @@ from errno import EACCES, EPERM, EROFS
 from logging import getLogger
 from os.path import dirname, isdir, isfile, join, splitext
 from shutil import copyfileobj, copystat
+from stat import S_IMODE, S_ISREG
+from zipfile import ZIP_STORED
 
 from ... import CondaError
 from ...auxlib.ish import dals
@@ -21,7 +25,7 @@ from ...common.constants import TRACE
 from ...common.path import ensure_pad, expand, win_path_double_escape, win_path_ok
 from ...common.serialize import json_dump
 from ...exceptions import BasicClobberError, CondaOSError, maybe_raise
-from ...models.enums import LinkType
+from ...models.enums import LinkType, PathType
 from . import mkdir_p
 from .delete import path_is_clean, rm_rf
 from .link import islink, lexists, link, readlink, symlink
@@ -248,6 +252,159 @@ def extract_tarball(
                 os.lchown(p, 0, 0)
 
 
+# signature, version, flags, method, time, date, crc32, compressed size,
+# uncompressed size, name length, extra field length
+_ZIP_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_ZIP_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_ZIP_DATA_DESCRIPTOR_FLAG = 0x08
+_ZIP64_EXTRA_ID = 0x0001
+
+
+def _read_exactly(fileobj, size):
+    data = fileobj.read(size)
+    while len(data) < size:
+        more = fileobj.read(size - len(data))
+        if not more:
+            raise ValueError("unexpected end of .conda stream")
+        data += more
+    return data
+
+
+class _ZipMemberReader(io.RawIOBase):
+    """Read one stored zip member from a sequential stream."""
+
+    def __init__(self, fileobj, size):
+        self._fileobj = fileobj
+        self.remaining = size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._fileobj.read(min(len(buffer), self.remaining))
+        if not data and self.remaining:
+            raise ValueError("unexpected end of .conda stream")
+        buffer[: len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+    def drain(self):
+        while self.remaining:
+            self.read(min(self.remaining, 1 << 16))
+
+
+def _zip64_compressed_size(extra):
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<HH", extra, position)
+        if header_id == _ZIP64_EXTRA_ID:
+            # uncompressed size, then compressed size
+            return struct.unpack_from("<Q", extra, position + 12)[0]
+        position += 4 + length
+    raise ValueError("zip64 member without a zip64 extra field")
+
+
+def extract_conda_stream(fileobj, destination_directory):
+    """
+    Extract a ``.conda`` package into ``destination_directory`` while reading it
+    sequentially from ``fileobj``, e.g. as it is downloaded.
+
+    The zip members are read in order from their local headers, so the
+    package's ``info-`` and ``pkg-`` tarballs must be stored uncompressed with
+    their sizes in the local headers, as conda-package-handling writes them.
+    ``fileobj`` is read up to the zip central directory, whatever follows is
+    left for the caller to consume.
+
+    :raises ValueError: if the package cannot be read sequentially.
+    """
+    from conda_package_streaming.extract import extract_stream
+    from conda_package_streaming.package_streaming import tar_generator, zstd
+
+    if zstd is None:
+        raise ValueError("zstd is not available to extract .conda packages")
+
+    components = set()
+    while True:
+        header = _read_exactly(fileobj, _ZIP_LOCAL_HEADER.size)
+        if header[:4] != _ZIP_LOCAL_HEADER_SIGNATURE:
+            break  # the central directory
+        (_, _, flags, method, _, _, _, size, _, name_length, extra_length) = (
+            _ZIP_LOCAL_HEADER.unpack(header)
+        )
+        name = _read_exactly(fileobj, name_length).decode("utf-8")
+        extra = _read_exactly(fileobj, extra_length)
+        if flags & _ZIP_DATA_DESCRIPTOR_FLAG or method != ZIP_STORED:
+            raise ValueError(f"cannot stream compressed .conda member {name}")
+        if size == 0xFFFFFFFF:
+            size = _zip64_compressed_size(extra)
+
+        member = _ZipMemberReader(fileobj, size)
+        component = name.split("-", 1)[0]
+        if component in ("info", "pkg") and name.endswith(".tar.zst"):
+            log.log(TRACE, "extracting %s\n  to %s", name, destination_directory)
+            with zstd.open(member) as reader:
+                extract_stream(tar_generator(reader), destination_directory)
+            components.add(component)
+        member.drain()
+
+    if components != {"info", "pkg"}:
+        raise ValueError("missing info or pkg component in .conda stream")
+
+
+def link_to_content_store(extracted_package_dir, store_dir):
+    """
+    Replace the files of an extracted package with hard links to identical files
+    in the content-addressed ``store_dir``, adding the files it does not have yet.
+
+    Files are keyed by the ``sha256`` recorded in ``info/paths.json`` and their
+    permission bits. Contents are hashed before they are linked, so a package
+    cannot put a file into the store under the digest of another file.
+    Returns the number of bytes no longer stored twice.
+    """
+    from .read import compute_sum, read_paths_json
+
+    saved = 0
+    for path_data in read_paths_json(extracted_package_dir).paths:
+        sha256 = getattr(path_data, "sha256", None)
+        if not sha256 or path_data.path_type != PathType.hardlink:
+            continue
+        path = join(extracted_package_dir, path_data.path)
+        temp_path = f"{path}.{os.getpid()}.c~"
+        try:
+            stat = os.lstat(path)
+            if not S_ISREG(stat.st_mode) or stat.st_nlink > 1 or not stat.st_size:
+                # links elsewhere already, or not worth a store entry
+                continue
+            store_path = join(
+                store_dir, sha256[:2], f"{sha256[2:]}-{S_IMODE(stat.st_mode):o}"
+            )
+            try:
+                store_stat = os.stat(store_path)
+            except FileNotFoundError:
+                store_stat = None
+            if store_stat and store_stat.st_size != stat.st_size:
+                continue
+            if compute_sum(path, "sha256") != sha256:
+                log.debug("%s does not match its sha256 in paths.json", path)
+                continue
+            if store_stat is None:
+                mkdir_p(dirname(store_path))
+                log.log(TRACE, "adding to content store %s => %s", path, store_path)
+                link(path, store_path)
+                continue
+            if compute_sum(store_path, "sha256") != sha256:
+                log.warning("%s does not match its sha256, ignoring it", store_path)
+                continue
+            log.log(TRACE, "linking from content store %s => %s", store_path, path)
+            link(store_path, temp_path)
+            os.replace(temp_path, path)
+            saved += stat.st_size
+        except OSError as e:
+            log.debug("cannot link %s to the content store: %r", path, e)
+            rm_rf(temp_path)
+    return saved
+
+
 def make_menu(prefix, file_path, remove=False):
     """
     Create cross-platform menu items (e.g. Windows Start Menu)
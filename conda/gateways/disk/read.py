@@ -86,6 +86,21 @@ def compute_sum(path: str | os.PathLike, algo: Literal["md5", "sha256"]) -> str:
 # ####################################################
 
 
+def count_hard_links(*paths: str) -> dict[tuple[int, int], int]:
+    """Count the hard links to each file, by ``(st_dev, st_ino)``, from within paths."""
+    links: dict[tuple[int, int], int] = {}
+    for path in paths:
+        for root, _, files in os.walk(path):
+            for file in files:
+                try:
+                    stat = os.lstat(join(root, file))
+                except OSError:
+                    continue
+                key = (stat.st_dev, stat.st_ino)
+                links[key] = links.get(key, 0) + 1
+    return links
+
+
 def read_package_info(record, package_cache_record):
     epd = package_cache_record.extracted_package_dir
     icondata = read_icondata(epd)
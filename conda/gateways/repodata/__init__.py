@@ -86,6 +86,23 @@ class RepodataOnDisk(Exception):
     """
 
 
+class RepodataPatched(RepodataOnDisk):
+    """
+    Indicate that RepoInterface.repodata() patched the cached repodata.json on
+    disk, without parsing it.
+
+    ``changes`` maps each ``(section, fn)`` entry that the patches touched, and
+    its .tar.bz2 or .conda counterpart, to its new value (None if removed).
+    ``previous`` is the cache state of the repodata.json that was patched, so
+    that caches derived from it can be updated instead of rebuilt.
+    """
+
+    def __init__(self, changes: dict[tuple[str, str], dict | None], previous: dict):
+        super().__init__()
+        self.changes = changes
+        self.previous = previous
+
+
 class RepoInterface(abc.ABC):
     # TODO: Support async operations
     # TODO: Support progress bars
@@ -103,6 +120,11 @@ class Response304ContentUnchanged(Exception):
 
 
 def get_repo_interface() -> type[RepoInterface]:
+    if "sharded" in context.experimental:
+        from .shards import ShardedRepoInterface
+
+        return ShardedRepoInterface
+
     if "jlap" in context.experimental:
         try:
             from .jlap.interface import JlapRepoInterface
@@ -779,15 +801,28 @@ class RepodataFetch:
             cache=self.repo_cache,
         )
 
-    def fetch_latest(self) -> tuple[dict | str, RepodataState]:
+    def fetch_latest(
+        self, *, read_cached: bool = True
+    ) -> tuple[dict | str | RepodataPatched | None, RepodataState]:
         """
         Return up-to-date repodata and cache information. Fetch repodata from
         remote if cache has expired; return cached data if cache has not
         expired; return stale cached data or dummy data if in offline mode.
+
+        :param read_cached: If False, return ``None`` instead of the contents of
+            ``cache_path_json`` when the up-to-date repodata is already on disk,
+            e.g. to let the caller load a derived cache instead; or the
+            `RepodataPatched` changes if it was patched in place.
         """
         cache = self.repo_cache
         cache.load_state()
 
+        def read_cache():
+            if read_cached:
+                return self.read_cache()
+            _, state = self.read_cache(state_only=True)
+            return None, state
+
         # XXX cache_path_json and cache_path_state must exist; just try loading
         # it and fall back to this on error?
         if not cache.cache_path_json.exists():
@@ -817,7 +852,7 @@ class RepodataFetch:
                     self.cache_path_json,
                 )
 
-                _internal_state = self.read_cache()
+                _internal_state = read_cache()
                 return _internal_state
 
             stale = cache.stale()
@@ -831,7 +866,7 @@ class RepodataFetch:
                     self.cache_path_json,
                     timeout,
                 )
-                _internal_state = self.read_cache()
+                _internal_state = read_cache()
                 return _internal_state
 
             log.debug(
@@ -852,9 +887,10 @@ class RepodataFetch:
                     raise  # is UnavailableInvalidChannel subclass
                 # the surrounding try/except/else will cache "{}"
                 raw_repodata = None
-            except RepodataOnDisk:
+            except RepodataOnDisk as e:
                 # used as a sentinel, not the raised exception object
                 raw_repodata = RepodataOnDisk
+                patched = e if isinstance(e, RepodataPatched) else None
 
         except Response304ContentUnchanged:
             log.debug(
@@ -862,7 +898,7 @@ class RepodataFetch:
                 self.url_w_repodata_fn,
             )
             cache.refresh()
-            _internal_state = self.read_cache()
+            _internal_state = read_cache()
             return _internal_state
         else:
             try:
@@ -870,7 +906,9 @@ class RepodataFetch:
                     # this is handled very similar to a 304. Can the cases be merged?
                     # we may need to read_bytes() and compare a hash to the state, instead.
                     # XXX use self._repo_cache.load() or replace after passing temp path to jlap
-                    raw_repodata = self.cache_path_json.read_text()
+                    raw_repodata = (
+                        self.cache_path_json.read_text() if read_cached else patched
+                    )
                     stat = self.cache_path_json.stat()
                     cache.state["size"] = stat.st_size  # type: ignore
                     mtime_ns = stat.st_mtime_ns
@@ -900,9 +938,12 @@ class RepodataFetch:
 
             return raw_repodata, cache.state
 
-    def read_cache(self) -> tuple[str, RepodataState]:
+    def read_cache(self, *, state_only=False) -> tuple[str, RepodataState]:
         """
         Read repodata from disk, without trying to fetch a fresh version.
+
+        With ``state_only=True``, only the cache state is read and ``""`` is
+        returned in place of the repodata.
         """
         # pickled data is bad or doesn't exist; load cached json
         log.debug(
@@ -914,7 +955,7 @@ class RepodataFetch:
         cache = self.repo_cache
 
         try:
-            raw_repodata_str = cache.load()
+            raw_repodata_str = cache.load(state_only=state_only)
             return raw_repodata_str, cache.state
         except ValueError as e:
             # OSError (locked) may happen here
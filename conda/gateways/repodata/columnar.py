@@ -0,0 +1,256 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+"""
+Memory-mapped, columnar cache of processed repodata.
+
+The file is laid out as a small JSON header followed by fixed-width columns
+and blobs that can be used directly from a read-only memory map:
+
+* a sorted string table of package names (``name_offsets`` + ``name_blob``),
+* a name index mapping each name to the indices of its records
+  (``name_ranges`` + ``name_records``),
+* a ``record_name`` column with the name id of every record, and
+* one compact JSON document per record (``record_offsets`` + ``record_blob``).
+
+Opening the cache only parses the header; individual records are decoded on
+demand, so loading a subdir no longer costs time proportional to its size.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+    from typing import Any
+
+log = getLogger(__name__)
+
+MAGIC = b"CONDACOL"
+FORMAT_VERSION = 1
+
+# magic, format version, header length
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 8
+
+# (section name, array typecode); typecode None for raw bytes
+_SECTIONS = (
+    ("name_offsets", "Q"),
+    ("name_ranges", "I"),
+    ("name_records", "I"),
+    ("record_name", "I"),
+    ("record_offsets", "Q"),
+    ("name_blob", None),
+    ("record_blob", None),
+)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _encode_table(items: Iterable[bytes]) -> tuple[array, bytes]:
+    offsets = array("Q", [0])
+    chunks = []
+    position = 0
+    for item in items:
+        chunks.append(item)
+        position += len(item)
+        offsets.append(position)
+    return offsets, b"".join(chunks)
+
+
+def write_columnar_cache(
+    path: str | Path,
+    header: dict[str, Any],
+    records: Iterable[dict | tuple[str, bytes]],
+) -> None:
+    """
+    Write ``records`` and the JSON-serializable ``header`` to ``path``.
+
+    ``records`` are repodata ``info`` dicts, each with a ``name``, or
+    ``(name, encoded info)`` tuples, e.g. copied from another cache with
+    `ColumnarRepodata.raw_record`.
+
+    The file is written next to ``path`` and renamed into place, so concurrent
+    readers only ever see a complete cache.
+    """
+    encode = json.JSONEncoder(separators=(",", ":"), check_circular=False).encode
+
+    record_names = []
+    record_docs = []
+    for info in records:
+        if isinstance(info, dict):
+            record_names.append(info["name"])
+            record_docs.append(encode(info).encode("utf-8"))
+        else:
+            record_names.append(info[0])
+            record_docs.append(info[1])
+
+    names = sorted(set(record_names))
+    name_ids = {name: i for i, name in enumerate(names)}
+    record_name = array("I", (name_ids[name] for name in record_names))
+
+    by_name: list[list[int]] = [[] for _ in names]
+    for record_index, name_id in enumerate(record_name):
+        by_name[name_id].append(record_index)
+    name_ranges = array("I", [0])
+    name_records = array("I")
+    for indices in by_name:
+        name_records.extend(indices)
+        name_ranges.append(len(name_records))
+
+    name_offsets, name_blob = _encode_table(name.encode("utf-8") for name in names)
+    record_offsets, record_blob = _encode_table(record_docs)
+
+    data = {
+        "name_offsets": name_offsets.tobytes(),
+        "name_ranges": name_ranges.tobytes(),
+        "name_records": name_records.tobytes(),
+        "record_name": record_name.tobytes(),
+        "record_offsets": record_offsets.tobytes(),
+        "name_blob": name_blob,
+        "record_blob": record_blob,
+    }
+    sections = {}
+    position = 0
+    for section, _ in _SECTIONS:
+        position = _aligned(position)
+        sections[section] = (position, len(data[section]))
+        position += len(data[section])
+
+    header_bytes = json.dumps(
+        {
+            "header": header,
+            "byteorder": sys.byteorder,
+            "count": len(record_docs),
+            "names": len(names),
+            "sections": sections,
+        }
+    ).encode("utf-8")
+    data_start = _aligned(_PREAMBLE.size + len(header_bytes))
+
+    temp_path = f"{path}.{os.urandom(2).hex()}.tmp"
+    try:
+        with open(temp_path, "xb") as fh:
+            fh.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+            fh.write(header_bytes)
+            for section, _ in _SECTIONS:
+                offset, _ = sections[section]
+                fh.seek(data_start + offset)
+                fh.write(data[section])
+        os.replace(temp_path, path)
+    finally:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+class ColumnarNamesIndex(Mapping):
+    """
+    Read-only ``{name: [record index, ...]}`` view of a columnar cache.
+
+    Like the ``defaultdict(list)`` it replaces, unknown names map to an empty
+    list.
+    """
+
+    def __init__(self, columnar: ColumnarRepodata):
+        self._columnar = columnar
+
+    def __getitem__(self, name: str) -> list[int]:
+        return self._columnar.indices_for_name(name)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._columnar.find_name(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return self._columnar.iter_names()
+
+    def __len__(self) -> int:
+        return self._columnar.name_count
+
+
+class ColumnarRepodata:
+    """Read-only, memory-mapped view of a file written by `write_columnar_cache`."""
+
+    def __init__(self, path: str | Path):
+        with open(path, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = _PREAMBLE.unpack_from(self._mmap)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a columnar repodata cache, v{version}")
+        header_end = _PREAMBLE.size + header_length
+        meta = json.loads(self._mmap[_PREAMBLE.size : header_end])
+        if meta["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written with {meta['byteorder']} byteorder")
+
+        self.header: dict[str, Any] = meta["header"]
+        self.count: int = meta["count"]
+        self.name_count: int = meta["names"]
+
+        view = memoryview(self._mmap)
+        data_start = _aligned(header_end)
+        for section, typecode in _SECTIONS:
+            offset, length = meta["sections"][section]
+            start = data_start + offset
+            section_view = view[start : start + length]
+            if typecode:
+                section_view = section_view.cast(typecode)
+            setattr(self, f"_{section}", section_view)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def name(self, name_id: int) -> str:
+        offsets = self._name_offsets
+        return str(self._name_blob[offsets[name_id] : offsets[name_id + 1]], "utf-8")
+
+    def iter_names(self) -> Iterator[str]:
+        return map(self.name, range(self.name_count))
+
+    def find_name(self, name: str) -> int | None:
+        """Binary search the sorted string table; return the name id or None."""
+        low, high = 0, self.name_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.name(middle) < name:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.name_count and self.name(low) == name:
+            return low
+        return None
+
+    def indices_for_name(self, name: str) -> list[int]:
+        name_id = self.find_name(name)
+        if name_id is None:
+            return []
+        ranges = self._name_ranges
+        return self._name_records[ranges[name_id] : ranges[name_id + 1]].tolist()
+
+    @property
+    def names_index(self) -> ColumnarNamesIndex:
+        return ColumnarNamesIndex(self)
+
+    def record_name(self, index: int) -> str:
+        return self.name(self._record_name[index])
+
+    def raw_record(self, index: int) -> bytes:
+        """A single record's encoded ``info`` dict."""
+        offsets = self._record_offsets
+        return bytes(self._record_blob[offsets[index] : offsets[index + 1]])
+
+    def record(self, index: int) -> dict[str, Any]:
+        """Decode a single record's ``info`` dict."""
+        return json.loads(self.raw_record(index))
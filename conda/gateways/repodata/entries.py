@@ -0,0 +1,79 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+"""Locate package entries in raw repodata.json text without parsing it."""
+
+from __future__ import annotations
+
+import json
+import re
+from bisect import bisect
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# "packages": { and "packages.conda": { in raw repodata.json
+_REPODATA_SECTION_RE = re.compile(r'"(packages(?:\.conda)?)"\s*:\s*\{')
+# "<name>-<version>-<build>.<ext>": { entries inside those sections; the
+# literal extension is much faster to search for than the whole key
+_REPODATA_ENTRY_RE = re.compile(r'(\.tar\.bz2|\.conda)"\s*:\s*(?=\{)')
+_REPODATA_INFO_RE = re.compile(r'"info"\s*:\s*(?=\{)')
+
+
+class RepodataEntries:
+    """
+    Locate the ``packages`` and ``packages.conda`` entries of a raw
+    repodata.json string by package name, without parsing them.
+
+    Only the entries that are asked for with `packages` are decoded.
+    """
+
+    def __init__(self, raw_repodata_str: str):
+        self.raw = raw_repodata_str
+        self._decode = json.JSONDecoder().raw_decode
+
+        info = _REPODATA_INFO_RE.search(raw_repodata_str)
+        self.info = self._decode(raw_repodata_str, info.end())[0] if info else {}
+
+        #: offset just past the opening brace of each section
+        self.sections: dict[str, int] = {
+            match.group(1): match.end()
+            for match in _REPODATA_SECTION_RE.finditer(raw_repodata_str)
+        }
+        #: {section: {fn: (key offset, value offset)}} in document order
+        self.spans: dict[str, dict[str, tuple[int, int]]] = {
+            section: {} for section in self.sections
+        }
+        sections = sorted((start, section) for section, start in self.sections.items())
+        section_starts = [start for start, _ in sections]
+        self._entries = defaultdict(list)
+        for match in _REPODATA_ENTRY_RE.finditer(raw_repodata_str):
+            section = bisect(section_starts, match.start())
+            key = raw_repodata_str.rfind('"', 0, match.start())
+            fn = raw_repodata_str[key + 1 : match.end(1)]
+            parts = fn.rsplit("-", 2)
+            if section and len(parts) == 3:
+                section = sections[section - 1][1]
+                self.spans[section][fn] = (key, match.end())
+                self._entries[parts[0]].append((section, fn))
+
+    def decode(self, offset: int) -> tuple[dict, int]:
+        """Decode the value at ``offset``; return it and the offset past its end."""
+        return self._decode(self.raw, offset)
+
+    def packages(self, names: Iterable[str]) -> tuple[dict, dict]:
+        """
+        Decode the entries of ``names``, as ``packages`` and ``packages.conda``
+        dicts.
+
+        :raises ValueError: if an entry's filename does not start with its name.
+        """
+        packages = {"packages": {}, "packages.conda": {}}
+        for name in names:
+            for section, fn in self._entries.get(name, ()):
+                info = self.decode(self.spans[section][fn][1])[0]
+                if info.get("name") != name:
+                    raise ValueError(f"{fn} is not named {name}")
+                packages[section][fn] = info
+        return packages["packages"], packages["packages.conda"]
@@ -21,7 +21,8 @@ from requests import HTTPError
 from conda.common.url import mask_anaconda_token
 
 from ....base.context import context
-from .. import ETAG_KEY, LAST_MODIFIED_KEY, RepodataState
+from .. import ETAG_KEY, LAST_MODIFIED_KEY, RepodataPatched, RepodataState
+from ..entries import RepodataEntries
 from .core import JLAP
 
 if TYPE_CHECKING:
@@ -185,6 +186,125 @@ def apply_patches(data, apply):
         data = jsonpatch.JsonPatch(patch["patch"]).apply(data, in_place=True)
 
 
+# /packages/<fn>[/...] and /packages.conda/<fn>[/...]
+_ENTRY_POINTER_RE = re.compile(r"/(packages(?:\.conda)?)/([^/]+)(?:/.*)?")
+_REMOVED_RE = re.compile(r'"removed"\s*:\s*(?=\[)')
+_EXTENSIONS = {"packages": ".tar.bz2", "packages.conda": ".conda"}
+
+
+def _counterparts(section: str, fn: str):
+    """Both the .tar.bz2 and .conda entries of the same package as ``fn``."""
+    yield section, fn
+    if fn.endswith(_EXTENSIONS[section]):
+        stem = fn[: -len(_EXTENSIONS[section])]
+        for other, extension in _EXTENSIONS.items():
+            if other != section:
+                yield other, stem + extension
+
+
+def apply_patches_in_place(repodata_str: str, apply: list) -> tuple[str, dict]:
+    """
+    Apply ``apply`` (in the order of `apply_patches`) to the text of
+    repodata.json, only decoding and re-encoding the entries the patches touch.
+
+    Return the patched text and ``{(section, fn): entry or None}`` for every
+    touched entry and its .tar.bz2 or .conda counterpart; None if it does not
+    exist after patching.
+
+    :raises ValueError: if the patches change anything but ``packages``,
+        ``packages.conda`` entries and ``removed``; use `apply_patches`.
+    """
+    entries = RepodataEntries(repodata_str)
+    touched = set()
+    removed = None
+    for patch in apply:
+        for operation in patch["patch"]:
+            pointer = operation["path"]
+            if operation["op"] in ("move", "copy"):
+                raise ValueError(f"Cannot {operation['op']} {pointer} in place")
+            if pointer == "/removed" or pointer.startswith("/removed/"):
+                removed = _REMOVED_RE.search(repodata_str)
+                if not removed:
+                    raise ValueError("No removed list to patch in place")
+                continue
+            match = _ENTRY_POINTER_RE.fullmatch(pointer)
+            if not match or match.group(1) not in entries.sections:
+                raise ValueError(f"Cannot patch {pointer} in place")
+            fn = match.group(2).replace("~1", "/").replace("~0", "~")
+            if len(fn.rsplit("-", 2)) != 3:
+                raise ValueError(f"Cannot patch {pointer} in place")
+            touched.update(_counterparts(match.group(1), fn))
+
+    document = {section: {} for section in _EXTENSIONS}
+    for section, fn in touched:
+        span = entries.spans.get(section, {}).get(fn)
+        if span:
+            document[section][fn] = entries.decode(span[1])[0]
+    if removed:
+        document["removed"], removed_end = entries.decode(removed.end())
+    for patch in reversed(apply):
+        jsonpatch.JsonPatch(patch["patch"]).apply(document, in_place=True)
+
+    def value_end(section, fn):
+        return entries.decode(entries.spans[section][fn][1])[1]
+
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    edits = []  # (start, end, replacement)
+    if removed:
+        edits.append((removed.end(), removed_end, encode(document["removed"])))
+    for section, spans in entries.spans.items():
+        patched = document[section]
+        fns = [fn for s, fn in touched if s == section]
+
+        for fn in fns:
+            if fn in spans and fn in patched:
+                edits.append(
+                    (spans[fn][1], value_end(section, fn), encode(patched[fn]))
+                )
+
+        # delete runs of adjacent removed entries together with one comma
+        gone = [fn for fn in fns if fn in spans and fn not in patched]
+        keys = list(spans) if gone else []
+        if gone:
+            order = {fn: i for i, fn in enumerate(keys)}
+            gone = sorted(order[fn] for fn in gone)
+        runs = []
+        for i in gone:
+            if runs and runs[-1][1] == i - 1:
+                runs[-1][1] = i
+            else:
+                runs.append([i, i])
+        for first, last in runs:
+            if last + 1 < len(keys):
+                start, end = spans[keys[first]][0], spans[keys[last + 1]][0]
+            elif first > 0:
+                start = value_end(section, keys[first - 1])
+                end = value_end(section, keys[last])
+            else:
+                start, end = spans[keys[first]][0], value_end(section, keys[last])
+            edits.append((start, end, ""))
+
+        added = sorted(fn for fn in fns if fn in patched and fn not in spans)
+        if added:
+            text = ",".join(f"{encode(fn)}:{encode(patched[fn])}" for fn in added)
+            if len(gone) < len(spans):
+                text += ","
+            edits.append((entries.sections[section], entries.sections[section], text))
+
+    # an insertion sorts before a deletion at the same offset
+    edits.sort(key=lambda edit: (edit[0], edit[1]))
+    chunks = []
+    position = 0
+    for start, end, text in edits:
+        chunks.append(repodata_str[position:start])
+        chunks.append(text)
+        position = end
+    chunks.append(repodata_str[position:])
+
+    changes = {(section, fn): document[section].get(fn) for section, fn in touched}
+    return "".join(chunks), changes
+
+
 def withext(url, ext):
     return re.sub(r"(\.\w+)$", ext, url)
 
@@ -284,7 +404,7 @@ def request_url_jlap_state(
     session: Session,
     cache: RepodataCache,
     temp_path: pathlib.Path,
-) -> dict | None:
+) -> dict | RepodataPatched | None:
     jlap_state = state.get(JLAP_KEY, {})
     headers = jlap_state.get(HEADERS, {})
     json_path = cache.cache_path_json
@@ -439,21 +559,30 @@ def request_url_jlap_state(
                     # we haven't loaded repodata yet; it could fail to parse, or
                     # have the wrong hash.
                     # if this fails, then we also need to fetch again from 0
-                    repodata_json = json.loads(cache.load())
+                    repodata_str = cache.load()
                     # XXX cache.state must equal what we started with, otherwise
                     # bail with 'repodata on disk' (indicating another process
                     # downloaded repodata.json in parallel with us)
                     if have != cache.state.get(NOMINAL_HASH):  # or check mtime_ns?
                         log.warning("repodata cache changed during jlap fetch.")
                         return None
-
-                apply_patches(repodata_json, apply)
+                    previous = dict(cache.state)
+
+                try:
+                    with timeme("Patch in place "):
+                        repodata_str, changes = apply_patches_in_place(
+                            repodata_str, apply
+                        )
+                    repodata_json = None
+                except (ValueError, jsonpatch.JsonPatchException) as e:
+                    log.debug("Apply patches to parsed repodata.json (%s)", e)
+                    repodata_json = json.loads(repodata_str)
+                    apply_patches(repodata_json, apply)
+                    repodata_str = json.dumps(repodata_json, separators=(",", ":"))
 
                 with timeme("Write changed "), temp_path.open("wb") as repodata:
                     hasher = hash()
-                    HashWriter(repodata, hasher).write(
-                        json.dumps(repodata_json, separators=(",", ":")).encode("utf-8")
-                    )
+                    HashWriter(repodata, hasher).write(repodata_str.encode("utf-8"))
 
                     # actual hash of serialized json
                     state[ON_DISK_HASH] = hasher.hexdigest()
@@ -461,6 +590,10 @@ def request_url_jlap_state(
                     # hash of equivalent upstream json
                     state[NOMINAL_HASH] = want
 
+                    if repodata_json is None:
+                        # caches derived from the previous repodata.json can
+                        # apply the same changes
+                        return RepodataPatched(changes, previous)
                     # avoid duplicate parsing
                     return repodata_json
             else:
@@ -17,6 +17,7 @@ from .. import (
     LAST_MODIFIED_KEY,
     URL_KEY,
     RepodataOnDisk,
+    RepodataPatched,
     RepodataState,
     RepoInterface,
     Response304ContentUnchanged,
@@ -123,6 +124,9 @@ class JlapRepoInterface(RepoInterface):
         if repodata_json_or_none is None:  # common
             # Indicate that subdir_data mustn't rewrite cache_path_json
             raise RepodataOnDisk()
+        elif isinstance(repodata_json_or_none, RepodataPatched):
+            # RepodataOnDisk, with the changes
+            raise repodata_json_or_none
         else:
             return repodata_json_or_none
 
@@ -0,0 +1,338 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+"""
+Sharded repodata.
+
+A sharded channel publishes, next to ``repodata.json``, a small index mapping
+each package name in the subdir to the sha256 of a zstd-compressed shard that
+holds that name's ``packages`` and ``packages.conda`` entries::
+
+    # <subdir>/repodata_shards.json.zst
+    {
+        "version": 1,
+        "info": {"subdir": "linux-64", "shards_base_url": "./shards/"},
+        "shards": {"python": "<sha256 hex digest>", ...}
+    }
+
+    # <shards_base_url>/<sha256 hex digest>.json.zst
+    {"packages": {...}, "packages.conda": {...}}
+
+Only the index is revalidated like ``repodata.json``; a shard's URL changes
+whenever its content does, so shards are cached by hash and never refetched.
+Installing a handful of packages then costs a few small downloads instead of
+the whole subdir.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+from concurrent.futures import as_completed
+from hashlib import sha256
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin
+
+import zstandard
+
+from ...base.constants import REPODATA_FN
+from ...base.context import context
+from ...common.io import ThreadLimitedThreadPoolExecutor
+from ...common.url import join_url
+from ...exceptions import ChecksumMismatchError
+from ..connection.download import disable_ssl_verify_warning
+from ..connection.session import get_session
+from . import (
+    CACHE_CONTROL_KEY,
+    ETAG_KEY,
+    LAST_MODIFIED_KEY,
+    CondaRepoInterface,
+    RepodataCache,
+    conda_http_errors,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+    from typing import Any, NoReturn
+
+log = logging.getLogger(__name__)
+
+SHARDS_INDEX_FN = "repodata_shards.json.zst"
+SHARDS_FORMAT_VERSION = 1
+SHARDS_DIR = "shards"
+
+# good enough to prefetch dependencies; queries still go through MatchSpec
+_DEPENDENCY_NAME_RE = re.compile(r"(?:[^\s:]*::)?([^\s=<>!~,|\[]+)")
+
+
+class ShardsUnavailable(Exception):
+    """The channel does not publish sharded repodata; use ``repodata.json``."""
+
+
+def _decompress(data: bytes) -> bytes:
+    # decompressobj() copes with frames that don't record their content size
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+def _dependency_names(shard: dict) -> set[str]:
+    names = set()
+    for section in ("packages", "packages.conda"):
+        for info in shard.get(section, {}).values():
+            for spec in (*info.get("depends", ()), *info.get("constrains", ())):
+                match = _DEPENDENCY_NAME_RE.match(spec)
+                if match:
+                    names.add(match.group(1))
+    return names
+
+
+class RepodataShards:
+    """
+    Shard index of one subdir; fetches the shards of package names on demand.
+
+    Passed to ``SubdirData`` in place of a parsed ``repodata.json``.
+    """
+
+    def __init__(self, repo: ShardedRepoInterface, index: dict[str, Any]):
+        self._repo = repo
+        self.info: dict[str, Any] = index.get("info", {})
+        self._shards: dict[str, str] = index.get("shards", {})
+        # decoded shards by package name, including prefetched dependencies
+        self._visited: dict[str, dict] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._shards
+
+    def packages(self, names: Iterable[str]) -> tuple[dict, dict]:
+        """
+        Return the ``packages`` and ``packages.conda`` entries of ``names``.
+
+        Shards for the dependencies of ``names`` are fetched at the same time,
+        concurrently, so that the caller's following queries for them are
+        answered from memory.
+        """
+        names = set(names)
+        self._visit(names)
+        legacy_packages = {}
+        conda_packages = {}
+        for name in names:
+            shard = self._visited.get(name, {})
+            legacy_packages.update(shard.get("packages", {}))
+            conda_packages.update(shard.get("packages.conda", {}))
+        return legacy_packages, conda_packages
+
+    def _visit(self, names: set[str]) -> None:
+        pending = {name for name in names if name in self._shards} - set(self._visited)
+        while pending:
+            fetched = self._repo.fetch_shards(
+                {name: self._shards[name] for name in pending},
+                self.info.get("shards_base_url"),
+            )
+            self._visited.update(fetched)
+            pending = set()
+            for shard in fetched.values():
+                pending.update(_dependency_names(shard))
+            pending = {
+                name
+                for name in pending
+                if name in self._shards and name not in self._visited
+            }
+
+
+class ShardedRepoInterface(CondaRepoInterface):
+    """
+    Fetch sharded repodata when the channel provides it.
+
+    ``repodata()`` still returns the complete ``repodata.json``, for callers
+    that need every record of the subdir.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        repodata_fn: str | None,
+        *,
+        cache: RepodataCache,
+        **kwargs,
+    ) -> None:
+        super().__init__(url, repodata_fn, **kwargs)
+        self._cache = cache
+
+    @property
+    def shards_index_cache(self) -> RepodataCache:
+        """Cache of the decompressed index, next to the ``repodata.json`` cache."""
+        return RepodataCache(
+            self._cache.cache_dir / f"{self._cache.name}.shards", SHARDS_INDEX_FN
+        )
+
+    @property
+    def shards_dir(self) -> Path:
+        return self._cache.cache_dir / SHARDS_DIR
+
+    def repodata_shards(self) -> RepodataShards:
+        """
+        Return the up-to-date shard index of the subdir.
+
+        :raises ShardsUnavailable: if the channel has no shards, or none are
+            cached and we may not fetch them.
+        """
+        return RepodataShards(self, self._shards_index())
+
+    def _shards_index(self) -> dict[str, Any]:
+        if self._repodata_fn != REPODATA_FN:
+            raise ShardsUnavailable(self._repodata_fn)
+
+        cache = self.shards_index_cache
+        state = cache.load_state()
+        if not state.should_check_format("shards"):
+            raise ShardsUnavailable(self._url)
+
+        cached = cache.cache_path_json.exists()
+        if cached and (context.use_index_cache or context.offline or not cache.stale()):
+            return self._checked_index(json.loads(cache.load()))
+        if context.use_index_cache or context.offline:
+            raise ShardsUnavailable(self._url)
+
+        if not context.ssl_verify:
+            disable_ssl_verify_warning()
+
+        session = get_session(self._url)
+        headers = {}
+        if cached and state.etag:
+            headers["If-None-Match"] = state.etag
+        if cached and state.mod:
+            headers["If-Modified-Since"] = state.mod
+
+        with conda_http_errors(self._url, SHARDS_INDEX_FN):
+            response = session.get(
+                join_url(self._url, SHARDS_INDEX_FN),
+                headers=headers,
+                proxies=session.proxies,
+                timeout=(
+                    context.remote_connect_timeout_secs,
+                    context.remote_read_timeout_secs,
+                ),
+            )
+            if response.status_code in (403, 404):
+                log.debug("No sharded repodata for %s", self._url)
+                self._set_unavailable(cache)
+            response.raise_for_status()
+
+        if response.status_code == 304:
+            cache.refresh()
+            return self._checked_index(json.loads(cache.load()))
+
+        try:
+            index_str = _decompress(response.content).decode("utf-8")
+            index = self._checked_index(json.loads(index_str))
+        except (zstandard.ZstdError, ValueError, ShardsUnavailable) as e:
+            log.warning("Could not read sharded repodata for %s (%s)", self._url, e)
+            self._set_unavailable(cache)
+
+        state.clear()
+        state[ETAG_KEY] = response.headers.get("etag", "")
+        state[LAST_MODIFIED_KEY] = response.headers.get("last-modified", "")
+        state[CACHE_CONTROL_KEY] = response.headers.get("cache-control", "")
+        state.set_has_format("shards", True)
+        cache.save(index_str)
+        return index
+
+    def _checked_index(self, index: dict[str, Any]) -> dict[str, Any]:
+        if index.get("version") != SHARDS_FORMAT_VERSION:
+            raise ShardsUnavailable(
+                f"{self._url} shards version {index.get('version')}"
+            )
+        return index
+
+    def _set_unavailable(self, cache: RepodataCache) -> NoReturn:
+        """Remember not to look for shards again for a while, and raise."""
+        cache.state.clear()
+        cache.state.set_has_format("shards", False)
+        # the cache state is discarded without a matching (here empty) index
+        cache.save("{}")
+        raise ShardsUnavailable(self._url)
+
+    def shard_url(self, digest: str, shards_base_url: str | None = None) -> str:
+        base = urljoin(self._url + "/", shards_base_url or f"{SHARDS_DIR}/")
+        return join_url(base, f"{digest}.json.zst")
+
+    def fetch_shards(
+        self, digests: dict[str, str], shards_base_url: str | None = None
+    ) -> dict[str, dict]:
+        """
+        Return ``{name: shard}`` for ``{name: sha256 hex digest}``, reading
+        cached shards and downloading the others concurrently.
+        """
+        shards = {}
+        missing = {}
+        for name, digest in digests.items():
+            shard = self._read_shard(digest)
+            if shard is None:
+                missing[name] = digest
+            else:
+                shards[name] = shard
+        if not missing:
+            return shards
+
+        if context.offline:
+            log.debug("Offline; skipping %d uncached shards", len(missing))
+            return shards
+
+        if not context.ssl_verify:
+            disable_ssl_verify_warning()
+
+        self.shards_dir.mkdir(parents=True, exist_ok=True)
+        with ThreadLimitedThreadPoolExecutor(
+            max_workers=min(len(missing), context.fetch_threads or 1)
+        ) as executor:
+            futures = {
+                executor.submit(self._download_shard, digest, shards_base_url): name
+                for name, digest in missing.items()
+            }
+            for future in as_completed(futures):
+                shards[futures[future]] = future.result()
+        return shards
+
+    def _shard_path(self, digest: str) -> Path:
+        return self.shards_dir / f"{digest}.json.zst"
+
+    def _read_shard(self, digest: str) -> dict | None:
+        try:
+            data = self._shard_path(digest).read_bytes()
+        except OSError:
+            return None
+        if sha256(data).hexdigest() != digest:
+            log.debug("Discarding corrupt cached shard %s", digest)
+            return None
+        return json.loads(_decompress(data))
+
+    def _download_shard(self, digest: str, shards_base_url: str | None) -> dict:
+        url = self.shard_url(digest, shards_base_url)
+        session = get_session(url)
+        with conda_http_errors(self._url, f"{SHARDS_DIR}/{digest}.json.zst"):
+            response = session.get(
+                url,
+                proxies=session.proxies,
+                timeout=(
+                    context.remote_connect_timeout_secs,
+                    context.remote_read_timeout_secs,
+                ),
+            )
+            response.raise_for_status()
+
+        data = response.content
+        actual = sha256(data).hexdigest()
+        path = self._shard_path(digest)
+        if actual != digest:
+            raise ChecksumMismatchError(url, str(path), "sha256", digest, actual)
+
+        temp_path = path.with_name(f"{path.name}.{os.urandom(2).hex()}.tmp")
+        try:
+            temp_path.write_bytes(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            # the shard is still usable; it will be downloaded again next time
+            log.debug("Could not cache shard %s (%s)", path, e)
+            temp_path.unlink(missing_ok=True)
+        return json.loads(_decompress(data))
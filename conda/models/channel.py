@@ -24,6 +24,7 @@ from ..base.constants import (
     UNKNOWN_CHANNEL,
 )
 from ..base.context import context
+from ..common.cache import InterningCache
 from ..common.compat import ensure_text_type, isiterable
 from ..common.path import is_package_file, is_path, win_path_backout
 from ..common.url import (
@@ -33,6 +34,7 @@ from ..common.url import (
     join_url,
     path_to_url,
     split_conda_url_easy_parts,
+    split_package_url,
     split_platform,
     split_scheme_auth_token,
     urlparse,
@@ -58,11 +60,17 @@ class ChannelType(type):
             value = args[0]
             if isinstance(value, Channel):
                 return value
-            elif value in Channel._cache_:
-                return Channel._cache_[value]
+            cache = Channel._cache_
+            try:
+                c = cache.entries[value]
+            except KeyError:
+                try:
+                    c = cache.promote(value)
+                except KeyError:
+                    c = cache[value] = Channel.from_value(value)
             else:
-                c = Channel._cache_[value] = Channel.from_value(value)
-                return c
+                cache.hits += 1
+            return c
         elif "channels" in kwargs:
             # presence of 'channels' kwarg indicates MultiChannel
             channels = tuple(cls(**_kwargs) for _kwargs in kwargs["channels"])
@@ -81,11 +89,16 @@ class Channel(metaclass=ChannelType):
 
     """
 
-    _cache_ = {}
+    # channels by the value they were made from, which includes the URL of
+    # every package record whose channel was asked for
+    _cache_ = InterningCache(maxsize=50_000)
+    # channels parsed from URLs without a package filename
+    _url_cache_ = InterningCache(maxsize=1_000)
 
     @staticmethod
     def _reset_state():
-        Channel._cache_ = {}
+        Channel._cache_.clear()
+        Channel._url_cache_.clear()
 
     def __init__(
         self,
@@ -562,6 +575,26 @@ def _read_channel_configuration(scheme, host, port, path):
 
 
 def parse_conda_channel_url(url):
+    # the package URLs of a channel subdir only differ in their filename, so
+    # they share the channel parsed from the subdir URL
+    url, package_filename = split_package_url(url)
+    cache = Channel._url_cache_
+    try:
+        channel = cache.entries[url]
+    except KeyError:
+        try:
+            channel = cache.promote(url)
+        except KeyError:
+            channel = cache[url] = _parse_conda_channel_url(url)
+    else:
+        cache.hits += 1
+    if package_filename:
+        channel = copy(channel)
+        channel.package_filename = package_filename
+    return channel
+
+
+def _parse_conda_channel_url(url):
     (
         scheme,
         auth,
@@ -598,6 +631,21 @@ def parse_conda_channel_url(url):
     )
 
 
+def cache_stats() -> dict[str, dict[str, int | None]]:
+    """Return the hits, misses, size and maxsize of the channel and URL caches."""
+    urlparse_info = urlparse.cache_info()
+    return {
+        "Channel": Channel._cache_.stats(),
+        "channel URL": Channel._url_cache_.stats(),
+        "urlparse": {
+            "hits": urlparse_info.hits,
+            "misses": urlparse_info.misses,
+            "size": urlparse_info.currsize,
+            "maxsize": urlparse_info.maxsize,
+        },
+    }
+
+
 # backward compatibility for conda-build
 def get_conda_build_local_url():
     return (context.local_build_root,)
@@ -269,8 +269,44 @@ class MatchSpec(metaclass=MatchSpecType):
                 return False
         return True
 
+    def filter(self, records):
+        """
+        Yields the records (`PackageRecord` s or dicts) of `records` that match, in
+        order.  Equivalent to ``(rec for rec in records if self.match(rec))``, but each
+        component is only matched once per distinct field value (e.g. once per version
+        string) instead of once per record.
+        """
+        from .records import PackageRecord
+
+        # the name is the most selective and cheapest check
+        checks = sorted(
+            (
+                (field_name, component, {})
+                for field_name, component in self._match_components.items()
+            ),
+            key=lambda check: check[0] != "name",
+        )
+        for rec in records:
+            record = PackageRecord.from_objects(rec) if isinstance(rec, dict) else rec
+            for field_name, component, results in checks:
+                val = getattr(record, field_name)
+                try:
+                    matched = results[val]
+                except KeyError:
+                    matched = results[val] = self._match_value(component, val)
+                except TypeError:
+                    # unhashable
+                    matched = self._match_value(component, val)
+                if not matched:
+                    break
+            else:
+                yield rec
+
     def _match_individual(self, record, field_name, match_component):
-        val = getattr(record, field_name)
+        return self._match_value(match_component, getattr(record, field_name))
+
+    @staticmethod
+    def _match_value(match_component, val):
         try:
             return match_component.match(val)
         except AttributeError:
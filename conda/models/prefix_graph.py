@@ -40,20 +40,43 @@ class PrefixGraph:
     def __init__(self, records, specs=()):
         records = tuple(records)
         specs = set(specs)
+        records_by_name = defaultdict(list)
+        for record in records:
+            records_by_name[record.name].append(record)
         self.graph = graph = {}  # dict[PrefixRecord, set[PrefixRecord]]
         self.spec_matches = spec_matches = {}  # dict[PrefixRecord, set[MatchSpec]]
         for node in records:
-            parent_match_specs = tuple(MatchSpec(d) for d in node.depends)
-            parent_nodes = {
-                rec for rec in records if any(m.match(rec) for m in parent_match_specs)
-            }
+            parent_nodes = set()
+            for dep in node.depends:
+                ms = MatchSpec(dep)
+                candidates = (
+                    records if "*" in ms.name else records_by_name.get(ms.name, ())
+                )
+                parent_nodes.update(ms.filter(candidates))
             graph[node] = parent_nodes
             matching_specs = IndexedSet(s for s in specs if s.match(node))
             if matching_specs:
                 spec_matches[node] = matching_specs
 
+        # built on first use, and kept up to date by _remove_node
+        self._children = None  # dict[PrefixRecord, set[PrefixRecord]]
+        self._descendants = {}  # dict[PrefixRecord, set[PrefixRecord]]
+        self._ancestors = {}  # dict[PrefixRecord, set[PrefixRecord]]
+
         self._toposort()
 
+    @property
+    def children(self):
+        """dict[PrefixRecord, set[PrefixRecord]]: The inverted graph; the nodes that
+        depend on each node."""
+        if self._children is None:
+            children = {node: set() for node in self.graph}
+            for node, parents in self.graph.items():
+                for parent in parents:
+                    children[parent].add(node)
+            self._children = children
+        return self._children
+
     def remove_spec(self, spec):
         """
         Remove all matching nodes, and any associated child nodes.
@@ -91,18 +114,10 @@ class PrefixGraph:
             tuple[PrefixRecord]: The removed nodes.
 
         """
-        graph = self.graph
+        children = self.children
         spec_matches = self.spec_matches
-        inverted_graph = {
-            node: {key for key in graph if node in graph[key]} for node in graph
-        }
-        youngest_nodes_with_specs = tuple(
-            node
-            for node, children in inverted_graph.items()
-            if not children and node in spec_matches
-        )
         removed_nodes = tuple(
-            filter(lambda node: node in youngest_nodes_with_specs, self.graph)
+            node for node in self.graph if not children[node] and node in spec_matches
         )
         for node in removed_nodes:
             self._remove_node(node)
@@ -120,25 +135,22 @@ class PrefixGraph:
             tuple[PrefixRecord]: The pruned nodes.
 
         """
-        graph = self.graph
+        children = self.children
         spec_matches = self.spec_matches
         original_order = tuple(self.graph)
 
+        # nodes are pruned once all their children are; the order they are
+        # removed in does not change which ones are
         removed_nodes = set()
-        while True:
-            inverted_graph = {
-                node: {key for key in graph if node in graph[key]} for node in graph
-            }
-            prunable_nodes = tuple(
-                node
-                for node, children in inverted_graph.items()
-                if not children and node not in spec_matches
-            )
-            if not prunable_nodes:
-                break
-            for node in prunable_nodes:
-                removed_nodes.add(node)
-                self._remove_node(node)
+        prunable_nodes = [node for node in original_order if not children[node]]
+        while prunable_nodes:
+            node = prunable_nodes.pop()
+            if node in removed_nodes or node in spec_matches or children[node]:
+                continue
+            removed_nodes.add(node)
+            parents = tuple(self.graph[node])
+            self._remove_node(node)
+            prunable_nodes.extend(parents)
 
         removed_nodes = tuple(
             filter(lambda node: node in removed_nodes, original_order)
@@ -150,49 +162,56 @@ class PrefixGraph:
         return next(rec for rec in self.graph if rec.name == name)
 
     def all_descendants(self, node):
-        graph = self.graph
-        inverted_graph = {
-            node: {key for key in graph if node in graph[key]} for node in graph
-        }
-
-        nodes = [node]
-        nodes_seen = set()
-        q = 0
-        while q < len(nodes):
-            for child_node in inverted_graph[nodes[q]]:
-                if child_node not in nodes_seen:
-                    nodes_seen.add(child_node)
-                    nodes.append(child_node)
-            q += 1
-        return tuple(filter(lambda node: node in nodes_seen, graph))
+        try:
+            descendants = self._descendants[node]
+        except KeyError:
+            descendants = self._descendants[node] = self._closure(node, self.children)
+        return tuple(filter(lambda node: node in descendants, self.graph))
 
     def all_ancestors(self, node):
-        graph = self.graph
+        try:
+            ancestors = self._ancestors[node]
+        except KeyError:
+            ancestors = self._ancestors[node] = self._closure(node, self.graph)
+        return tuple(filter(lambda node: node in ancestors, self.graph))
+
+    @staticmethod
+    def _closure(node, edges):
         nodes = [node]
         nodes_seen = set()
         q = 0
         while q < len(nodes):
-            for parent_node in graph[nodes[q]]:
-                if parent_node not in nodes_seen:
-                    nodes_seen.add(parent_node)
-                    nodes.append(parent_node)
+            for next_node in edges[nodes[q]]:
+                if next_node not in nodes_seen:
+                    nodes_seen.add(next_node)
+                    nodes.append(next_node)
             q += 1
-        return tuple(filter(lambda node: node in nodes_seen, graph))
+        return nodes_seen
 
     def _remove_node(self, node):
         """Removes this node and all edges referencing it."""
         graph = self.graph
         if node not in graph:
             raise KeyError(f"node {node} does not exist")
-        graph.pop(node)
+        parents = graph.pop(node)
         self.spec_matches.pop(node, None)
 
-        for node, edges in graph.items():
-            if node in edges:
-                edges.remove(node)
+        children = self.children
+        for child in children.pop(node):
+            if child is not node:
+                graph[child].discard(node)
+        for parent in parents:
+            if parent is not node:
+                children[parent].discard(node)
+
+        # only the closures that reached this node can change
+        for closures in (self._descendants, self._ancestors):
+            closures.pop(node, None)
+            for other in [other for other, nodes in closures.items() if node in nodes]:
+                del closures[other]
 
     def _toposort(self):
-        graph_copy = {node: IndexedSet(parents) for node, parents in self.graph.items()}
+        graph_copy = {node: set(parents) for node, parents in self.graph.items()}
         self._toposort_prepare_graph(graph_copy)
         if context.allow_cycles:
             sorted_nodes = tuple(self._topo_sort_handle_cycles(graph_copy))
@@ -204,28 +223,7 @@ class PrefixGraph:
 
     @classmethod
     def _toposort_raise_on_cycles(cls, graph):
-        if not graph:
-            return
-
-        while True:
-            no_parent_nodes = IndexedSet(
-                sorted(
-                    (node for node, parents in graph.items() if len(parents) == 0),
-                    key=lambda x: x.name,
-                )
-            )
-            if not no_parent_nodes:
-                break
-
-            for node in no_parent_nodes:
-                yield node
-                graph.pop(node, None)
-
-            for parents in graph.values():
-                parents -= no_parent_nodes
-
-        if len(graph) != 0:
-            raise CyclicalDependencyError(tuple(graph))
+        return cls._toposort_by_level(graph, break_cycles=False)
 
     @classmethod
     def _topo_sort_handle_cycles(cls, graph):
@@ -248,40 +246,61 @@ class PrefixGraph:
         )
         yield from disconnected_nodes
 
-        t = cls._toposort_raise_on_cycles(graph)
-
-        while True:
-            try:
-                value = next(t)
-                yield value
-            except CyclicalDependencyError as e:
-                # TODO: Turn this into a warning, but without being too annoying with
-                #       multiple messages.  See https://github.com/conda/conda/issues/4067
-                log.debug("%r", e)
-
-                yield cls._toposort_pop_key(graph)
-
-                t = cls._toposort_raise_on_cycles(graph)
-                continue
-
-            except StopIteration:
-                return
+        yield from cls._toposort_by_level(graph, break_cycles=True)
 
     @staticmethod
-    def _toposort_pop_key(graph):
+    def _toposort_by_level(graph, break_cycles):
         """
-        Pop an item from the graph that has the fewest parents.
-        In the case of a tie, use the node with the alphabetically-first package name.
+        Yield the nodes of ``graph`` parents first, in O(V + E) plus sorting.
+
+        Nodes are yielded in levels: first the nodes without parents, then the
+        nodes whose parents were all yielded in an earlier level, and so on,
+        each level sorted by name. When the remaining nodes only have cycles
+        left, either raise CyclicalDependencyError or, with ``break_cycles``,
+        yield the remaining node with the fewest parents left (the
+        alphabetically first of those) and carry on.
         """
-        node_with_fewest_parents = sorted(
-            (len(parents), node.dist_str(), node) for node, parents in graph.items()
-        )[0][2]
-        graph.pop(node_with_fewest_parents)
-
-        for parents in graph.values():
-            parents.discard(node_with_fewest_parents)
-
-        return node_with_fewest_parents
+        position = {node: i for i, node in enumerate(graph)}
+        children = {node: [] for node in graph}
+        parents_left = {}
+        for node, parents in graph.items():
+            parents_left[node] = len(parents)
+            for parent in parents:
+                if parent in children:
+                    children[parent].append(node)
+
+        def level_order(node):
+            return node.name, position[node]
+
+        done = set()
+        level = sorted(
+            (node for node in graph if not parents_left[node]), key=level_order
+        )
+        while len(done) < len(graph):
+            if not level:
+                remaining = tuple(node for node in graph if node not in done)
+                error = CyclicalDependencyError(remaining)
+                if not break_cycles:
+                    raise error
+                # TODO: Turn this into a warning, but without being too annoying with
+                #       multiple messages.  See https://github.com/conda/conda/issues/4067
+                log.debug("%r", error)
+                level = [
+                    min(
+                        remaining,
+                        key=lambda node: (parents_left[node], node.dist_str()),
+                    )
+                ]
+
+            next_level = []
+            for node in level:
+                yield node
+                done.add(node)
+                for child in children[node]:
+                    parents_left[child] -= 1
+                    if not parents_left[child] and child not in done:
+                        next_level.append(child)
+            level = sorted(next_level, key=level_order)
 
     @staticmethod
     def _toposort_prepare_graph(graph):
@@ -16,6 +16,7 @@ Object inheritance:
 from __future__ import annotations
 
 from os.path import basename, join
+from sys import intern
 
 from boltons.timeutils import dt_to_timestamp, isoparse
 
@@ -475,11 +476,54 @@ class PackageRecord(DictSafeMixin, Entity):
         #              channel_name/subdir:namespace:name-version-build_number-build_string
         return f"{self.channel.name}/{self.subdir}::{self.name}-{self.version}-{self.build}"
 
-    metadata: set[str]
+    @property
+    def metadata(self) -> set[str]:
+        """set[str]: Notes about the record, e.g. from signature verification."""
+        try:
+            return self._metadata
+        except AttributeError:
+            # created on demand, most records never get any
+            self._metadata = set()
+            return self._metadata
+
+    #: Fields of repodata records that are rarely used, and only boxed on first access.
+    _repodata_deferred_fields = frozenset(
+        (
+            "arch",
+            "constrains",
+            "date",
+            "features",
+            "legacy_bz2_md5",
+            "legacy_bz2_size",
+            "license",
+            "license_family",
+            "platform",
+            "preferred_env",
+            "timestamp",
+            "track_features",
+        )
+    )
+    #: Fields of repodata records with few distinct values, which are interned.
+    _repodata_interned_fields = ("name", "version", "license", "license_family")
+
+    @classmethod
+    def from_repodata(cls, info: dict) -> PackageRecord:
+        """Create a record from a repodata ``packages`` or ``packages.conda`` entry.
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.metadata = set()
+        Equivalent to ``cls(**info)``, but cheaper to build and smaller in memory for the
+        many records of a channel that are never looked at closely: rarely used fields
+        are boxed on first access, and repeated strings (including the specs in
+        ``depends`` and ``constrains``) are shared between records.  ``info`` is modified.
+        """
+        for key in cls._repodata_interned_fields:
+            val = info.get(key)
+            if val.__class__ is str:
+                info[key] = intern(val)
+        for key in ("depends", "constrains"):
+            specs = info.get(key)
+            if specs:
+                info[key] = [intern(spec) for spec in specs]
+        return cls.load_deferred(info, cls._repodata_deferred_fields)
 
     @classmethod
     def feature(cls, feature_name) -> PackageRecord:
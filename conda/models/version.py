@@ -13,9 +13,12 @@ from __future__ import annotations
 
 import operator as op
 import re
+from bisect import bisect_left
+from functools import cmp_to_key
 from itertools import zip_longest
 from logging import getLogger
 
+from ..common.cache import InterningCache
 from ..exceptions import InvalidVersionSpec
 
 log = getLogger(__name__)
@@ -40,11 +43,17 @@ class SingleStrArgCachingType(type):
         if isinstance(arg, cls):
             return arg
         elif isinstance(arg, str):
+            cache = cls._cache_
             try:
-                return cls._cache_[arg]
+                val = cache.entries[arg]
             except KeyError:
-                val = cls._cache_[arg] = super().__call__(arg)
-                return val
+                try:
+                    val = cache.promote(arg)
+                except KeyError:
+                    val = cache[arg] = super().__call__(arg)
+            else:
+                cache.hits += 1
+            return val
         else:
             return super().__call__(arg)
 
@@ -154,7 +163,7 @@ class VersionOrder(metaclass=SingleStrArgCachingType):
       1.0.1_ < 1.0.1a =>  True   # ensure correct ordering for openssl
     """
 
-    _cache_ = {}
+    _cache_ = InterningCache()
 
     def __init__(self, vstr: str):
         # version comparison is case-insensitive
@@ -454,6 +463,165 @@ OPERATOR_MAP = {
 OPERATOR_START = frozenset(("=", "<", ">", "!", "~"))
 
 
+# kinds of `VersionCut`, in the order they sort for a shared version
+CUT_BOTTOM = 0
+CUT_BELOW = 1
+CUT_ABOVE = 2
+CUT_BELOW_PREFIX = 3
+CUT_ABOVE_PREFIX = 4
+CUT_TOP = 5
+
+
+class IncomparableCuts(Exception):
+    """The relative order of two `VersionCut` objects can't be determined."""
+
+
+class VersionCut:
+    """
+    An endpoint of a version interval: a position in the `VersionOrder`
+    order that lies between versions.
+
+    ``CUT_BELOW`` and ``CUT_ABOVE`` cuts lie just below and just above
+    ``version``; ``CUT_BELOW_PREFIX`` and ``CUT_ABOVE_PREFIX`` cuts lie below
+    and above every version that starts with ``version``, which is a
+    contiguous block in the order. ``CUT_BOTTOM`` and ``CUT_TOP`` lie below
+    and above all versions.
+    """
+
+    __slots__ = ("kind", "version")
+
+    def __init__(self, kind: int, version: VersionOrder | None = None):
+        self.kind = kind
+        self.version = version
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.kind}, {self.version!r})"
+
+    def is_above(self, vo: VersionOrder) -> bool:
+        """Whether the version ``vo`` lies above this cut."""
+        kind = self.kind
+        if kind == CUT_BELOW:
+            return not vo < self.version
+        elif kind == CUT_ABOVE:
+            return self.version < vo
+        elif kind == CUT_BOTTOM:
+            return True
+        elif kind == CUT_TOP:
+            return False
+        elif vo.startswith(self.version):
+            return kind == CUT_BELOW_PREFIX
+        return self.version < vo
+
+    # lets bisect_left() count the cuts below a version
+    __lt__ = is_above
+
+
+def compare_cuts(a: VersionCut, b: VersionCut) -> int:
+    """
+    Return -1, 0 or 1 as the cut ``a`` lies below, at or above ``b``.
+
+    :raises IncomparableCuts: for prefix cuts of nested, but different, blocks,
+        e.g. ``=1.1`` and ``=1.1.2``, whose relative order depends on which
+        versions exist.
+    """
+    a_kind, b_kind = a.kind, b.kind
+    if a_kind in (CUT_BOTTOM, CUT_TOP) or b_kind in (CUT_BOTTOM, CUT_TOP):
+        a_rank = {CUT_BOTTOM: -1, CUT_TOP: 1}.get(a_kind, 0)
+        b_rank = {CUT_BOTTOM: -1, CUT_TOP: 1}.get(b_kind, 0)
+        return (a_rank > b_rank) - (a_rank < b_rank)
+    a_prefix = a_kind >= CUT_BELOW_PREFIX
+    b_prefix = b_kind >= CUT_BELOW_PREFIX
+    if a_prefix and b_prefix:
+        if a.version.norm_version == b.version.norm_version:
+            return (a_kind > b_kind) - (a_kind < b_kind)
+        elif a.version.startswith(b.version) or b.version.startswith(a.version):
+            raise IncomparableCuts(a, b)
+    elif a_prefix:
+        return -compare_cuts(b, a)
+    elif b_prefix:
+        if a.version.startswith(b.version):
+            return 1 if b_kind == CUT_BELOW_PREFIX else -1
+    elif a.version == b.version:
+        return (a_kind > b_kind) - (a_kind < b_kind)
+    return -1 if a.version < b.version else 1
+
+
+_cut_key = cmp_to_key(compare_cuts)
+
+
+def union_intervals(intervals):
+    """
+    Normalize ``(low cut, high cut)`` intervals into a sorted tuple of
+    disjoint intervals covering the same versions.
+    """
+    result = []
+    for low, high in sorted(intervals, key=lambda interval: _cut_key(interval[0])):
+        if result and compare_cuts(low, result[-1][1]) <= 0:
+            if compare_cuts(high, result[-1][1]) > 0:
+                result[-1] = (result[-1][0], high)
+        else:
+            result.append((low, high))
+    return tuple(result)
+
+
+def intersect_intervals(a, b):
+    """Intersect two normalized interval tuples."""
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        (a_low, a_high), (b_low, b_high) = a[i], b[j]
+        low = a_low if compare_cuts(a_low, b_low) >= 0 else b_low
+        if compare_cuts(a_high, b_high) <= 0:
+            high = a_high
+            i += 1
+        else:
+            high = b_high
+            j += 1
+        if compare_cuts(low, high) < 0:
+            result.append((low, high))
+    return tuple(result)
+
+
+ALL_VERSIONS = ((VersionCut(CUT_BOTTOM), VersionCut(CUT_TOP)),)
+
+
+def operator_intervals(operator_str, vo):
+    """The normalized intervals matched by ``<operator_str><vo>``."""
+    bottom, top = ALL_VERSIONS[0]
+    if operator_str == "==":
+        return ((VersionCut(CUT_BELOW, vo), VersionCut(CUT_ABOVE, vo)),)
+    elif operator_str == "!=":
+        return (
+            (bottom, VersionCut(CUT_BELOW, vo)),
+            (VersionCut(CUT_ABOVE, vo), top),
+        )
+    elif operator_str == "<":
+        return ((bottom, VersionCut(CUT_BELOW, vo)),)
+    elif operator_str == "<=":
+        return ((bottom, VersionCut(CUT_ABOVE, vo)),)
+    elif operator_str == ">":
+        return ((VersionCut(CUT_ABOVE, vo), top),)
+    elif operator_str == ">=":
+        return ((VersionCut(CUT_BELOW, vo), top),)
+    elif operator_str == "=":
+        return ((VersionCut(CUT_BELOW_PREFIX, vo), VersionCut(CUT_ABOVE_PREFIX, vo)),)
+    elif operator_str == "!=startswith":
+        return (
+            (bottom, VersionCut(CUT_BELOW_PREFIX, vo)),
+            (VersionCut(CUT_ABOVE_PREFIX, vo), top),
+        )
+    elif operator_str == "~=":
+        try:
+            prefix = VersionOrder(".".join(str(vo).split(".")[:-1]))
+        except InvalidVersionSpec:
+            # compatible_release_operator() raises when matching, too
+            return None
+        return intersect_intervals(
+            operator_intervals(">=", vo), operator_intervals("=", prefix)
+        )
+    return None
+
+
 class BaseSpec:
     def __init__(self, spec_str, matcher, is_exact):
         self.spec_str = spec_str
@@ -512,17 +680,54 @@ class BaseSpec:
     def exact_match(self, spec_str):
         return self.spec == spec_str
 
+    def interval_match(self, spec_str):
+        # an odd number of cuts below the version puts it inside an interval
+        below = bisect_left(self._cuts, VersionOrder(str(spec_str)))
+        return (below + self._cuts_offset) % 2 == 1
+
     def always_true_match(self, spec_str):
         return True
 
 
 class VersionSpec(BaseSpec, metaclass=SingleStrArgCachingType):
-    _cache_ = {}
+    """
+    A version constraint such as ``>=1.2,<2|3.1.*``.
+
+    Where possible, the spec is compiled into `intervals`: a normalized tuple
+    of disjoint ``(low, high)`` `VersionCut` pairs covering the versions it
+    matches, so matching is a binary search and `merge` intersects intervals.
+    Specs using regexes, inner ``*`` wildcards, ``@`` or otherwise
+    incomparable endpoints have ``intervals`` of None and match as before.
+    """
+
+    _cache_ = InterningCache()
 
     def __init__(self, vspec):
+        self.intervals = None
+        self._tup_operator = None
         vspec_str, matcher, is_exact = self.get_matcher(vspec)
+        if self.intervals is not None and matcher in (self.any_match, self.all_match):
+            # a single operator is already one comparison; match compound
+            # specs with one binary search over their interval endpoints
+            cuts = [cut for interval in self.intervals for cut in interval]
+            self._cuts_offset = 0
+            if cuts and cuts[0].kind == CUT_BOTTOM:
+                del cuts[0]
+                self._cuts_offset = 1
+            if cuts and cuts[-1].kind == CUT_TOP:
+                del cuts[-1]
+            self._cuts = tuple(cuts)
+            if not cuts and self._cuts_offset:
+                matcher = self.always_true_match
+            else:
+                matcher = self.interval_match
         super().__init__(vspec_str, matcher, is_exact)
 
+    @property
+    def is_empty(self):
+        """Whether the spec is known to match no version at all."""
+        return self.intervals == ()
+
     def get_matcher(self, vspec):
         if isinstance(vspec, str) and regex_split_re.match(vspec):
             vspec = treeify(vspec)
@@ -531,8 +736,32 @@ class VersionSpec(BaseSpec, metaclass=SingleStrArgCachingType):
             vspec_tree = vspec
             _matcher = self.any_match if vspec_tree[0] == "|" else self.all_match
             tup = tuple(VersionSpec(s) for s in vspec_tree[1:])
-            vspec_str = untreeify((vspec_tree[0],) + tuple(t.spec for t in tup))
+            # an "|" sub-expression under "," keeps its parentheses, or the
+            # string would parse back into a looser spec
+            vspec_str = untreeify(
+                (vspec_tree[0],)
+                + tuple(
+                    f"({t.spec})"
+                    if vspec_tree[0] == "," and t._tup_operator == "|"
+                    else t.spec
+                    for t in tup
+                )
+            )
             self.tup = tup
+            self._tup_operator = vspec_tree[0]
+            if all(t.intervals is not None for t in tup):
+                try:
+                    if vspec_tree[0] == "|":
+                        self.intervals = union_intervals(
+                            interval for t in tup for interval in t.intervals
+                        )
+                    else:
+                        intervals = ALL_VERSIONS
+                        for t in tup:
+                            intervals = intersect_intervals(intervals, t.intervals)
+                        self.intervals = intervals
+                except IncomparableCuts:
+                    pass
             matcher = _matcher
             is_exact = False
             return vspec_str, matcher, is_exact
@@ -571,9 +800,11 @@ class VersionSpec(BaseSpec, metaclass=SingleStrArgCachingType):
             except KeyError:
                 raise InvalidVersionSpec(vspec_str, f"invalid operator: {operator_str}")
             self.matcher_vo = VersionOrder(vo_str)
+            self.intervals = operator_intervals(operator_str, self.matcher_vo)
             matcher = self.operator_match
             is_exact = operator_str == "=="
         elif vspec_str == "*":
+            self.intervals = ALL_VERSIONS
             matcher = self.always_true_match
             is_exact = False
         elif "*" in vspec_str.rstrip("*"):
@@ -600,11 +831,13 @@ class VersionSpec(BaseSpec, metaclass=SingleStrArgCachingType):
             vo_str = vspec_str.rstrip("*").rstrip(".")
             self.operator_func = VersionOrder.startswith
             self.matcher_vo = VersionOrder(vo_str)
+            self.intervals = operator_intervals("=", self.matcher_vo)
             matcher = self.operator_match
             is_exact = False
         elif "@" not in vspec_str:
             self.operator_func = OPERATOR_MAP["=="]
             self.matcher_vo = VersionOrder(vspec_str)
+            self.intervals = operator_intervals("==", self.matcher_vo)
             matcher = self.operator_match
             is_exact = True
         else:
@@ -614,7 +847,10 @@ class VersionSpec(BaseSpec, metaclass=SingleStrArgCachingType):
 
     def merge(self, other):
         assert isinstance(other, self.__class__)
-        return self.__class__(",".join(sorted((self.raw_value, other.raw_value))))
+        # built from the specs themselves rather than a joined string, which
+        # would need parentheses around nested "|" expressions
+        specs = sorted((self, other), key=lambda spec: spec.raw_value)
+        return self.__class__((",", *specs))
 
     def union(self, other):
         assert isinstance(other, self.__class__)
@@ -629,7 +865,7 @@ VersionMatch = VersionSpec
 
 
 class BuildNumberMatch(BaseSpec, metaclass=SingleStrArgCachingType):
-    _cache_ = {}
+    _cache_ = InterningCache()
 
     def __init__(self, vspec):
         vspec_str, matcher, is_exact = self.get_matcher(vspec)
@@ -702,3 +938,24 @@ class BuildNumberMatch(BaseSpec, metaclass=SingleStrArgCachingType):
 
     def __repr__(self):
         return str(self.spec)
+
+
+def set_cache_size(maxsize: int | None) -> None:
+    """
+    Bound the caches of `VersionOrder`, `VersionSpec` and `BuildNumberMatch`
+    objects to ``maxsize`` entries each, or None for unbounded caches (the
+    default).
+
+    Long-lived processes that load a lot of repodata can bound the caches to
+    release the objects of versions that are no longer used.
+    """
+    for cls in (VersionOrder, VersionSpec, BuildNumberMatch):
+        cls._cache_.resize(maxsize)
+
+
+def cache_stats() -> dict[str, dict[str, int | None]]:
+    """Return the hits, misses, size and maxsize of each cache, by class name."""
+    return {
+        cls.__name__: cls._cache_.stats()
+        for cls in (VersionOrder, VersionSpec, BuildNumberMatch)
+    }
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import copy
 import itertools
+from bisect import bisect_left
 from collections import defaultdict, deque
 from functools import lru_cache
 from logging import DEBUG, getLogger
@@ -24,6 +25,7 @@ from .common.iterators import groupby_to_dict as groupby
 from .common.logic import (
     TRUE,
     Clauses,
+    PortfolioSatSolver,
     PycoSatSolver,
     PyCryptoSatSolver,
     PySatSolver,
@@ -40,7 +42,7 @@ from .models.channel import Channel, MultiChannel
 from .models.enums import NoarchType, PackageType
 from .models.match_spec import MatchSpec
 from .models.records import PackageRecord
-from .models.version import VersionOrder
+from .models.version import VersionOrder, VersionSpec
 
 try:
     from frozendict import frozendict
@@ -58,6 +60,7 @@ _sat_solvers = {
     SatSolverChoice.PYCOSAT: PycoSatSolver,
     SatSolverChoice.PYCRYPTOSAT: PyCryptoSatSolver,
     SatSolverChoice.PYSAT: PySatSolver,
+    SatSolverChoice.PORTFOLIO: PortfolioSatSolver,
 }
 
 
@@ -116,6 +119,23 @@ def exactness_and_number_of_deps(resolve_obj, ms):
     return value
 
 
+def _rank_versions(versions):
+    """
+    Return dense integer ranks of version strings, in `VersionOrder`; versions
+    that compare equal, like 1.0 and 1.0.0, have the same rank.
+    """
+    ranks = {}
+    rank = -1
+    previous = None
+    for version in sorted(versions, key=VersionOrder):
+        order = VersionOrder(version)
+        if previous is None or previous < order:
+            rank += 1
+        ranks[version] = rank
+        previous = order
+    return ranks
+
+
 class Resolve:
     def __init__(self, index, processed=False, channels=()):
         self.index = index
@@ -157,6 +177,16 @@ class Resolve:
             )
         }
 
+        self._version_keys = {}  # dict[PackageRecord, list]
+        # dict[package_name, dict[version, int]]
+        self._version_ranks = {
+            name: _rank_versions({prec.get("version", "") for prec in group})
+            for name, group in groups.items()
+        }
+        # dict[package_name, tuple[list[VersionOrder], list[rank]]], sorted; built
+        # on demand to rank versions that are not in the index
+        self._version_orders = {}
+
         # sorting these in reverse order is effectively prioritizing
         # constraint behavior from newer packages. It is applying broadening
         # reduction based on the latest packages, which may reduce the space
@@ -402,6 +432,32 @@ class Resolve:
             ]
         return classes
 
+    @staticmethod
+    def _disjoint_version_specs(specs):
+        """Find the groups of same-name specs whose versions can't all match at once.
+
+        Args:
+            specs: An iterable of MatchSpec objects.
+
+        Returns:
+            A list of sorted spec lists, one per package name; e.g.
+            ``[[numpy 1.5*, numpy >=1.6]]``. Optional specs are ignored.
+        """
+        by_name = defaultdict(list)
+        for spec in specs:
+            if not spec.optional and isinstance(spec.version, VersionSpec):
+                by_name[spec.name].append(spec)
+        disjoint = []
+        for name, group in by_name.items():
+            if "*" in name:
+                continue
+            version = group[0].version
+            for spec in group[1:]:
+                version = version.merge(spec.version)
+            if version.is_empty:
+                disjoint.append(sorted(group, key=str))
+        return disjoint
+
     def find_matches_with_strict(self, ms, strict_channel_priority):
         matches = self.find_matches(ms)
         if not strict_channel_priority:
@@ -521,6 +577,14 @@ class Resolve:
         specs = set(specs) | (specs_to_add or set())
         # Remove virtual packages
         specs = {spec for spec in specs if not spec.name.startswith("__")}
+        disjoint = self._disjoint_version_specs(specs)
+        if disjoint:
+            # specs whose version ranges don't intersect conflict on their own,
+            # without looking at any dependencies
+            chains = [[spec] for group in disjoint for spec in group]
+            return self._classify_bad_deps(
+                chains, specs_to_add, history_specs, strict_channel_priority
+            )
         if len(specs) == 1:
             matches = self.find_matches(next(iter(specs)))
             if len(matches) == 1:
@@ -914,7 +978,7 @@ class Resolve:
         else:
             candidate_precs = self.index.values()
 
-        res = tuple(p for p in candidate_precs if spec.match(p))
+        res = tuple(spec.filter(candidate_precs))
         self._cached_find_matches[spec] = res
         return res
 
@@ -927,12 +991,15 @@ class Resolve:
         return deps
 
     def version_key(self, prec, vtype=None):
+        vkey = self._version_keys.get(prec)
+        if vkey is not None:
+            return vkey
         channel = prec.channel
         channel_priority = self._channel_priorities_map.get(
             channel.name, 1
         )  # TODO: ask @mcg1969 why the default value is 1 here  # NOQA
         valid = 1 if channel_priority < MAX_CHANNEL_PRIORITY else 0
-        version_comparator = VersionOrder(prec.get("version", ""))
+        version_comparator = self._version_rank(prec)
         build_number = prec.get("build_number", 0)
         build_string = prec.get("build")
         noarch = -int(prec.subdir == "noarch")
@@ -944,8 +1011,49 @@ class Resolve:
             vkey.append(build_string)
         else:
             vkey.extend((prec.get("timestamp", 0), build_string))
+        self._version_keys[prec] = vkey
         return vkey
 
+    def _version_rank(self, prec):
+        """
+        The rank of a record's version among the versions of its package name;
+        compares like its `VersionOrder`, but as a number.
+        """
+        version = prec.get("version", "")
+        ranks = self._version_ranks.setdefault(prec.name, {})
+        rank = ranks.get(version)
+        if rank is not None:
+            return rank
+
+        # A record that is not in the index. Give it a rank between its
+        # neighbours instead of renumbering, since existing ranks may already be
+        # part of keys in self._version_keys or of a sort in progress.
+        orders = self._version_orders.get(prec.name)
+        if orders is None:
+            by_rank = {r: VersionOrder(v) for v, r in ranks.items()}
+            orders = self._version_orders[prec.name] = (
+                [by_rank[r] for r in sorted(by_rank)],
+                sorted(by_rank),
+            )
+        version_orders, version_ranks = orders
+        order = VersionOrder(version)
+        i = bisect_left(version_orders, order)
+        if i < len(version_orders) and version_orders[i] == order:
+            rank = version_ranks[i]
+        else:
+            lower = version_ranks[i - 1] if i else None
+            upper = version_ranks[i] if i < len(version_ranks) else None
+            if lower is None:
+                rank = 0 if upper is None else upper - 1
+            elif upper is None:
+                rank = lower + 1
+            else:
+                rank = (lower + upper) / 2
+            version_orders.insert(i, order)
+            version_ranks.insert(i, rank)
+        ranks[version] = rank
+        return rank
+
     @staticmethod
     def _make_channel_priorities(channels):
         priorities_map = {}
@@ -1031,7 +1139,10 @@ class Resolve:
 
     @time_recorder(module_name=__name__)
     def gen_clauses(self):
-        C = Clauses(sat_solver=_get_sat_solver_cls(context.sat_solver))
+        C = Clauses(
+            sat_solver=_get_sat_solver_cls(context.sat_solver),
+            incremental="incremental_sat" in context.experimental,
+        )
         for name, group in self.groups.items():
             group = [self.to_sat_name(prec) for prec in group]
             # Create one variable for each package
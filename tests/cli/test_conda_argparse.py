@@ -113,3 +113,11 @@ def test_imports(path: str, validate: Callable[[Any], bool]):
     module = importlib.import_module(path)
     assert hasattr(module, attr)
     assert validate(getattr(module, attr))
+
+
+@pytest.mark.parametrize(
+    "feature", ["dedup_store", "package_cache_index", "stream_extract"]
+)
+def test_experimental_choices(feature: str):
+    args = generate_parser().parse_args(["install", f"--experimental={feature}", "x"])
+    assert args.experimental == [feature]
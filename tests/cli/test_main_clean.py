@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime
 from logging import WARN
 from pathlib import Path
@@ -14,10 +15,14 @@ from conda.base.constants import (
     CONDA_LOGS_DIR,
     CONDA_PACKAGE_EXTENSIONS,
     CONDA_TEMP_EXTENSIONS,
+    PACKAGE_CACHE_INDEX_FILE,
+    PACKAGE_CACHE_STORE_DIR,
 )
-from conda.cli.main_clean import _get_size
+from conda.base.context import reset_context
+from conda.cli.main_clean import _get_size, find_pkgs
 from conda.core.subdir_data import create_cache_dir
 from conda.gateways.logging import set_log_level
+from tests.core.test_package_cache_data import make_cache_entry
 
 if TYPE_CHECKING:
     from typing import Iterable
@@ -185,6 +190,90 @@ def test_clean_index_cache(
     assert not _get_index_cache()
 
 
+# conda clean --index-cache, with package cache indexes
+def test_clean_index_cache_rebuilds_package_cache_index(
+    clear_cache,
+    test_recipes_channel: Path,
+    conda_cli: CondaCLIFixture,
+    tmp_env: TmpEnvFixture,
+    tmp_pkgs_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setenv("CONDA_EXPERIMENTAL", "package_cache_index")
+    reset_context()
+    pkg = "small-executable"
+    index_path = tmp_pkgs_dir / PACKAGE_CACHE_INDEX_FILE
+
+    with tmp_env(pkg):
+        index_path.write_text("{}")
+
+        stdout, _, _ = conda_cli("clean", "--index-cache", "--yes", "--json")
+        json.loads(stdout)  # assert valid json
+
+        # repodata caches are cleared, the package cache index is rebuilt
+        assert _get_index_cache() == [index_path]
+        entries = json.loads(index_path.read_text())["entries"]
+        assert has_pkg(pkg, entries)
+
+
+# conda clean --packages, with a content store
+def test_clean_packages_content_store(
+    tmp_pkgs_dir: Path,
+    tmp_path: Path,
+    conda_cli: CondaCLIFixture,
+):
+    store = tmp_pkgs_dir / PACKAGE_CACHE_STORE_DIR
+    (store / "00").mkdir(parents=True)
+    (store / "11").mkdir()
+    shared = store / "00" / "shared-644"
+    shared.write_text("shared")
+    only_unused = store / "11" / "only-unused-644"
+    only_unused.write_text("only unused")
+
+    for pkg in ("unused-1.0-0", "used-1.0-0"):
+        (tmp_pkgs_dir / pkg / "info").mkdir(parents=True)
+        os.link(shared, tmp_pkgs_dir / pkg / "LICENSE")
+    os.link(only_unused, tmp_pkgs_dir / "unused-1.0-0" / "lib")
+    (tmp_pkgs_dir / "used-1.0-0" / "bin").write_text("linked into an environment")
+    os.link(tmp_pkgs_dir / "used-1.0-0" / "bin", tmp_path / "bin")
+
+    # links within the package cache do not mark a package as used
+    assert find_pkgs()["pkgs_dirs"] == {str(tmp_pkgs_dir): ("unused-1.0-0",)}
+
+    stdout, _, _ = conda_cli("clean", "--packages", "--yes", "--json")
+    assert json.loads(stdout)["content_store"] == {"files": [str(only_unused)]}
+    assert not (tmp_pkgs_dir / "unused-1.0-0").exists()
+    assert (tmp_pkgs_dir / "used-1.0-0").exists()
+    assert not only_unused.exists()
+    assert shared.exists()
+
+
+# conda clean --lru
+def test_clean_lru(
+    tmp_pkgs_dir: Path,
+    conda_cli: CondaCLIFixture,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    old = make_cache_entry(tmp_pkgs_dir, "old", 1000, age_days=30)
+    tarball = tmp_pkgs_dir / f"{old.name}.conda"
+    tarball.write_bytes(b"0" * 500)
+    os.utime(tarball, ns=(old.stat().st_mtime_ns,) * 2)
+    new = make_cache_entry(tmp_pkgs_dir, "new", 1000, age_days=0)
+
+    stdout, _, _ = conda_cli("clean", "--lru", "--yes", "--json")
+    assert json.loads(stdout)["lru"]["pkg_sizes"] == {}
+
+    monkeypatch.setenv("CONDA_PKGS_MAX_AGE", "7")
+    reset_context()
+    stdout, _, _ = conda_cli("clean", "--lru", "--yes", "--json")
+    assert json.loads(stdout)["lru"]["pkgs_dirs"] == {
+        str(tmp_pkgs_dir): [old.name, f"{old.name}.conda"]
+    }
+    assert not old.exists()
+    assert not tarball.exists()
+    assert new.exists()
+
+
 # conda clean --tempfiles
 def test_clean_tempfiles(
     clear_cache,
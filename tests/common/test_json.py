@@ -0,0 +1,152 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+from __future__ import annotations
+
+import json
+import time
+from collections import defaultdict
+from enum import IntEnum
+from hashlib import sha256
+from pathlib import Path
+
+import pytest
+
+from conda.common import serialize
+from conda.common.serialize import JSON_BACKENDS, json_dump, json_load
+from conda.core.prefix_data import PrefixData
+from conda.gateways.disk.create import write_as_json_to_file
+from conda.models.enums import LinkType, PathType, Platform
+from conda.models.records import PackageRecord, PathDataV1, PathsData, PrefixRecord
+
+needs_orjson = pytest.mark.skipif(
+    "orjson" not in JSON_BACKENDS, reason="orjson is not installed"
+)
+
+
+class Level(IntEnum):
+    high = 3
+
+
+@needs_orjson
+@pytest.mark.parametrize(
+    "obj",
+    [
+        {},
+        [],
+        "text",
+        42,
+        {"nested": {"list": [1, 2.5, True, None, ("tuple", 0)], "empty": {}}},
+        {"enums": [PathType.hardlink, LinkType.copy, Platform.linux, Level.high]},
+        {"path": Path("/opt/conda"), "b": 1, "a": 2},
+        {"floats": [1e16, 1.5e-05, 0.1, -0.0]},
+        {"nan": float("nan"), "inf": float("inf")},
+        {"unicode": "café  ", "del": "\x7f", "control": "\x1f\b\n\t"},
+        {1: "int key", 2: "int key"},
+        {"big": 2**70},
+        PackageRecord(name="a", version="1.0", build="0", build_number=0),
+    ],
+)
+def test_json_dump_backends_identical(obj):
+    assert JSON_BACKENDS["orjson"][1](obj) == JSON_BACKENDS["json"][1](obj)
+
+
+@needs_orjson
+def test_json_dump_unserializable():
+    for _, dump in JSON_BACKENDS.values():
+        with pytest.raises(TypeError):
+            dump({"set": {1, 2}})
+
+
+@needs_orjson
+@pytest.mark.parametrize(
+    "document",
+    [
+        '{"a": [1, 2.5, null, true]}',
+        b'{"a": "caf\xc3\xa9"}',
+        "[NaN, Infinity]",
+        "[1e400]",
+        f"[{2**70}]",
+        f"[{2**70}]".encode(),
+    ],
+)
+def test_json_load_backends_identical(document):
+    stdlib = JSON_BACKENDS["json"][0](document)
+    # NaN != NaN, so compare the dumped documents
+    assert json.dumps(JSON_BACKENDS["orjson"][0](document)) == json.dumps(stdlib)
+
+
+@pytest.mark.parametrize("backend", JSON_BACKENDS)
+def test_json_load_invalid(backend, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(serialize, "JSON_BACKEND", backend)
+    with pytest.raises(json.JSONDecodeError):
+        json_load('{"a": ')
+    with pytest.raises(UnicodeDecodeError):
+        json_load(b'{"a": "\xff"}')
+
+
+def make_prefix_records(count: int) -> list[PrefixRecord]:
+    return [
+        PrefixRecord(
+            name=f"package-{i}",
+            version=f"1.{i}",
+            build="py_0",
+            build_number=0,
+            channel="conda-forge",
+            subdir="noarch",
+            fn=f"package-{i}-1.{i}-py_0.conda",
+            url=f"https://conda.anaconda.org/conda-forge/noarch/package-{i}-1.{i}-py_0.conda",
+            depends=["python >=3.8", f"package-{i - 1}"] if i else ["python >=3.8"],
+            files=[f"lib/package_{i}/module{j}.py" for j in range(50)],
+            paths_data=PathsData(
+                paths_version=1,
+                paths=[
+                    PathDataV1(
+                        _path=f"lib/package_{i}/module{j}.py",
+                        path_type=PathType.hardlink,
+                        sha256=sha256(f"{i}/{j}".encode()).hexdigest(),
+                        size_in_bytes=1024,
+                    )
+                    for j in range(50)
+                ],
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.benchmark
+def test_json_backends_large_environment(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Load conda-meta and dump `conda list --json`/`conda search --json` output."""
+    records = make_prefix_records(500)
+    (tmp_path / "conda-meta").mkdir()
+    for prec in records:
+        write_as_json_to_file(
+            tmp_path / "conda-meta" / f"{prec.name}-{prec.version}-{prec.build}.json",
+            prec.dump(),
+        )
+    search = defaultdict(list)
+    for prec in records:
+        search[prec.name].append(prec)
+
+    results = {}
+    for backend in JSON_BACKENDS:
+        monkeypatch.setattr(serialize, "JSON_BACKEND", backend)
+        start = time.perf_counter()
+        prefix_data = PrefixData(tmp_path, pip_interop_enabled=False).reload()
+        loaded = list(prefix_data.iter_records())
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        output = (
+            json_dump([prec.dist_fields_dump() for prec in loaded]),
+            json_dump(search),
+        )
+        dump_time = time.perf_counter() - start
+        print(f"{backend}: load {load_time:.3f}s, dump {dump_time:.3f}s")
+        results[backend] = (sorted(loaded, key=lambda prec: prec.name), output)
+
+    stdlib = results.pop("json")
+    assert len(stdlib[0]) == len(records)
+    for backend_result in results.values():
+        assert backend_result == stdlib
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import copy
+import os
 import platform
 from logging import getLogger
 from pathlib import Path
@@ -12,11 +13,19 @@ import pytest
 
 import conda
 from conda.base.constants import DEFAULT_CHANNELS
-from conda.base.context import context, non_x86_machines, reset_context
+from conda.base.context import (
+    conda_tests_ctxt_mgmt_def_pol,
+    context,
+    non_x86_machines,
+    reset_context,
+)
 from conda.common.compat import on_linux, on_mac, on_win
 from conda.common.io import env_vars
 from conda.core.index import (
+    REDUCED_INDEX_CACHE_DIR,
     Index,
+    ReducedIndex,
+    ReducedIndexCache,
     _make_virtual_package,
     _supplement_index_with_cache,
     _supplement_index_with_prefix,
@@ -29,6 +38,7 @@ from conda.core.index import (
     get_reduced_index,
 )
 from conda.core.prefix_data import PrefixData
+from conda.core.subdir_data import SubdirData
 from conda.exceptions import ChannelDenied, ChannelNotAllowed, OperationNotAllowed
 from conda.models.channel import Channel
 from conda.models.enums import PackageType
@@ -337,6 +347,49 @@ def test_fetch_index(test_recipes_channel):
     assert len(idx) == 20
 
 
+def test_reduced_index_cache(test_recipes_channel, tmp_pkgs_dir, mocker):
+    channels = (Channel(str(test_recipes_channel)),)
+    specs = (MatchSpec("another_dependent"),)
+    cache_dir = tmp_pkgs_dir / "cache" / REDUCED_INDEX_CACHE_DIR
+    SubdirData.clear_cached_local_channel_data()
+    with env_vars(
+        {"CONDA_EXPERIMENTAL": "reduced_index"},
+        stack_callback=conda_tests_ctxt_mgmt_def_pol,
+    ):
+        expected = ReducedIndex(specs, channels, prepend=False)
+        assert len(list(cache_dir.glob("*.json"))) == 1
+
+        retrieve = mocker.spy(ReducedIndex, "_retrieve_all_from_channels")
+        cached = ReducedIndex(specs, channels, prepend=False)
+        assert not retrieve.called
+        assert list(cached.data) == list(expected.data)
+        assert {prec.name for prec in cached.data} >= {
+            "another_dependent",
+            "dependent",
+            "dependency",
+        }
+
+        # other names are another entry
+        ReducedIndex((MatchSpec("dependency"),), channels, prepend=False)
+        assert retrieve.called
+        assert len(list(cache_dir.glob("*.json"))) == 2
+    SubdirData.clear_cached_local_channel_data()
+
+
+def test_reduced_index_cache_eviction(tmp_path: Path):
+    # each entry is 26 bytes
+    cache = ReducedIndexCache(tmp_path, max_size=60)
+    records = [PackageRecord(name="a", version="1", build="0", build_number=0)]
+    cache.put("first", records * 2)
+    cache.put("second", records * 2)
+    assert {path.name for path in tmp_path.iterdir()} == {"first.json", "second.json"}
+
+    # the least recently used entry is evicted first
+    os.utime(tmp_path / "second.json", (0, 0))
+    cache.put("third", records * 2)
+    assert {path.name for path in tmp_path.iterdir()} == {"first.json", "third.json"}
+
+
 def test_dist_str_in_index(test_recipes_channel):
     idx = Index((Channel(str(test_recipes_channel)),), prepend=False)
     assert not dist_str_in_index(idx.data, "test-1.4.0-0")
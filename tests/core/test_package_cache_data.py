@@ -1,19 +1,28 @@
 # Copyright (C) 2012 Anaconda, Inc
 # SPDX-License-Identifier: BSD-3-Clause
 import datetime
+import heapq
 import json
+import os
+import time
 from os.path import abspath, basename, dirname, join
 from pathlib import Path
+from threading import Event
 
 import pytest
 from pytest import MonkeyPatch
 
 from conda import CondaError, CondaMultiError
-from conda.base.constants import PACKAGE_CACHE_MAGIC_FILE
+from conda.base.constants import (
+    PACKAGE_CACHE_INDEX_FILE,
+    PACKAGE_CACHE_LAST_USED_DIR,
+    PACKAGE_CACHE_MAGIC_FILE,
+)
 from conda.base.context import context, reset_context
 from conda.common.compat import on_win
 from conda.core import package_cache_data
 from conda.core.index import get_index
+from conda.core.link import UnlinkLinkTransaction
 from conda.core.package_cache_data import (
     PackageCacheData,
     PackageCacheRecord,
@@ -542,3 +551,280 @@ def test_cover_extract_bad_package(tmp_path):
     with open(fullpath, "w") as archive:
         archive.write("")
     PackageCacheData.first_writable()._make_single_record(str(fullpath))
+
+
+@pytest.mark.parametrize("sha256_ok", (True, False))
+def test_ProgressiveFetchExtract_stream_extract(
+    package_server,
+    tmp_pkgs_dir: Path,
+    monkeypatch: MonkeyPatch,
+    mocker,
+    sha256_ok: bool,
+):
+    host, port = package_server.getsockname()
+    url = f"http://{host}:{port}/test/{subdir}/{zlib_conda_fn}"
+    prec = PackageRecord.from_objects(
+        zlib_conda_prec,
+        url=url,
+        sha256=zlib_conda_prec.sha256 if sha256_ok else "0" * 64,
+    )
+    monkeypatch.setenv("CONDA_EXPERIMENTAL", "stream_extract")
+    reset_context()
+    assert "stream_extract" in context.experimental
+    extract_tarball = mocker.patch("conda.core.path_actions.extract_tarball")
+
+    pfe = ProgressiveFetchExtract((prec,))
+    if not sha256_ok:
+        with pytest.raises(CondaMultiError):
+            pfe.execute()
+        # the package was extracted while downloading, but never published
+        assert not (tmp_pkgs_dir / zlib_base_fn).exists()
+        assert not (tmp_pkgs_dir / ".partial" / zlib_base_fn).exists()
+        return
+    pfe.execute()
+
+    extract_tarball.assert_not_called()
+    assert not (tmp_pkgs_dir / ".partial" / zlib_base_fn).exists()
+    extracted = tmp_pkgs_dir / zlib_base_fn
+    assert (extracted / "info" / "index.json").is_file()
+    assert (extracted / "info" / "repodata_record.json").is_file()
+    assert (extracted / "Library" / "bin" / "zlib.dll").is_file()
+
+    PackageCacheData._cache_.clear()
+    (pcrec,) = PackageCacheData(tmp_pkgs_dir).iter_records()
+    assert pcrec.is_extracted
+    assert pcrec.url == url
+
+
+def test_package_cache_index(tmp_pkgs_dir: Path, monkeypatch: MonkeyPatch, mocker):
+    monkeypatch.setenv("CONDA_EXPERIMENTAL", "package_cache_index")
+    reset_context()
+    assert "package_cache_index" in context.experimental
+
+    cache_action = CacheUrlAction(
+        f"{CONDA_PKG_REPO}/{subdir}/{zlib_conda_fn}",
+        tmp_pkgs_dir,
+        zlib_conda_fn,
+    )
+    cache_action.verify()
+    cache_action.execute()
+    cache_action.cleanup()
+
+    PackageCacheData._cache_.clear()
+    pcd = PackageCacheData(tmp_pkgs_dir)
+    (pcrec,) = pcd.iter_records()
+    index_path = tmp_pkgs_dir / PACKAGE_CACHE_INDEX_FILE
+    assert set(json.loads(index_path.read_text())["entries"]) == {zlib_conda_fn}
+
+    # unchanged packages are read from the index while pkgs_dir is rescanned
+    make_single_record = mocker.spy(pcd, "_make_single_record")
+    scandir = mocker.spy(package_cache_data, "scandir")
+    assert tuple(pcd.reload().iter_records()) == (pcrec,)
+    make_single_record.assert_not_called()
+    scandir.assert_called_once()
+
+    # once pkgs_dir is older than the scan, it is not walked at all
+    old_ns = time.time_ns() - 10 * 10**9
+    os.utime(tmp_pkgs_dir, ns=(old_ns, old_ns))
+    pcd.reload()
+    scandir.reset_mock()
+    (indexed,) = pcd.reload().iter_records()
+    scandir.assert_not_called()
+    make_single_record.assert_not_called()
+    assert indexed.dump() == pcrec.dump()
+    assert indexed.package_tarball_full_path == pcrec.package_tarball_full_path
+    assert indexed.extracted_package_dir == pcrec.extracted_package_dir
+    assert indexed.is_extracted
+    assert tuple(pcd.query(MatchSpec("zlib"))) == (indexed,)
+    assert (
+        PackageCacheData.tarball_file_in_cache(str(tmp_pkgs_dir / zlib_conda_fn))
+        == indexed
+    )
+
+    # remove() and insert() update the index, and the next load rescans pkgs_dir
+    pcd.remove(indexed)
+    index = json.loads(index_path.read_text())
+    assert index["entries"] == {}
+    assert index["mtime_ns"] is None
+    pcd.insert(indexed)
+    assert set(json.loads(index_path.read_text())["entries"]) == {zlib_conda_fn}
+    assert tuple(pcd.reload().iter_records()) == (pcrec,)
+    scandir.assert_called_once()
+    make_single_record.assert_not_called()
+
+    # a changed package is read again, once pkgs_dir itself changes
+    (tmp_pkgs_dir / zlib_base_fn / "info" / "repodata_record.json").unlink()
+    os.utime(tmp_pkgs_dir)
+    assert tuple(pcd.reload().iter_records()) == (pcrec,)
+    make_single_record.assert_called_once_with(zlib_conda_fn)
+
+    # rebuilding discards the index first
+    index_path.write_text("{}")
+    make_single_record.reset_mock()
+    assert tuple(pcd.rebuild_index().iter_records()) == (pcrec,)
+    make_single_record.assert_called_once_with(zlib_conda_fn)
+    assert set(json.loads(index_path.read_text())["entries"]) == {zlib_conda_fn}
+
+
+def test_ProgressiveFetchExtract_package_cache_index(
+    package_server, tmp_pkgs_dir: Path, monkeypatch: MonkeyPatch, mocker
+):
+    monkeypatch.setenv("CONDA_EXPERIMENTAL", "package_cache_index")
+    reset_context()
+    host, port = package_server.getsockname()
+    url = f"http://{host}:{port}/test/{subdir}/{zlib_conda_fn}"
+    prec = PackageRecord.from_objects(zlib_conda_prec, url=url)
+
+    pcd = PackageCacheData(tmp_pkgs_dir)
+    assert not tuple(pcd.iter_records())
+    write_index = mocker.spy(PackageCacheData, "_write_index")
+    ProgressiveFetchExtract((prec,)).execute()
+
+    # written once, after all packages were extracted
+    write_index.assert_called_once_with(pcd)
+    index = json.loads((tmp_pkgs_dir / PACKAGE_CACHE_INDEX_FILE).read_text())
+    assert set(index["entries"]) == {zlib_conda_fn}
+
+
+def make_cache_entry(pkgs_dir: Path, name: str, size: int, age_days: float) -> Path:
+    extracted = pkgs_dir / f"{name}-1.0-0"
+    (extracted / "info").mkdir(parents=True)
+    record = PackageRecord(
+        name=name,
+        version="1.0",
+        build="0",
+        build_number=0,
+        fn=f"{name}-1.0-0.conda",
+        url=f"https://repo.example.com/noarch/{name}-1.0-0.conda",
+        channel="https://repo.example.com",
+        subdir="noarch",
+        md5="0" * 32,
+    )
+    (extracted / "info" / "index.json").write_text(json.dumps(record.dump()))
+    (extracted / "info" / "repodata_record.json").write_text(json.dumps(record.dump()))
+    (extracted / "data").write_bytes(b"0" * size)
+    used = time.time() - age_days * 86400
+    for path in (extracted / "info", extracted):
+        os.utime(path, (used, used))
+    return extracted
+
+
+def test_package_cache_lru(tmp_pkgs_dir: Path, tmp_path: Path):
+    oldest = make_cache_entry(tmp_pkgs_dir, "oldest", 100_000, age_days=30)
+    linked = make_cache_entry(tmp_pkgs_dir, "linked", 100_000, age_days=20)
+    older = make_cache_entry(tmp_pkgs_dir, "older", 100_000, age_days=10)
+    newest = make_cache_entry(tmp_pkgs_dir, "newest", 100_000, age_days=0)
+    # hard linked into an environment
+    os.link(linked / "data", tmp_path / "data")
+
+    pcd = PackageCacheData(tmp_pkgs_dir)
+    assert pcd.find_lru_evictions() == []
+
+    def evicted(evictions):
+        return [pcrec.name for pcrec, _ in evictions]
+
+    assert evicted(pcd.find_lru_evictions(max_age=15)) == ["oldest"]
+    assert evicted(pcd.find_lru_evictions(max_size=450_000)) == []
+    assert evicted(pcd.find_lru_evictions(max_size=250_000)) == ["oldest", "older"]
+
+    # linking from an entry makes it recently used
+    (pcrec,) = pcd.query(MatchSpec("oldest"))
+    pcd.mark_used(pcrec)
+    evictions = pcd.find_lru_evictions(max_size=250_000)
+    assert evicted(evictions) == ["older", "newest"]
+    ((_, sizes), _) = evictions
+    assert sizes == {older.name: pytest.approx(100_000, abs=2000)}
+
+    pcd.evict(evictions)
+    assert not older.exists()
+    assert not newest.exists()
+    assert oldest.exists()
+    assert linked.exists()
+    assert sorted(pcrec.name for pcrec in pcd.iter_records()) == ["linked", "oldest"]
+    assert sorted(os.listdir(tmp_pkgs_dir / PACKAGE_CACHE_LAST_USED_DIR)) == [
+        "linked-1.0-0",
+        "oldest-1.0-0",
+    ]
+
+
+def test_evict_least_recently_used(tmp_pkgs_dir: Path, monkeypatch: MonkeyPatch):
+    old = make_cache_entry(tmp_pkgs_dir, "old", 1000, age_days=30)
+    new = make_cache_entry(tmp_pkgs_dir, "new", 1000, age_days=0)
+
+    PackageCacheData.evict_least_recently_used()
+    assert old.exists()
+
+    monkeypatch.setenv("CONDA_PKGS_MAX_AGE", "7")
+    reset_context()
+    assert context.pkgs_max_age == 7
+    PackageCacheData.evict_least_recently_used()
+    assert not old.exists()
+    assert new.exists()
+
+
+def test_transaction_marks_used_only_with_limits(
+    tmp_pkgs_dir: Path, monkeypatch: MonkeyPatch, mocker
+):
+    entry = make_cache_entry(tmp_pkgs_dir, "linked", 1000, age_days=0)
+    prec = PackageRecord(
+        **json.loads((entry / "info" / "repodata_record.json").read_text())
+    )
+    transaction = mocker.Mock(prefix_setups={"prefix": mocker.Mock(link_precs=[prec])})
+    last_used = tmp_pkgs_dir / PACKAGE_CACHE_LAST_USED_DIR
+
+    # eviction is disabled by default, so nothing is recorded
+    UnlinkLinkTransaction._update_package_caches(transaction)
+    assert not last_used.exists()
+
+    monkeypatch.setenv("CONDA_PKGS_MAX_AGE", "7")
+    reset_context()
+    UnlinkLinkTransaction._update_package_caches(transaction)
+    assert list(last_used.iterdir())
+    assert entry.exists()
+
+
+def test_ProgressiveFetchExtract_extracts_largest_first(mocker):
+    blocker, *precs = (
+        PackageRecord(
+            name=f"size-{size}", version="1", build="0", build_number=0, size=size
+        )
+        for size in (10, 1, 3, 2)
+    )
+    extracted = []
+    all_queued = Event()
+
+    def make_actions_for_record(prec):
+        # already downloaded, only extracted
+        extract_action = mocker.Mock()
+
+        def execute(_):
+            if prec is blocker:
+                # hold the only extract thread until the others are queued
+                assert all_queued.wait(timeout=30)
+            extracted.append(prec.name)
+
+        extract_action.execute.side_effect = execute
+        return None, extract_action
+
+    def heappush(heap, item):
+        heapq.heappush(heap, item)
+        if len(heap) == len(precs):
+            all_queued.set()
+
+    mocker.patch.object(
+        ProgressiveFetchExtract,
+        "make_actions_for_record",
+        staticmethod(make_actions_for_record),
+    )
+    mocker.patch.object(package_cache_data, "_extract_threads", return_value=1)
+    mocker.patch.object(package_cache_data, "heappush", side_effect=heappush)
+    fetch = mocker.patch.object(package_cache_data, "do_cache_action")
+
+    pfe = ProgressiveFetchExtract([blocker, *precs])
+    pfe.prepare()
+    # queue the smaller packages out of size order
+    pfe.paired_actions = {prec: pfe.paired_actions[prec] for prec in (blocker, *precs)}
+
+    pfe.execute()
+    assert extracted == ["size-10", "size-3", "size-2", "size-1"]
+    fetch.assert_not_called()
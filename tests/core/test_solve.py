@@ -1,6 +1,7 @@
 # Copyright (C) 2012 Anaconda, Inc
 # SPDX-License-Identifier: BSD-3-Clause
 import copy
+import itertools
 import os
 import re
 import sys
@@ -14,18 +15,19 @@ from conda.auxlib.ish import dals
 from conda.base.context import conda_tests_ctxt_mgmt_def_pol, context
 from conda.common.compat import on_linux, on_mac, on_win
 from conda.common.io import env_var, env_vars
-from conda.core.solve import DepsModifier, UpdateModifier
+from conda.core.solve import DepsModifier, SolutionCache, Solver, UpdateModifier
 from conda.exceptions import SpecsConfigurationConflictError, UnsatisfiableError
 from conda.models.channel import Channel
 from conda.models.enums import PackageType
-from conda.models.records import PrefixRecord
+from conda.models.records import PackageRecord, PrefixRecord
 from conda.models.version import VersionOrder
-from conda.resolve import MatchSpec
+from conda.resolve import MatchSpec, Resolve
 from conda.testing.helpers import (
     CHANNEL_DIR_V1,
     add_subdir,
     add_subdir_to_iter,
     convert_to_dist_str,
+    get_index_r_1,
     get_solver,
     get_solver_2,
     get_solver_4,
@@ -1144,6 +1146,75 @@ def test_update_all_1(tmpdir):
         assert convert_to_dist_str(final_state_2) == order
 
 
+def test_version_rank(tmpdir):
+    if context.solver == "libmamba":
+        pytest.skip("conda-libmamba-solver does not use a Solver._r (Resolve) object")
+
+    with get_solver(tmpdir, (MatchSpec("numpy"),)) as solver:
+        solver.solve_final_state()
+        r = solver._r
+    for group in r.groups.values():
+        for prec, other in zip(group, group[1:]):
+            order, other_order = VersionOrder(prec.version), VersionOrder(other.version)
+            assert (r._version_rank(prec) > r._version_rank(other)) == (
+                order > other_order
+            )
+            assert (r._version_rank(prec) == r._version_rank(other)) == (
+                order == other_order
+            )
+
+    def numpy(version):
+        return PackageRecord(name="numpy", version=version, build="0", build_number=0)
+
+    # records that are not in the index are ranked too
+    assert r._version_rank(numpy("1.7.1.0")) == r._version_rank(numpy("1.7.1"))
+    assert r._version_rank(numpy("99")) > r._version_rank(numpy("1.7.1"))
+
+
+def test_version_rank_off_index():
+    def a(version):
+        return PackageRecord(
+            name="a",
+            version=version,
+            build="0",
+            build_number=0,
+            channel="defaults",
+            subdir="linux-64",
+        )
+
+    r = Resolve({prec: prec for prec in (a("1.0"), a("2.0"))})
+    versions = ("2.0", "1.5", "1.7", "0.1", "3", "1.0.0", "1.6", "1.0")
+    # keys computed earlier stay comparable with keys of records not in the index
+    keys = {v: r.version_key(a(v)) for v in versions}
+    for v, other in itertools.combinations(versions, 2):
+        order, other_order = VersionOrder(v), VersionOrder(other)
+        assert (keys[v] > keys[other]) == (order > other_order)
+        assert (keys[v] == keys[other]) == (order == other_order)
+
+
+def test_disjoint_version_specs():
+    if context.solver == "libmamba":
+        pytest.skip("conda-libmamba-solver does not use a Solver._r (Resolve) object")
+
+    _, r = get_index_r_1()
+    specs = {MatchSpec("numpy 1.5*"), MatchSpec("numpy >=1.6"), MatchSpec("python")}
+    assert r._disjoint_version_specs(specs) == [
+        [MatchSpec("numpy 1.5*"), MatchSpec("numpy >=1.6")]
+    ]
+    assert not r._disjoint_version_specs(
+        {MatchSpec("numpy 1.5*"), MatchSpec("numpy <1.6"), MatchSpec("python")}
+    )
+
+    # the conflict is explained without building the graph of dependencies
+    with patch.object(r, "build_graph_of_deps") as build_graph_of_deps:
+        bad_deps = r.build_conflict_map(specs, specs_to_add=specs)
+    build_graph_of_deps.assert_not_called()
+    assert bad_deps["direct"] == {
+        ((MatchSpec("numpy 1.5*"),), "numpy=1.5"),
+        ((MatchSpec("numpy >=1.6"),), "numpy[version='>=1.6']"),
+    }
+
+
 def test_broken_install(tmpdir):
     if context.solver == "libmamba":
         pytest.skip("conda-libmamba-solver does not use a Solver._r (Resolve) object")
@@ -3264,6 +3335,38 @@ def test_current_repodata_fallback(tmpdir):
         raise ValueError("Didn't have expected state in solve (needed zlib record)")
 
 
+def test_solution_cache(tmpdir, tmp_pkgs_dir, mocker):
+    if context.solver == "libmamba":
+        pytest.skip("The solution cache is part of the classic solver")
+    mocker.patch.object(SolutionCache, "hits", 0)
+    mocker.patch.object(SolutionCache, "misses", 0)
+
+    def solve(*specs):
+        return Solver(
+            tmpdir.strpath,
+            (Channel(CHANNEL_DIR_V1),),
+            ("win-64",),
+            specs_to_add=[MatchSpec(spec) for spec in specs],
+        ).solve_final_state()
+
+    with env_vars(
+        {"CONDA_EXPERIMENTAL": "solution_cache"},
+        stack_callback=conda_tests_ctxt_mgmt_def_pol,
+    ):
+        expected = solve("zlib")
+        assert SolutionCache.stats() == {"hits": 0, "misses": 1}
+
+        run_sat = mocker.spy(Solver, "_run_sat")
+        assert list(solve("zlib")) == list(expected)
+        assert not run_sat.called
+        assert SolutionCache.stats() == {"hits": 1, "misses": 1}
+
+        # another request is solved again
+        solve("zlib=1.2.8")
+        assert run_sat.called
+        assert SolutionCache.stats() == {"hits": 1, "misses": 2}
+
+
 def test_downgrade_python_prevented_with_sane_message(tmpdir):
     specs = (MatchSpec("python=2.6"),)
     with get_solver(tmpdir, specs) as solver:
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 from __future__ import annotations
 
+import json
 from logging import getLogger
 from os.path import join
 from pathlib import Path
@@ -13,7 +14,12 @@ from conda import CondaError
 from conda.base.context import conda_tests_ctxt_mgmt_def_pol, context
 from conda.common.io import env_var, env_vars
 from conda.core.index import get_index
-from conda.core.subdir_data import SubdirData, cache_fn_url
+from conda.core.subdir_data import (
+    ColumnarPackageRecordList,
+    RepodataEntries,
+    SubdirData,
+    cache_fn_url,
+)
 from conda.exceptions import CondaUpgradeError
 from conda.gateways.repodata import (
     CondaRepoInterface,
@@ -22,6 +28,7 @@ from conda.gateways.repodata import (
     get_repo_interface,
 )
 from conda.models.channel import Channel
+from conda.models.match_spec import MatchSpec
 from conda.models.records import PackageRecord
 from conda.testing.helpers import CHANNEL_DIR_V1, CHANNEL_DIR_V2
 from conda.utils import url_path
@@ -379,4 +386,189 @@ def test_subdir_data_dict_state(platform=OVERRIDE_PLATFORM):
     """SubdirData can accept a dict instead of a RepodataState, for compatibility."""
     local_channel = Channel(join(CHANNEL_DIR_V1, platform))
     sd = SubdirData(channel=local_channel)
-    sd._read_pickled({})  # type: ignore
+    with pytest.deprecated_call():
+        sd._read_pickled({})  # type: ignore
+    sd._read_columnar({})  # type: ignore
+
+
+def test_columnar_cache(platform=OVERRIDE_PLATFORM):
+    channel = Channel(url_path(join(CHANNEL_DIR_V1, platform)))
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
+
+    sd_json = SubdirData(channel).load()
+    assert not isinstance(sd_json._package_records, ColumnarPackageRecordList)
+    assert Path(sd_json.cache_path_columnar).is_file()
+    dumps = [prec.dump() for prec in sd_json.iter_records()]
+
+    with env_vars(
+        {"CONDA_USE_INDEX_CACHE": "true"},
+        stack_callback=conda_tests_ctxt_mgmt_def_pol,
+    ):
+        SubdirData.clear_cached_local_channel_data(exclude_file=False)
+        sd = SubdirData(channel).load()
+        assert isinstance(sd._package_records, ColumnarPackageRecordList)
+        # nothing is decoded until it is asked for
+        assert all(record is None for record in sd._package_records.data)
+
+        zlib = list(sd._iter_records_by_name("zlib"))
+        assert zlib and all(prec.name == "zlib" for prec in zlib)
+        assert sum(record is not None for record in sd._package_records.data) == len(
+            zlib
+        )
+        assert list(sd._iter_records_by_name("not-a-package")) == []
+        assert "zlib" in sd._names_index
+        assert "not-a-package" not in sd._names_index
+        assert sorted(sd._names_index) == sorted(sd_json._names_index)
+
+        assert [prec.dump() for prec in sd.iter_records()] == dumps
+        assert sd._base_url == sd_json._base_url
+
+        # a changed etag invalidates the cache
+        state = sd.repo_cache.load_state()
+        assert sd._read_columnar(state)
+        state.etag = "changed"
+        assert sd._read_columnar(state) is None
+
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
+
+
+def test_repodata_entries():
+    repodata = {
+        "info": {"subdir": "linux-64"},
+        "packages": {
+            "python-3.9.0-h0.tar.bz2": {
+                "name": "python",
+                "version": "3.9.0",
+                "build": "h0",
+                "build_number": 0,
+                "depends": [],
+                "md5": "legacy-md5",
+            },
+            "python-dateutil-2.8.0-py_0.tar.bz2": {
+                "name": "python-dateutil",
+                "version": "2.8.0",
+                "build": "py_0",
+                "build_number": 0,
+                "depends": ["python"],
+            },
+        },
+        "packages.conda": {
+            "python-3.9.0-h0.conda": {
+                "name": "python",
+                "version": "3.9.0",
+                "build": "h0",
+                "build_number": 0,
+                "depends": [],
+            },
+        },
+        "removed": ["python-3.8.0-h0.tar.bz2"],
+    }
+    entries = RepodataEntries(json.dumps(repodata, indent=2))
+    assert entries.info == repodata["info"]
+
+    legacy, conda = entries.packages(["python"])
+    assert legacy == {
+        "python-3.9.0-h0.tar.bz2": repodata["packages"]["python-3.9.0-h0.tar.bz2"]
+    }
+    assert conda == repodata["packages.conda"]
+    assert entries.packages(["python-dateutil"]) == (
+        {
+            "python-dateutil-2.8.0-py_0.tar.bz2": repodata["packages"][
+                "python-dateutil-2.8.0-py_0.tar.bz2"
+            ]
+        },
+        {},
+    )
+    assert entries.packages(["not-a-package"]) == ({}, {})
+
+    sd = SubdirData(Channel("https://conda.anaconda.org/fake/linux-64"))
+    _internal_state = sd._process_raw_repodata_names(json.dumps(repodata), ["python"])
+    assert _internal_state["_loaded_names"] == {"python"}
+    (python,) = _internal_state["_package_records"]
+    # .conda preferred over .tar.bz2, which still contributes its md5
+    assert python.fn == "python-3.9.0-h0.conda"
+    assert python.legacy_bz2_md5 == "legacy-md5"
+
+
+def test_load_names(platform=OVERRIDE_PLATFORM):
+    channel = Channel(url_path(join(CHANNEL_DIR_V1, platform)))
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
+    dumps = [prec.dump() for prec in SubdirData(channel).load().iter_records()]
+
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
+    sd = SubdirData(channel).load_names(["zlib"])
+    assert sd._loaded_names == {"zlib"}
+    assert list(sd._names_index) == ["zlib"]
+    assert all(prec.name == "zlib" for prec in sd.query("zlib"))
+
+    # other names are parsed on demand
+    assert list(sd.query("libgcc-ng"))
+    assert sd._loaded_names == {"zlib", "libgcc-ng"}
+
+    # iterating over all records completes the load
+    assert sorted(map(str, sd.query("*"))) == sorted(
+        str(PackageRecord(**dump)) for dump in dumps
+    )
+    assert sd._loaded_names is None
+    assert [prec.dump() for prec in sd.iter_records()] == dumps
+
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
+
+
+def test_query_sparse(platform=OVERRIDE_PLATFORM):
+    channel = Channel(url_path(join(CHANNEL_DIR_V1, platform)))
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
+    with env_vars(
+        {"CONDA_EXPERIMENTAL": "sparse"},
+        stack_callback=conda_tests_ctxt_mgmt_def_pol,
+    ):
+        sd = SubdirData(channel)
+        assert list(sd.query("zlib"))
+        assert sd._loaded_names == {"zlib"}
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
+
+
+@pytest.mark.parametrize("processes", ["0", "1"])
+def test_load_all(tmp_path: Path, processes: str):
+    channels = [
+        Channel(url_path(join(CHANNEL_DIR_V1, subdir)))
+        for subdir in ("linux-64", "noarch")
+    ]
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
+    with env_vars(
+        {
+            "CONDA_PKGS_DIRS": str(tmp_path),
+            "CONDA_REPODATA_THREADS": "2",
+            "CONDA_REPODATA_PROCESSES": processes,
+        },
+        stack_callback=conda_tests_ctxt_mgmt_def_pol,
+    ):
+        subdir_datas = [SubdirData(channel) for channel in channels]
+        SubdirData.load_all(subdir_datas)
+        for sd in subdir_datas:
+            assert sd._loaded
+            assert {"fetch", "process", "save"} <= set(sd.timings)
+            assert Path(sd.cache_path_columnar).is_file()
+        # parsed in a worker process, memory-mapped here
+        assert isinstance(
+            subdir_datas[0]._package_records, ColumnarPackageRecordList
+        ) == (processes == "1")
+        assert list(subdir_datas[0].query("zlib"))
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
+
+
+def test_query_name_glob(platform=OVERRIDE_PLATFORM):
+    channel = Channel(url_path(join(CHANNEL_DIR_V1, platform)))
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
+    sd = SubdirData(channel).load()
+    spec = MatchSpec("*gcc*")
+    precs = list(sd.query(spec))
+    assert [prec.name for prec in precs] == ["libgcc-ng"]
+
+    # the records of other names were not converted
+    records = sd._package_records.data
+    assert [rec for rec in records if isinstance(rec, PackageRecord)] == precs
+    assert len(records) > len(precs)
+
+    assert precs == [prec for prec in sd.iter_records() if spec.match(prec)]
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
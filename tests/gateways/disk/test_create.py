@@ -1,5 +1,140 @@
 # Copyright (C) 2012 Anaconda, Inc
 # SPDX-License-Identifier: BSD-3-Clause
+from __future__ import annotations
+
+import io
+import json
+import os
+import zipfile
+from hashlib import sha256
 from logging import getLogger
+from pathlib import Path
+
+import pytest
+
+from conda.common.compat import on_win
+from conda.gateways.disk.create import (
+    extract_conda_stream,
+    extract_tarball,
+    link_to_content_store,
+)
 
 log = getLogger(__name__)
+
+CONDA_PACKAGE = (
+    Path(__file__).parents[2]
+    / "data"
+    / "conda_format_repo"
+    / "win-64"
+    / "zlib-1.2.11-h62dcd97_3.conda"
+)
+
+
+class NonSeekableReader(io.RawIOBase):
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        # short reads, like a network stream
+        data = self._data.read(min(len(buffer), 1000))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def tree(path: Path) -> dict[str, bytes]:
+    return {
+        str(file.relative_to(path)): file.read_bytes()
+        for file in path.rglob("*")
+        if file.is_file()
+    }
+
+
+def test_extract_conda_stream(tmp_path: Path):
+    streamed = tmp_path / "streamed"
+    extracted = tmp_path / "extracted"
+    fileobj = NonSeekableReader(CONDA_PACKAGE.read_bytes())
+    extract_conda_stream(fileobj, streamed)
+    extract_tarball(str(CONDA_PACKAGE), str(extracted))
+
+    assert (streamed / "info" / "index.json").is_file()
+    assert tree(streamed) == tree(extracted)
+    # the rest of the zip central directory is left for the caller
+    assert b"PK\x05\x06" in fileobj.read()
+
+
+def test_extract_conda_stream_compressed(tmp_path: Path):
+    repacked = io.BytesIO()
+    with zipfile.ZipFile(CONDA_PACKAGE) as source, zipfile.ZipFile(
+        repacked, "w", compression=zipfile.ZIP_DEFLATED
+    ) as target:
+        for info in source.infolist():
+            target.writestr(info.filename, source.read(info))
+
+    with pytest.raises(ValueError):
+        extract_conda_stream(NonSeekableReader(repacked.getvalue()), tmp_path)
+
+
+def make_extracted_package(path: Path, files: dict[str, bytes], **sha256s: str) -> Path:
+    paths = []
+    for name, data in files.items():
+        (path / name).parent.mkdir(parents=True, exist_ok=True)
+        (path / name).write_bytes(data)
+        paths.append(
+            {
+                "_path": name,
+                "path_type": "hardlink",
+                "sha256": sha256s.get(name, sha256(data).hexdigest()),
+                "size_in_bytes": len(data),
+            }
+        )
+    (path / "info").mkdir(parents=True)
+    (path / "info" / "paths.json").write_text(
+        json.dumps({"paths_version": 1, "paths": paths})
+    )
+    return path
+
+
+def test_link_to_content_store(tmp_path: Path):
+    store = tmp_path / "store"
+    license_text = b"license text" * 100
+    first = make_extracted_package(
+        tmp_path / "first",
+        {"LICENSE": license_text, "lib/first.so": b"first"},
+    )
+    second = make_extracted_package(
+        tmp_path / "second",
+        {"LICENSE": license_text, "lib/second.so": b"second", "bad": b"bad"},
+        # claims to be LICENSE
+        bad=sha256(license_text).hexdigest(),
+    )
+
+    # the first package only fills the store
+    assert link_to_content_store(first, store) == 0
+    assert len(list(store.rglob("*-*"))) == 2
+    assert link_to_content_store(second, store) == len(license_text)
+    assert (first / "LICENSE").samefile(second / "LICENSE")
+    assert (second / "LICENSE").read_bytes() == license_text
+    assert os.stat(second / "LICENSE").st_nlink == 3
+    assert (second / "bad").read_bytes() == b"bad"
+    assert os.stat(second / "bad").st_nlink == 1
+
+    # already linked
+    assert link_to_content_store(second, store) == 0
+
+
+@pytest.mark.skipif(on_win, reason="permission bits are not shared on Windows")
+def test_link_to_content_store_permissions(tmp_path: Path):
+    store = tmp_path / "store"
+    script = b"#!/bin/sh\n"
+    first = make_extracted_package(tmp_path / "first", {"bin/tool": script})
+    second = make_extracted_package(tmp_path / "second", {"share/tool": script})
+    (first / "bin" / "tool").chmod(0o755)
+    (second / "share" / "tool").chmod(0o644)
+
+    link_to_content_store(first, store)
+    assert link_to_content_store(second, store) == 0
+    assert not (first / "bin" / "tool").samefile(second / "share" / "tool")
+    assert len(list(store.rglob("*-*"))) == 2
@@ -3,8 +3,13 @@
 from __future__ import annotations
 
 import hashlib
+import os
+from concurrent.futures import CancelledError
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from logging import getLogger
 from pathlib import Path
+from threading import Thread
 from typing import TYPE_CHECKING
 
 import pytest
@@ -14,13 +19,16 @@ from conda.auxlib.compat import Utf8NamedTemporaryFile
 from conda.base.context import context, reset_context
 from conda.common.compat import ensure_binary
 from conda.common.url import path_to_url
-from conda.exceptions import CondaExitZero
+from conda.exceptions import ChecksumMismatchError, CondaExitZero
 from conda.gateways.anaconda_client import remove_binstar_token, set_binstar_token
+from conda.gateways.connection import download
+from conda.gateways.connection.adapters.http import connection_stats
 from conda.gateways.connection.download import download_inner
 from conda.gateways.connection.session import (
     CondaHttpAuth,
     CondaSession,
     get_channel_name_from_url,
+    get_http_adapter,
     get_session,
     get_session_storage_key,
 )
@@ -437,3 +445,219 @@ def test_accept_range_none(package_server, tmp_path):
 
     assert complete_file.read_text() == test_content
     assert not partial_file.exists()
+
+
+def test_download_inner_extract(package_server, tmp_path):
+    """
+    ``extract`` reads the whole file as it downloads, the rest is downloaded
+    anyway, and the checksum is computed along the way.
+    """
+    test_content = "test content test content test content"
+    host, port = package_server.getsockname()
+    url = f"http://{host}:{port}/none-accept-ranges"
+    expected_sha256 = hashlib.sha256(test_content.encode("utf-8")).hexdigest()
+    complete_file = tmp_path / "test-file"
+    partial_file = tmp_path / "test-file.partial"
+
+    # a stale .partial file is truncated, since ranges are not accepted
+    partial_file.write_text("wrong content")
+    read = []
+    download_inner(
+        url,
+        complete_file,
+        None,
+        expected_sha256,
+        len(test_content),
+        None,
+        extract=lambda fileobj: read.append(fileobj.read(12)),
+    )
+    assert read == [test_content[:12].encode()]
+    assert complete_file.read_text() == test_content
+
+    # a complete .partial file is passed to extract from disk
+    complete_file.unlink()
+    partial_file.write_text(test_content)
+    read.clear()
+    download_inner(
+        url,
+        complete_file,
+        None,
+        expected_sha256,
+        len(test_content),
+        None,
+        extract=lambda fileobj: read.append(fileobj.read()),
+    )
+    assert read == [test_content.encode()]
+    assert complete_file.read_text() == test_content
+
+    # extract errors are ignored, checksum errors are not
+    complete_file.unlink()
+
+    def extract(fileobj):
+        raise ValueError("cannot extract")
+
+    with pytest.raises(ChecksumMismatchError):
+        download_inner(
+            url, complete_file, None, "0" * 64, len(test_content), None, extract=extract
+        )
+    assert not complete_file.exists()
+    assert not partial_file.exists()
+
+
+CONDA_PACKAGE = (
+    Path(__file__).parents[1]
+    / "data"
+    / "conda_format_repo"
+    / "win-64"
+    / "zlib-1.2.11-h62dcd97_3.conda"
+)
+
+
+@pytest.fixture
+def download_segments(monkeypatch: MonkeyPatch, mocker):
+    monkeypatch.setenv("CONDA_DOWNLOAD_SEGMENTS", "4")
+    reset_context()
+    assert context.download_segments == 4
+    monkeypatch.setattr(download, "SEGMENTED_DOWNLOAD_MIN_SIZE", 0)
+    return mocker.spy(download, "_download_segments")
+
+
+@pytest.mark.skipif(not hasattr(os, "pwrite"), reason="no positioned writes")
+def test_download_inner_segments(package_server, tmp_path, download_segments):
+    host, port = package_server.getsockname()
+    url = f"http://{host}:{port}/test/win-64/{CONDA_PACKAGE.name}"
+    content = CONDA_PACKAGE.read_bytes()
+    sha256 = hashlib.sha256(content).hexdigest()
+    target = tmp_path / CONDA_PACKAGE.name
+
+    progress = []
+    download_inner(url, target, None, sha256, len(content), progress.append)
+    assert download_segments.spy_return is True
+    assert target.read_bytes() == content
+    assert progress[-1] == 1.0
+
+    # checksummed in order, as the segments complete
+    target.unlink()
+    with pytest.raises(ChecksumMismatchError):
+        download_inner(url, target, None, "0" * 64, len(content), None)
+    assert download_segments.spy_return is True
+    assert not target.exists()
+    assert not (tmp_path / f"{target.name}.partial").exists()
+
+
+@pytest.mark.skipif(not hasattr(os, "pwrite"), reason="no positioned writes")
+def test_download_inner_segments_resume(package_server, tmp_path, download_segments):
+    host, port = package_server.getsockname()
+    url = f"http://{host}:{port}/test/win-64/{CONDA_PACKAGE.name}"
+    content = CONDA_PACKAGE.read_bytes()
+    sha256 = hashlib.sha256(content).hexdigest()
+    target = tmp_path / CONDA_PACKAGE.name
+    partial = tmp_path / f"{target.name}.partial"
+
+    def cancel(fraction):
+        if fraction > 0.5:
+            raise CancelledError()
+
+    with pytest.raises(CancelledError):
+        download_inner(url, target, None, sha256, len(content), cancel)
+    # only the bytes downloaded from the start are kept
+    assert partial.stat().st_size < len(content)
+    assert content.startswith(partial.read_bytes())
+
+    # and resumed over a single connection
+    download_inner(url, target, None, sha256, len(content), None)
+    assert download_segments.call_count == 1
+    assert target.read_bytes() == content
+
+
+def test_download_inner_segments_unsupported(
+    package_server, tmp_path, download_segments
+):
+    test_content = "test content test content test content"
+    host, port = package_server.getsockname()
+    url = f"http://{host}:{port}/none-accept-ranges"
+    target = tmp_path / "test-file"
+
+    download_inner(
+        url,
+        target,
+        None,
+        hashlib.sha256(test_content.encode()).hexdigest(),
+        len(test_content),
+        None,
+    )
+    assert download_segments.spy_return is (False if hasattr(os, "pwrite") else None)
+    assert target.read_text() == test_content
+
+
+@pytest.fixture
+def clear_sessions():
+    CondaSession.cache_clear()
+    yield
+    CondaSession.cache_clear()
+
+
+def test_http_adapter_pool_size(monkeypatch: MonkeyPatch, clear_sessions):
+    monkeypatch.setenv("CONDA_FETCH_THREADS", "16")
+    monkeypatch.setenv("CONDA_DOWNLOAD_SEGMENTS", "2")
+    monkeypatch.setenv("CONDA_REPODATA_THREADS", "20")
+    reset_context()
+
+    adapter = CondaSession().get_adapter("https://")
+    assert adapter is get_http_adapter()
+    assert adapter._pool_maxsize == 32
+
+    monkeypatch.setenv("CONDA_REPODATA_THREADS", "40")
+    reset_context()
+
+    assert get_http_adapter() is not adapter
+    assert get_http_adapter()._pool_maxsize == 40
+
+
+class KeepAliveHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def keep_alive_server(tmp_path):
+    """A local HTTP/1.1 server; the werkzeug package_server closes every connection."""
+    (tmp_path / "file").write_text("test content")
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), partial(KeepAliveHandler, directory=str(tmp_path))
+    )
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_adapter_shared_across_threads(keep_alive_server, clear_sessions):
+    host, port = keep_alive_server.server_address
+    url = f"http://{host}:{port}/file"
+    key = ("http", host, port)
+    opened_before, reused_before = connection_stats().get(key, (0, 0))
+
+    sessions = []
+
+    def fetch():
+        session = CondaSession()
+        assert session.get(url).text == "test content"
+        sessions.append(session)
+
+    for _ in range(4):
+        thread = Thread(target=fetch)
+        thread.start()
+        thread.join()
+
+    # one session per thread, all sharing a single connection pool
+    assert len({id(session) for session in sessions}) == 4
+    assert {id(session.get_adapter(url)) for session in sessions} == {
+        id(get_http_adapter())
+    }
+
+    opened, reused = connection_stats()[key]
+    assert (opened - opened_before, reused - reused_before) == (1, 3)
@@ -620,6 +620,125 @@ def test_jlap_errors(
             sd._repo.repodata(cache.load_state())  # type: ignore
 
 
+def _change_packages(repodata: dict, i: int):
+    if i == 0:
+        entry = dict(repodata["packages.conda"]["zlib-1.2.11-h1de35cc_3.conda"])
+        entry.update(version="1.2.12", build="h1de35cc_0", build_number=0)
+        repodata["packages.conda"]["zlib-1.2.12-h1de35cc_0.conda"] = entry
+    elif i == 1:
+        repodata["packages.conda"]["zlib-1.2.12-h1de35cc_0.conda"]["depends"] = [
+            "libcxx"
+        ]
+    elif i == 2:
+        del repodata["packages.conda"]["zlib-1.2.11-h1de35cc_3.conda"]
+        repodata["removed"].append("zlib-1.2.11-h1de35cc_3.conda")
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_apply_patches_in_place(indent):
+    repodata = {
+        "info": {"subdir": "osx-64"},
+        "packages": {
+            f"a-{i}-0.tar.bz2": {"name": "a", "version": str(i), "depends": []}
+            for i in range(4)
+        },
+        "packages.conda": {
+            f"a-{i}-0.conda": {"name": "a", "version": str(i), "depends": []}
+            for i in range(3)
+        },
+        "removed": [],
+    }
+    after = json.loads(json.dumps(repodata))
+    for fn in ("a-1-0.conda", "a-2-0.conda", "a-3-0.tar.bz2"):
+        del after["packages.conda" if fn.endswith(".conda") else "packages"][fn]
+        after["removed"].append(fn)
+    after["packages.conda"]["b-1-0.conda"] = {"name": "b", "version": "1"}
+    after["packages"]["a-0-0.tar.bz2"]["depends"].append("b")
+    patches = [
+        {"patch": jsonpatch.make_patch(repodata, after).patch},
+    ]
+
+    patched, changes = fetch.apply_patches_in_place(
+        json.dumps(repodata, indent=indent), patches
+    )
+    assert json.loads(patched) == after
+    assert changes == {
+        ("packages", "a-0-0.tar.bz2"): after["packages"]["a-0-0.tar.bz2"],
+        ("packages.conda", "a-0-0.conda"): after["packages.conda"]["a-0-0.conda"],
+        ("packages", "a-1-0.tar.bz2"): after["packages"]["a-1-0.tar.bz2"],
+        ("packages.conda", "a-1-0.conda"): None,
+        ("packages", "a-2-0.tar.bz2"): after["packages"]["a-2-0.tar.bz2"],
+        ("packages.conda", "a-2-0.conda"): None,
+        ("packages", "a-3-0.tar.bz2"): None,
+        ("packages.conda", "a-3-0.conda"): None,
+        ("packages.conda", "b-1-0.conda"): after["packages.conda"]["b-1-0.conda"],
+        ("packages", "b-1-0.tar.bz2"): None,
+    }
+
+    # anything but package entries and "removed" is patched the slow way
+    after["info"]["test"] = True
+    with pytest.raises(ValueError):
+        fetch.apply_patches_in_place(
+            json.dumps(repodata),
+            [{"patch": jsonpatch.make_patch(repodata, after).patch}],
+        )
+
+
+def test_jlap_patch_in_place(
+    package_server: socket, tmp_path: Path, package_repository_base: Path, mocker
+):
+    """Test that JLAP patches update the columnar cache instead of parsing."""
+    host, port = package_server.getsockname()
+    channel_url = f"http://{host}:{port}/test/osx-64"
+
+    with env_vars(
+        {
+            "CONDA_PLATFORM": "osx-64",
+            "CONDA_EXPERIMENTAL": "jlap",
+            "CONDA_PKGS_DIRS": str(tmp_path),
+        },
+        stack_callback=conda_tests_ctxt_mgmt_def_pol,
+    ):
+        SubdirData.clear_cached_local_channel_data(exclude_file=False)
+        sd = SubdirData(channel=Channel(channel_url))
+        sd.load()
+
+        cache = sd.repo_cache
+        state = cache.load_state()
+        cache.refresh(state["refresh_ns"] - int(1e9 * 60))
+
+        test_jlap = make_test_jlap(
+            cache.cache_path_json.read_bytes(), 3, change=_change_packages
+        )
+        test_jlap.terminate()
+        test_jlap_path = package_repository_base / "osx-64" / "repodata.jlap"
+        test_jlap.write(test_jlap_path)
+
+        process_raw_repodata = mocker.spy(SubdirData, "_process_raw_repodata")
+        try:
+            sd.reload()
+        finally:
+            test_jlap_path.unlink()
+        assert not process_raw_repodata.called
+
+        expected = json.loads(sd.cache_path_json.read_text())
+        assert "zlib-1.2.11-h1de35cc_3.conda" not in expected["packages.conda"]
+        assert expected["removed"] == ["zlib-1.2.11-h1de35cc_3.conda"]
+
+        records = {prec.fn: prec for prec in sd.iter_records()}
+        assert set(records) == {
+            "zlib-1.2.11-h1de35cc_3.tar.bz2",
+            "zlib-1.2.12-h1de35cc_0.conda",
+        }
+        assert records["zlib-1.2.12-h1de35cc_0.conda"].depends == ("libcxx",)
+
+        # same as parsing the patched repodata.json
+        sd._process_raw_repodata(expected, cache.load_state())
+        assert {prec.fn: prec.dump() for prec in sd._package_records} == {
+            fn: prec.dump() for fn, prec in records.items()
+        }
+
+
 @pytest.mark.parametrize("use_jlap", [True, False])
 def test_jlap_cache_clock(
     package_server: socket,
@@ -814,8 +933,15 @@ def test_jlap_core(tmp_path: Path):
     assert jlap2.body == jlap2[1:-2]
 
 
-def make_test_jlap(original: bytes, changes=1):
-    """:original: as bytes, to avoid any newline confusion."""
+def _change_info(repodata: dict, i: int):
+    repodata["info"][f"test{i}"] = i
+
+
+def make_test_jlap(original: bytes, changes=1, change=_change_info):
+    """
+    :original: as bytes, to avoid any newline confusion.
+    :change: function(repodata, i) making the i-th change.
+    """
 
     def jlap_lines():
         yield core.DEFAULT_IV.hex().encode("utf-8")
@@ -829,7 +955,7 @@ def make_test_jlap(original: bytes, changes=1):
         starting_digest = h.digest().hex()
 
         for i in range(changes):
-            after["info"][f"test{i}"] = i
+            change(after, i)
 
             patch = jsonpatch.make_patch(before, after)
             row = {"from": starting_digest}
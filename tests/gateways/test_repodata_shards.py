@@ -0,0 +1,137 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+"""Test sharded repodata, served by a local web server."""
+
+from __future__ import annotations
+
+import json
+import shutil
+from hashlib import sha256
+from pathlib import Path
+
+import pytest
+import zstandard
+
+from conda.base.context import conda_tests_ctxt_mgmt_def_pol
+from conda.common.io import env_vars
+from conda.core.subdir_data import SubdirData
+from conda.gateways.repodata import RepodataCache, get_repo_interface
+from conda.gateways.repodata.shards import (
+    SHARDS_INDEX_FN,
+    ShardedRepoInterface,
+    ShardsUnavailable,
+)
+from conda.models.channel import Channel
+
+from ..http_test_server import run_test_server
+
+TEST_REPOSITORY = Path(__file__).parents[1] / "data" / "conda_format_repo"
+
+
+def write_shards(subdir: Path):
+    """Write sharded repodata for the repodata.json in ``subdir``."""
+    repodata = json.loads((subdir / "repodata.json").read_text())
+    shards = {}
+    for section in ("packages", "packages.conda"):
+        for fn, info in repodata.get(section, {}).items():
+            shards.setdefault(info["name"], {"packages": {}, "packages.conda": {}})
+            shards[info["name"]][section][fn] = info
+
+    (subdir / "shards").mkdir()
+    index = {"version": 1, "info": repodata.get("info", {}), "shards": {}}
+    for name, shard in shards.items():
+        data = zstandard.ZstdCompressor().compress(json.dumps(shard).encode())
+        digest = sha256(data).hexdigest()
+        (subdir / "shards" / f"{digest}.json.zst").write_bytes(data)
+        index["shards"][name] = digest
+    (subdir / SHARDS_INDEX_FN).write_bytes(
+        zstandard.ZstdCompressor().compress(json.dumps(index).encode())
+    )
+
+
+@pytest.fixture
+def sharded_channel(tmp_path: Path):
+    base = tmp_path / "channel"
+    shutil.copytree(TEST_REPOSITORY, base)
+    write_shards(base / "linux-64")
+    server = run_test_server(str(base))
+    host, port = server.socket.getsockname()[:2]
+    yield base, f"http://{host}:{port}"
+    server.shutdown()
+
+
+def test_get_repo_interface():
+    with env_vars(
+        {"CONDA_EXPERIMENTAL": "sharded"},
+        stack_callback=conda_tests_ctxt_mgmt_def_pol,
+    ):
+        assert get_repo_interface() is ShardedRepoInterface
+
+
+def test_repodata_shards(sharded_channel, tmp_path: Path):
+    base, url = sharded_channel
+    cache = RepodataCache(tmp_path / "abcdef", "repodata.json")
+    repo = ShardedRepoInterface(f"{url}/linux-64", "repodata.json", cache=cache)
+
+    shards = repo.repodata_shards()
+    assert "zlib" in shards
+    assert "python" not in shards
+
+    legacy_packages, conda_packages = shards.packages(["zlib"])
+    repodata = json.loads((base / "linux-64" / "repodata.json").read_text())
+    assert legacy_packages == {
+        fn: info for fn, info in repodata["packages"].items() if info["name"] == "zlib"
+    }
+    assert conda_packages == repodata["packages.conda"]
+
+    # zlib's dependency was fetched along with it, and every shard cached by hash
+    assert set(shards._visited) == {"zlib", "libgcc-ng"}
+    assert {path.name for path in repo.shards_dir.iterdir()} == {
+        path.name for path in (base / "linux-64" / "shards").iterdir()
+    }
+
+    # the cached index and shards are used without the server
+    shutil.rmtree(base / "linux-64" / "shards")
+    with env_vars(
+        {"CONDA_LOCAL_REPODATA_TTL": "1000"},
+        stack_callback=conda_tests_ctxt_mgmt_def_pol,
+    ):
+        assert repo.repodata_shards().packages(["zlib"]) == (
+            legacy_packages,
+            conda_packages,
+        )
+
+
+def test_repodata_shards_unavailable(sharded_channel, tmp_path: Path):
+    _, url = sharded_channel
+    cache = RepodataCache(tmp_path / "abcdef", "repodata.json")
+    repo = ShardedRepoInterface(f"{url}/noarch", "repodata.json", cache=cache)
+
+    with pytest.raises(ShardsUnavailable):
+        repo.repodata_shards()
+    assert not repo.shards_index_cache.load_state().should_check_format("shards")
+
+    # the full repodata.json is still available
+    assert json.loads(repo.repodata(cache.state))["info"]["subdir"] == "noarch"
+
+
+def test_subdir_data_sharded(sharded_channel, tmp_pkgs_dir: Path):
+    _, url = sharded_channel
+    channel = Channel(f"{url}/linux-64")
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
+    with env_vars(
+        {"CONDA_EXPERIMENTAL": "sharded"},
+        stack_callback=conda_tests_ctxt_mgmt_def_pol,
+    ):
+        sd = SubdirData(channel)
+        precs = list(sd.query("zlib"))
+        assert [prec.fn for prec in precs] == ["zlib-1.2.11-h7b6447c_3.conda"]
+        assert precs[0].url == f"{url}/linux-64/zlib-1.2.11-h7b6447c_3.conda"
+        assert sd._loaded_names == {"zlib"}
+        assert not sd.cache_path_json.exists()
+
+        # queries without a name need every record, from repodata.json
+        assert len(list(sd.iter_records())) == 2
+        assert sd._loaded_names is None
+        assert sd.cache_path_json.exists()
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
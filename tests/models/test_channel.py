@@ -21,7 +21,7 @@ from conda.common.url import join, join_url
 from conda.gateways.disk.create import mkdir_p
 from conda.gateways.disk.delete import rm_rf
 from conda.gateways.logging import initialize_logging
-from conda.models.channel import Channel, prioritize_channels
+from conda.models.channel import Channel, cache_stats, prioritize_channels
 from conda.utils import on_win
 
 initialize_logging()
@@ -119,6 +119,29 @@ def test_default_channel():
         assert dc.urls()[2].endswith("/win-32")
 
 
+def test_package_url_channel_cache():
+    Channel._reset_state()
+    base_url = "https://repo.anaconda.com/pkgs/main/osx-64"
+    urls = [f"{base_url}/six-1.16.0-pyhd3eb1b0_{i}.conda" for i in range(3)]
+    channels = [Channel(url) for url in urls]
+    # the subdir URL was parsed once, for all of its packages
+    assert cache_stats()["channel URL"] == {
+        "hits": 2,
+        "misses": 1,
+        "size": 1,
+        "maxsize": Channel._url_cache_.maxsize,
+    }
+    assert cache_stats()["Channel"]["misses"] == 3
+    for url, channel in zip(urls, channels):
+        assert Channel(url) is channel
+        assert channel.package_filename == url.rsplit("/", 1)[1]
+        assert channel.platform == "osx-64"
+        assert channel.canonical_name == "defaults"
+        assert channel.url() == url
+    assert Channel(base_url).package_filename is None
+    assert cache_stats()["Channel"]["hits"] == 3
+
+
 def test_url_channel_w_platform():
     with env_unmodified(conda_tests_ctxt_mgmt_def_pol):
         channel = Channel("https://repo.anaconda.com/pkgs/main/osx-64")
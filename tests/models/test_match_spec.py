@@ -13,6 +13,7 @@ from conda.models.dist import Dist
 from conda.models.match_spec import ChannelMatch, MatchSpec, _parse_spec_str
 from conda.models.records import PackageRecord
 from conda.models.version import VersionSpec
+from conda.testing.helpers import get_index_r_4
 
 blas_value = "accelerate" if context.subdir == "osx-64" else "openblas"
 
@@ -36,6 +37,33 @@ def DPkg(s, **kwargs):
     )
 
 
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "spec",
+    [
+        "numpy",
+        "numpy >=1.11,<1.14",
+        "numpy 1.11.*",
+        "*ssl*",
+        "*[version=1.2.11]",
+        "python 3.6* *_1",
+        "*[build_number='>3']",
+        "*[track_features=nomkl]",
+        "channel-4::*[subdir=noarch]",
+        "nonexistent",
+    ],
+)
+def test_filter(spec):
+    index, _ = get_index_r_4()
+    precs = tuple(index.values())
+    ms = MatchSpec(spec)
+    assert list(ms.filter(precs)) == [prec for prec in precs if ms.match(prec)]
+
+    # dicts are accepted too, as in MatchSpec.match
+    dumps = [prec.dump() for prec in precs[:100]]
+    assert list(ms.filter(dumps)) == [dump for dump in dumps if ms.match(dump)]
+
+
 @pytest.mark.benchmark
 def test_match_1():
     for spec, result in (
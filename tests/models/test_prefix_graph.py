@@ -957,6 +957,57 @@ def test_deep_cyclical_dependency(tmpdir):
     assert nodes == order
 
 
+def test_incremental_closures():
+    def record(name, *depends):
+        return PackageRecord(
+            name=name, version="1", build="0", build_number=0, depends=depends
+        )
+
+    a, b, c, d, e = (
+        record("a", "b", "c"),
+        record("b", "d"),
+        record("c", "d"),
+        record("d"),
+        record("e", "a"),
+    )
+    graph = PrefixGraph((e, a, b, c, d), (MatchSpec("a"),))
+    assert tuple(graph.records) == (d, b, c, a, e)
+    assert graph.all_descendants(d) == (b, c, a, e)
+    assert graph.all_ancestors(a) == (d, b, c)
+
+    # removing e only invalidates the closures that reached it
+    assert graph.prune() == (e,)
+    assert e not in graph.children
+    assert graph.all_descendants(d) == (b, c, a)
+    assert graph.all_ancestors(a) == (d, b, c)
+
+    assert graph.remove_spec(MatchSpec("b")) == (b, a)
+    assert tuple(graph.records) == (d, c)
+    assert graph.all_descendants(d) == (c,)
+    assert graph.children == {d: {c}, c: set()}
+
+
+@pytest.mark.benchmark
+def test_large_prefix_graph():
+    # each package depends on the two packages before it
+    records = [
+        PackageRecord(
+            name=f"pkg{i:04}",
+            version="1",
+            build="0",
+            build_number=0,
+            depends=[f"pkg{j:04}" for j in (i - 1, i - 2) if j >= 0],
+        )
+        for i in range(1500)
+    ]
+    graph = PrefixGraph(reversed(records), (MatchSpec("pkg1499"),))
+    assert tuple(graph.records) == tuple(records)
+    assert len(graph.all_descendants(records[0])) == 1499
+    assert graph.remove_spec(MatchSpec("pkg0750")) == tuple(records[750:])
+    assert len(graph.all_descendants(records[0])) == 749
+    assert graph.prune() == tuple(records[:750])
+
+
 def test_general_graph_bfs_simple():
     a = PackageRecord(
         name="a", version="1", build="0", build_number=0, depends=["b", "c", "d"]
@@ -2,11 +2,17 @@
 # SPDX-License-Identifier: BSD-3-Clause
 import pytest
 
+from conda.auxlib.exceptions import ValidationError
 from conda.base.context import conda_tests_ctxt_mgmt_def_pol, context
 from conda.common.io import env_unmodified
 from conda.models.channel import Channel
-from conda.models.enums import PackageType
-from conda.models.records import PackageRecord, PrefixRecord
+from conda.models.enums import PackageType, PathType
+from conda.models.records import (
+    PackageRecord,
+    PathDataV1,
+    PathsData,
+    PrefixRecord,
+)
 
 blas_value = "accelerate" if context.subdir == "osx-64" else "openblas"
 
@@ -129,3 +135,111 @@ def test_package_virtual_package(version, build_string):
     assert vpkg_record == reference_package
     assert vpkg_record.package_type == PackageType.VIRTUAL_SYSTEM
     assert vpkg_record.md5 == md5
+
+
+def test_package_record_from_repodata():
+    def info():
+        return {
+            "name": "test-package",
+            "version": "1.2.3",
+            "build": "py_0",
+            "build_number": 0,
+            "depends": ["python >=3.8"],
+            "constrains": ["pip >=22"],
+            "track_features": "feature1 feature2",
+            "timestamp": 1507565728999,
+            "license": "BSD-3-Clause",
+            "noarch": "python",
+            "channel": Channel("https://conda.anaconda.org/conda-forge/noarch"),
+            "schannel": "conda-forge",
+            "subdir": "noarch",
+            "fn": "test-package-1.2.3-py_0.conda",
+            "url": "https://conda.anaconda.org/conda-forge/noarch/test-package-1.2.3-py_0.conda",
+            "legacy_bz2_size": None,
+        }
+
+    reference = PackageRecord(**info())
+    rec = PackageRecord.from_repodata(info())
+    assert rec == reference
+    assert repr(rec) == repr(reference)
+    assert rec.dump() == reference.dump()
+
+    # rarely used fields are boxed on first access
+    rec = PackageRecord.from_repodata(info())
+    assert "track_features" not in vars(rec)
+    assert rec.track_features == ("feature1", "feature2")
+    assert vars(rec)["track_features"] == ("feature1", "feature2")
+    assert rec.constrains == ("pip >=22",)
+    assert rec.timestamp == 1507565728.999
+    assert rec.package_type == PackageType.NOARCH_PYTHON
+    assert rec.legacy_bz2_size is None
+    del rec.license
+    assert rec.license is None
+
+    # specs are shared between records
+    other = PackageRecord.from_repodata(info())
+    assert other.depends[0] is rec.depends[0]
+
+    # the metadata set is only created on demand
+    assert "_metadata" not in vars(rec)
+    rec.metadata.add("(package metadata is TRUSTED)")
+    assert rec.metadata == {"(package metadata is TRUSTED)"}
+    assert not reference.metadata
+
+
+def test_package_record_init():
+    # aliases, and None for optional fields that aren't nullable
+    rec = PackageRecord(
+        name="test-package",
+        version="1.2.3",
+        build_string="py_0",
+        build_number=0,
+        filename=None,
+        size=None,
+    )
+    assert rec.build == "py_0"
+    assert "size" not in rec.dump()
+    assert rec.fn == "test-package-1.2.3-py_0"
+
+    with pytest.raises(ValidationError):
+        PackageRecord(name="test-package", version="1.2.3", build_number=0)
+    with pytest.raises(ValidationError):
+        PackageRecord(
+            name="test-package", version="1.2.3", build_string=None, build_number=0
+        )
+
+
+@pytest.mark.benchmark
+def test_prefix_record_paths_data():
+    paths = [
+        {
+            "_path": f"lib/python3.12/site-packages/test_package/module{i}.py",
+            "path_type": "hardlink",
+            "sha256": "0" * 64,
+            "size_in_bytes": 1024,
+            "prefix_placeholder": None,
+        }
+        for i in range(2000)
+    ]
+    paths_data = PathsData(
+        paths_version=1, paths=[PathDataV1(**path) for path in paths]
+    )
+    rec = PrefixRecord(
+        name="test-package",
+        version="1.2.3",
+        build="py_0",
+        build_number=0,
+        files=[path["_path"] for path in paths],
+        paths_data=paths_data,
+    )
+    dumped = rec.dump()
+    assert dumped["paths_data"]["paths"][0] == {
+        "_path": paths[0]["_path"],
+        "path_type": "hardlink",
+        "sha256": "0" * 64,
+        "size_in_bytes": 1024,
+    }
+    loaded = PrefixRecord(**dumped)
+    assert loaded.paths_data.paths[-1].path == paths[-1]["_path"]
+    assert loaded.paths_data.paths[-1].path_type == PathType.hardlink
+    assert loaded.dump()["files"] == dumped["files"]
@@ -1,12 +1,27 @@
 # Copyright (C) 2012 Anaconda, Inc
 # SPDX-License-Identifier: BSD-3-Clause
+import json
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
+from pathlib import Path
 from random import shuffle
 
 import pytest
 
 from conda.exceptions import InvalidVersionSpec
-from conda.models.version import VersionOrder, VersionSpec, normalized_version, ver_eval
+from conda.models.version import (
+    InterningCache,
+    SingleStrArgCachingType,
+    VersionOrder,
+    VersionSpec,
+    cache_stats,
+    normalized_version,
+    set_cache_size,
+    treeify,
+    ver_eval,
+)
+
+TEST_INDEX = Path(__file__).parents[1] / "data" / "index4.json"
 
 
 def test_version_order():
@@ -258,7 +273,7 @@ def test_version_spec_1():
 
 def test_version_spec_2():
     v1 = VersionSpec("( (1.5|((1.6|1.7), 1.8), 1.9 |2.0))|2.1")
-    assert v1.spec == "1.5|1.6|1.7,1.8,1.9|2.0|2.1"
+    assert v1.spec == "1.5|(1.6|1.7),1.8,1.9|2.0|2.1"
     for spec in ["(1.5", "1.5)", "1.5||1.6", "^1.5"]:
         with pytest.raises(InvalidVersionSpec):
             VersionSpec(spec)
@@ -430,7 +445,164 @@ def test_compatible_release_versions():
         VersionSpec("~=3.3.2.*")
 
 
+@pytest.mark.parametrize(
+    "spec, compiled",
+    [
+        ("*", True),
+        ("1.2.3", True),
+        (">=1.2,<2|3.1.*", True),
+        ("!=2.*,~=1.2", True),
+        ("1.*.3", False),
+        ("^1\\.2$", False),
+        ("1.2@local", False),
+        # prefixes of nested blocks can't be ordered without the versions
+        ("=1.1,!=1.1.2.*", False),
+    ],
+)
+def test_version_spec_intervals(spec, compiled):
+    assert (VersionSpec(spec).intervals is not None) is compiled
+
+
+def test_version_spec_intervals_match(index_versions):
+    # interval matching agrees with the operators it replaces
+    def expected(tree, version):
+        if isinstance(tree, tuple):
+            func = any if tree[0] == "|" else all
+            return func(expected(part, version) for part in tree[1:])
+        spec = VersionSpec(tree)
+        return spec.spec == "*" or spec.operator_func(
+            VersionOrder(version), spec.matcher_vo
+        )
+
+    specs = [
+        "*",
+        "1.7.1",
+        "!=1.7.1",
+        "<1.7",
+        "<=1.7.1",
+        ">1.7",
+        ">=1.7.1",
+        "=1.7",
+        "1.7.*",
+        "!=1.7.*",
+        "~=1.7.1",
+        ">=1.6,<1.8|2.7*",
+        "(1.5*|>=2.7),!=2.7.3",
+        "<2,>3",
+    ]
+    for spec in map(VersionSpec, specs):
+        assert spec.intervals is not None, spec
+        for version in set(index_versions):
+            assert spec.match(version) is expected(treeify(spec.spec), version)
+
+
+@pytest.mark.parametrize(
+    "first, second, empty",
+    [
+        ("1.5*", ">=1.6", True),
+        (">=1.2,<2", "3.*", True),
+        (">=1.2,<2", "2.*", False),
+        ("1.2.*", "1.3.*", True),
+        ("!=1.2", "1.2", True),
+        ("~=1.2.3", ">=1.3", True),
+        ("1.5*", "<=1.5.0", False),
+        (">1.2|<1.0", "1.1", True),
+        (">1.2|<1.0", "1.3", False),
+        ("1.2.*", "1.2.3.*", False),
+        # uncompiled specs are never known to be empty
+        ("1.*.3", "2", False),
+    ],
+)
+def test_version_spec_merge_is_empty(first, second, empty):
+    merged = VersionSpec(first).merge(VersionSpec(second))
+    assert merged.is_empty is empty
+    assert not VersionSpec(first).is_empty
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("1.1", ">1.2|<1.0"),
+        (">1.2|<1.0", "1.*|2.*"),
+        ("(1.6|1.7),1.8", ">=1.5|<1.0"),
+        # uncompiled specs match through their sub-specs
+        ("1.*.3|3.*", ">=3"),
+    ],
+)
+def test_version_spec_merge_round_trip(first, second):
+    merged = VersionSpec(first).merge(VersionSpec(second))
+    parsed = VersionSpec(str(merged))
+    for version in ("0.5", "1.1", "1.5", "1.6", "1.7", "1.8", "1.2.3", "2.1", "3"):
+        assert parsed.match(version) is merged.match(version), version
+
+
 def test_pep_440_arbitrary_equality_operator():
     # We're going to leave the not implemented for now.
     with pytest.raises(InvalidVersionSpec):
         VersionSpec("===3.3.2")
+
+
+def test_interning_cache():
+    class Version(metaclass=SingleStrArgCachingType):
+        _cache_ = InterningCache(maxsize=4)
+
+        def __init__(self, vstr):
+            self.vstr = vstr
+
+    a, b, c, d = map(Version, "abcd")
+    # the oldest generation was dropped
+    assert "a" not in Version._cache_
+    assert Version("a") is not a
+    assert Version("c") is c
+    Version("e")
+    # c was used after d
+    assert "c" in Version._cache_
+    assert "d" not in Version._cache_
+    assert Version._cache_.stats() == {
+        "hits": 1,
+        "misses": 6,
+        "size": 3,
+        "maxsize": 4,
+    }
+
+    Version._cache_.resize(2)
+    assert len(Version._cache_) == 1
+    assert "e" in Version._cache_
+    with pytest.raises(ValueError):
+        Version._cache_.resize(1)
+
+
+@pytest.fixture
+def index_versions():
+    index = json.loads(TEST_INDEX.read_text())
+    return [info["version"] for info in index.values()]
+
+
+def test_set_cache_size(index_versions):
+    try:
+        set_cache_size(100)
+        with ThreadPoolExecutor(4) as executor:
+            orders = list(executor.map(VersionOrder, index_versions))
+        assert [order.norm_version for order in orders] == [
+            version.lower() for version in index_versions
+        ]
+        assert cache_stats()["VersionOrder"]["size"] <= 100
+    finally:
+        set_cache_size(None)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("maxsize", [None, 1000, 100])
+def test_version_order_cache(index_versions, maxsize):
+    # the larger the cache, the more lookups hit it instead of parsing again
+    try:
+        VersionOrder._cache_.clear()
+        set_cache_size(maxsize)
+        for version in index_versions * 3:
+            VersionOrder(version)
+        stats = cache_stats()["VersionOrder"]
+        assert stats["hits"] + stats["misses"] == len(index_versions) * 3
+        if maxsize:
+            assert stats["size"] <= maxsize
+    finally:
+        set_cache_size(None)
@@ -1,10 +1,23 @@
 # Copyright (C) 2012 Anaconda, Inc
 # SPDX-License-Identifier: BSD-3-Clause
+import gc
 from itertools import chain, combinations, permutations, product
 
+import pycosat
 import pytest
 
-from conda.common.logic import FALSE, TRUE, Clauses, minimal_unsatisfiable_subset
+from conda.common import _logic
+from conda.common._logic import _IncrementalSatSolver, _PortfolioSatSolver
+from conda.common.logic import (
+    FALSE,
+    TRUE,
+    Clauses,
+    PortfolioSatSolver,
+    PycoSatSolver,
+    PyCryptoSatSolver,
+    PySatSolver,
+    minimal_unsatisfiable_subset,
+)
 from conda.testing.helpers import raises
 
 # These routines implement logical tests with short-circuiting
@@ -380,6 +393,126 @@ def test_minimize():
     assert sval == 11
 
 
+@pytest.mark.parametrize("sat_solver", [PyCryptoSatSolver, PySatSolver])
+def test_minimize_incremental(sat_solver):
+    pytest.importorskip(sat_solver)
+    C = Clauses(15, sat_solver=sat_solver, incremental=True)
+    C.Require(C.ExactlyOne, range(1, 6))
+    # temporary constraints are retracted from the live solver
+    assert C.sat([(-1,), (-2,), (-3,), (-4,), (-5,)]) is None
+    sol, sval = C.minimize([(k, k) for k in range(1, 6)], C.sat())
+    assert sval == 1
+    C.Require(C.ExactlyOne, range(6, 11))
+    sol, sval = C.minimize([(k, k) for k in range(6, 11)], sol)
+    assert sval == 6
+    assert len(sol) == C.m
+    C.Require(C.ExactlyOne, range(11, 16))
+    sol, sval = C.minimize([(k, k) for k in range(11, 16)])
+    assert sval == 11
+    assert {1, 6, 11} <= set(sol)
+
+
+class _StubIncrementalSolver(_IncrementalSatSolver):
+    """pycosat behind the incremental interface, with assumptions as unit clauses."""
+
+    def _new_solver(self, **kwargs):
+        solver = []
+        self.solvers.append(solver)
+        return solver
+
+    def _add_clauses(self, solver, clauses):
+        solver.extend(tuple(clause) for clause in clauses)
+
+    def _solve(self, solver, assumptions):
+        solution = pycosat.solve([*solver, *((lit,) for lit in assumptions)])
+        if solution == "UNSAT":
+            return None
+        return [None, *(lit > 0 for lit in solution)]
+
+
+@pytest.fixture
+def stub_incremental_solver(monkeypatch):
+    monkeypatch.setitem(_logic._sat_solver_str_to_cls, "stub", _logic._PycoSatSolver)
+    monkeypatch.setitem(
+        _logic._incremental_sat_solver_str_to_cls, "stub", _StubIncrementalSolver
+    )
+    monkeypatch.setattr(_StubIncrementalSolver, "solvers", [], raising=False)
+    return _StubIncrementalSolver
+
+
+def test_minimize_incremental_retraction(stub_incremental_solver):
+    C = Clauses(15, sat_solver="stub", incremental=True)
+    C.Require(C.ExactlyOne, range(1, 6))
+    # temporary constraints are sent guarded by an activation literal ...
+    assert C.sat([(-1,), (-2,), (-3,), (-4,), (-5,)]) is None
+    (solver,) = stub_incremental_solver.solvers
+    guarded = [clause for clause in solver if -clause[-1] > C.m]
+    assert guarded
+    # ... which is fixed to false when they are removed
+    activation = -guarded[0][-1]
+    assert C.sat() is not None
+    assert (-activation,) in solver
+
+    sol, sval = C.minimize([(k, k) for k in range(1, 6)], C.sat())
+    assert sval == 1
+    C.Require(C.ExactlyOne, range(6, 11))
+    sol, sval = C.minimize([(k, k) for k in range(6, 11)], sol)
+    assert sval == 6
+    assert len(sol) == C.m
+    assert {1, 6} <= set(sol)
+    # all bisection steps ran on the same live solver
+    assert stub_incremental_solver.solvers == [solver]
+
+
+def test_incremental_solver_restart(stub_incremental_solver):
+    sat_solver = stub_incremental_solver()
+    sat_solver.add_clauses([(1, 2), (-1,)])
+    assert sat_solver.run(2) == [-1, 2]
+    # removing clauses that were sent unguarded starts a new live solver
+    sat_solver.restore_state(1)
+    sat_solver.add_clause((-2,))
+    assert sat_solver.run(2) == [1, -2]
+    assert len(stub_incremental_solver.solvers) == 2
+    assert stub_incremental_solver.solvers[-1] == [(1, 2), (-2,)]
+
+
+def test_minimize_portfolio(monkeypatch):
+    # race two processes even if only pycosat is installed
+    monkeypatch.setattr(_PortfolioSatSolver, "backends", (PycoSatSolver, PycoSatSolver))
+    C = Clauses(10, sat_solver=PortfolioSatSolver)
+    C.Require(C.ExactlyOne, range(1, 6))
+    assert C.sat([(-1,), (-2,), (-3,), (-4,), (-5,)]) is None
+    sol, sval = C.minimize([(k, k) for k in range(1, 6)], C.sat())
+    assert sval == 1
+    assert len(sol) == C.m
+
+
+def test_portfolio_workers(monkeypatch):
+    monkeypatch.setattr(_PortfolioSatSolver, "backends", (PycoSatSolver, PycoSatSolver))
+    C = Clauses(10, sat_solver=PortfolioSatSolver)
+    C.Require(C.ExactlyOne, range(1, 6))
+    sol, sval = C.minimize([(k, k) for k in range(1, 6)], C.sat())
+    assert sval == 1
+    processes = [process for _, process, _, _ in C._clauses._sat_solver._workers]
+    assert len(processes) == 2
+
+    # later runs reuse the workers, which only receive the new clauses
+    C.Require(C.ExactlyOne, range(6, 11))
+    sol, sval = C.minimize([(k, k) for k in range(6, 11)], sol)
+    assert sval == 6
+    assert {1, 6} <= set(sol)
+    assert [
+        process for _, process, _, _ in C._clauses._sat_solver._workers
+    ] == processes
+
+    # the workers stop by themselves once the solver is gone
+    del C
+    gc.collect()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+
 @pytest.mark.xfail(
     reason="Broke this with reworking minimal_unsatisfiable_set.  Not sure how to fix.  minimal_unsatisfiable_subset function is otherwise working well."
 )